@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+#  Copyright 2025 Red Hat, Inc.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# flake8: noqa
+"""Compare JSON and YAML parsing of event stream webhook payloads.
+
+Builds GitHub style push event payloads of increasing size and reports
+the time taken to parse them with json.loads, as done for JSON content
+types, and with yaml.safe_load, the fallback for every other type.
+
+Usage:
+    python scripts/benchmark_event_stream_parsing.py [--number N]
+"""
+
+import argparse
+import json
+import timeit
+
+import yaml
+
+SIZES = [1024, 10 * 1024, 100 * 1024, 1024 * 1024]
+
+
+def _commit(index: int) -> dict:
+    return {
+        "id": f"{index:040x}",
+        "message": f"Fix the thing number {index}\n\nSigned-off-by: dev",
+        "timestamp": "2025-01-01T12:00:00Z",
+        "url": f"https://github.com/org/repo/commit/{index:040x}",
+        "author": {"name": "Dev", "email": "dev@example.com"},
+        "added": [f"src/file_{index}.py"],
+        "removed": [],
+        "modified": ["README.md", "src/main.py"],
+        "distinct": True,
+    }
+
+
+def make_payload(size: int) -> bytes:
+    """Return a JSON webhook payload of at least size bytes."""
+    payload = {
+        "ref": "refs/heads/main",
+        "before": "0" * 40,
+        "after": "f" * 40,
+        "repository": {
+            "id": 123456,
+            "full_name": "org/repo",
+            "private": False,
+            "html_url": "https://github.com/org/repo",
+        },
+        "pusher": {"name": "dev", "email": "dev@example.com"},
+        "commits": [],
+    }
+    body = json.dumps(payload).encode()
+    while len(body) < size:
+        payload["commits"].append(_commit(len(payload["commits"])))
+        body = json.dumps(payload).encode()
+    return body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--number",
+        type=int,
+        default=0,
+        help="Parses per payload size, by default scaled to the size",
+    )
+    args = parser.parse_args()
+
+    print(f"{'size':>10} {'json (ms)':>12} {'yaml (ms)':>12} {'ratio':>8}")
+    for size in SIZES:
+        body = make_payload(size)
+        number = args.number or max(1, 200 * 1024 // size)
+        json_time = timeit.timeit(
+            lambda body=body: json.loads(body), number=number
+        )
+        yaml_time = timeit.timeit(
+            lambda body=body: yaml.safe_load(body.decode()), number=number
+        )
+        print(
+            f"{len(body):>10} "
+            f"{json_time / number * 1000:>12.3f} "
+            f"{yaml_time / number * 1000:>12.3f} "
+            f"{yaml_time / json_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,8 @@ import base64
 import hashlib
 import hmac
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
 from binascii import unhexlify
 from dataclasses import dataclass
@@ -26,16 +28,25 @@ from typing import Optional
 import ecdsa
 import jwt
 import requests
+from django.conf import settings
 from ecdsa.util import sigdecode_der
 from jwt import PyJWKClient, decode as jwt_decode
 from rest_framework import status
 from rest_framework.exceptions import AuthenticationFailed
 
 from aap_eda.core.enums import SignatureEncodingType
+from aap_eda.core.utils.cache import TTLCache
 from aap_eda.core.utils.credentials import validate_x509_subject_match
 
 logger = logging.getLogger(__name__)
 DEFAULT_TIMEOUT = 30
+JWKS_LIFESPAN = 360
+# Refresh the JWKS this many seconds before the cached copy expires
+JWKS_REFRESH_AHEAD = 60
+JWKS_CLIENTS_MAX_SIZE = 64
+JWKS_CLIENTS_TTL = 3600
+INTROSPECTION_SESSIONS_MAX_SIZE = 64
+INTROSPECTION_SESSIONS_TTL = 3600
 
 
 class EventStreamAuthentication(ABC):
@@ -160,6 +171,65 @@ class BasicAuthentication(EventStreamAuthentication):
             raise AuthenticationFailed(message)
 
 
+class _JWKSClient:
+    """A PyJWKClient shared by all requests using the same jwks url.
+
+    The key set is refreshed on a background thread shortly before the
+    cached copy expires, so requests do not wait on the JWKS endpoint.
+    PyJWKClient itself refetches the key set when a token has an
+    unknown kid.
+    """
+
+    def __init__(self, jwks_url: str):
+        self.jwks_url = jwks_url
+        self.client = PyJWKClient(
+            jwks_url,
+            cache_jwk_set=True,
+            lifespan=JWKS_LIFESPAN,
+            timeout=DEFAULT_TIMEOUT,
+        )
+        self._fetched_at: Optional[float] = None
+        self._refreshing = threading.Lock()
+
+    def get_signing_key_from_jwt(self, token: str):
+        if self._fetched_at is None:
+            self._fetched_at = time.monotonic()
+        else:
+            self._refresh_ahead()
+        return self.client.get_signing_key_from_jwt(token)
+
+    def _refresh_ahead(self) -> None:
+        age = time.monotonic() - self._fetched_at
+        if age < JWKS_LIFESPAN - JWKS_REFRESH_AHEAD:
+            return
+        if not self._refreshing.acquire(blocking=False):
+            return
+        threading.Thread(target=self._refresh, daemon=True).start()
+
+    def _refresh(self) -> None:
+        try:
+            self.client.get_jwk_set(refresh=True)
+            self._fetched_at = time.monotonic()
+        except jwt.exceptions.PyJWTError as err:
+            logger.warning(
+                "Error refreshing JWKS from %s: %s", self.jwks_url, err
+            )
+        finally:
+            self._refreshing.release()
+
+
+jwks_clients = TTLCache(max_size=JWKS_CLIENTS_MAX_SIZE, ttl=JWKS_CLIENTS_TTL)
+
+
+def get_jwks_client(jwks_url: str) -> _JWKSClient:
+    """Return the shared JWKS client for a jwks url."""
+    client = jwks_clients.get(jwks_url)
+    if client is None:
+        client = _JWKSClient(jwks_url)
+        jwks_clients.set(jwks_url, client)
+    return client
+
+
 @dataclass
 class Oauth2JwtAuthentication(EventStreamAuthentication):
     """OAuth2 JWT Authentication."""
@@ -180,9 +250,7 @@ class Oauth2JwtAuthentication(EventStreamAuthentication):
 
         try:
             token = _token_sans_bearer(self.access_token)
-            jwks_client = PyJWKClient(
-                self.jwks_url, cache_jwk_set=True, lifespan=360
-            )
+            jwks_client = get_jwks_client(self.jwks_url)
             options = {
                 "verify_signature": True,
                 "verify_exp": True,
@@ -208,6 +276,26 @@ class Oauth2JwtAuthentication(EventStreamAuthentication):
             raise AuthenticationFailed(message) from err
 
 
+# Sessions keep connections to the introspection endpoints open
+introspection_sessions = TTLCache(
+    max_size=INTROSPECTION_SESSIONS_MAX_SIZE, ttl=INTROSPECTION_SESSIONS_TTL
+)
+# Hashes of tokens found to be active by an introspection endpoint
+introspection_results = TTLCache(
+    max_size=settings.EVENT_STREAM_INTROSPECTION_CACHE_MAX_SIZE,
+    ttl=settings.EVENT_STREAM_INTROSPECTION_CACHE_TTL_SECONDS,
+)
+
+
+def get_introspection_session(introspection_url: str) -> requests.Session:
+    """Return the shared session for an introspection url."""
+    session = introspection_sessions.get(introspection_url)
+    if session is None:
+        session = requests.Session()
+        introspection_sessions.set(introspection_url, session)
+    return session
+
+
 @dataclass
 class Oauth2Authentication(EventStreamAuthentication):
     """OAuth2 Authentication."""
@@ -223,10 +311,14 @@ class Oauth2Authentication(EventStreamAuthentication):
             "token": _token_sans_bearer(self.token),
             "token_type_hint": "access_token",
         }
+        cache_key = self._cache_key(data["token"])
+        if introspection_results.get(cache_key):
+            return
+
         auth = (self.client_id, self.client_secret)
         # For keycloak this data is not in JSON format
         # instead of www-url-encoded
-        response = requests.post(
+        response = get_introspection_session(self.introspection_url).post(
             self.introspection_url,
             data=data,
             auth=auth,
@@ -245,6 +337,17 @@ class Oauth2Authentication(EventStreamAuthentication):
             logger.warning(message)
             raise AuthenticationFailed(message)
 
+        ttl = None
+        if isinstance(response_data.get("exp"), (int, float)):
+            ttl = response_data["exp"] - time.time()
+        introspection_results.set(cache_key, True, ttl=ttl)
+
+    def _cache_key(self, token: str) -> str:
+        key = "\0".join(
+            [self.introspection_url, self.client_id, self.client_secret, token]
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
+
 
 @dataclass
 class EcdsaAuthentication(EventStreamAuthentication):
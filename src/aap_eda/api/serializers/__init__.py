@@ -13,6 +13,9 @@
 #  limitations under the License.
 
 from .activation import (
+    ActivationBulkActionSerializer,
+    ActivationBulkJobSerializer,
+    ActivationBulkResultSerializer,
     ActivationCopySerializer,
     ActivationCreateSerializer,
     ActivationInstanceLogSerializer,
@@ -20,6 +23,7 @@ from .activation import (
     ActivationListSerializer,
     ActivationReadSerializer,
     ActivationSerializer,
+    ActivationStartQueueSerializer,
     ActivationUpdateSerializer,
     PostActivationSerializer,
 )
@@ -116,6 +120,10 @@ __all__ = (
     "ActivationUpdateSerializer",
     "ActivationReadSerializer",
     "ActivationCopySerializer",
+    "ActivationBulkActionSerializer",
+    "ActivationBulkJobSerializer",
+    "ActivationBulkResultSerializer",
+    "ActivationStartQueueSerializer",
     "ActivationInstanceSerializer",
     "ActivationInstanceLogSerializer",
     "PostActivationSerializer",
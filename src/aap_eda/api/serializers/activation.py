@@ -806,6 +806,58 @@ class ActivationCopySerializer(serializers.ModelSerializer):
         return super().create(copied_data)
 
 
+class ActivationBulkActionSerializer(serializers.Serializer):
+    """Activations a bulk action applies to.
+
+    Without ids, the action applies to the activations matching the
+    filters of the query string.
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+    )
+
+
+class ActivationBulkSkippedSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    reason = serializers.CharField()
+
+
+class ActivationBulkJobSerializer(serializers.Serializer):
+    """Progress of the requests created by a bulk action."""
+
+    job_id = serializers.CharField()
+    pending = serializers.IntegerField(
+        help_text="Number of requests not processed yet."
+    )
+
+
+class ActivationBulkResultSerializer(ActivationBulkJobSerializer):
+    """Outcome of a bulk action, with the handle to follow its progress."""
+
+    requested = serializers.ListField(child=serializers.IntegerField())
+    skipped = ActivationBulkSkippedSerializer(many=True)
+
+
+class ActivationStartQueueSerializer(serializers.Serializer):
+    """Start requests waiting to be admitted."""
+
+    user_starts = serializers.IntegerField(
+        help_text="Number of pending starts requested by users."
+    )
+    auto_starts = serializers.IntegerField(
+        help_text="Number of pending automatic restarts."
+    )
+    max_wait_seconds = serializers.FloatField(
+        help_text="Time the oldest pending start has been waiting."
+    )
+    starting = serializers.IntegerField(
+        help_text="Number of rulebook processes starting."
+    )
+
+
 class ActivationUpdateSerializer(
     _K8sPodMetadataWriteFields,
     OrganizationIdFieldMixin,
@@ -18,6 +18,7 @@ from ansible_base.rbac.service_api.urls import rbac_service_urls
 from ansible_base.resource_registry.urls import (
     urlpatterns as resource_api_urls,
 )
+from django.conf import settings
 from django.urls import include, path
 from drf_spectacular.views import (
     SpectacularJSONAPIView,
@@ -108,6 +109,17 @@ eda_v1_urls = [
     *router.urls,
 ]
 
+if settings.EVENT_STREAM_ASYNC_INGESTION:
+    # Registered ahead of the router so it takes over the sync post route
+    eda_v1_urls.insert(
+        0,
+        path(
+            "external_event_stream/<str:pk>/post/",
+            views.AsyncExternalEventStreamView.as_view(),
+            name="external_event_stream-post",
+        ),
+    )
+
 dab_urls = [
     path("", include(dab_urls)),
     path("", include(resource_api_urls)),
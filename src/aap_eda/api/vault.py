@@ -11,11 +11,16 @@
 #  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
+import binascii
+import hashlib
+import hmac
 import os
 import shutil
-import tempfile
 
 import pexpect
+from cryptography.hazmat.primitives import hashes, padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 
 class AnsibleVaultNotFound(Exception):
@@ -35,49 +40,64 @@ if VAULT_COMMAND is None:
     raise AnsibleVaultNotFound("Cannot find ansible-vault executable")
 
 
+# VaultAES256 parameters, see ansible.parsing.vault.VaultAES256
+VAULT_SALT_LENGTH = 32
+VAULT_KEY_LENGTH = 32
+VAULT_IV_LENGTH = 16
+VAULT_KDF_ITERATIONS = 10000
+VAULT_LINE_LENGTH = 80
+
+
+def _vault_aes256_encrypt(password: bytes, plaintext: bytes) -> bytes:
+    salt = os.urandom(VAULT_SALT_LENGTH)
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=2 * VAULT_KEY_LENGTH + VAULT_IV_LENGTH,
+        salt=salt,
+        iterations=VAULT_KDF_ITERATIONS,
+    )
+    derived_key = kdf.derive(password)
+    cipher_key = derived_key[:VAULT_KEY_LENGTH]
+    hmac_key = derived_key[VAULT_KEY_LENGTH : 2 * VAULT_KEY_LENGTH]
+    iv = derived_key[2 * VAULT_KEY_LENGTH :]
+
+    padder = padding.PKCS7(algorithms.AES.block_size).padder()
+    padded = padder.update(plaintext) + padder.finalize()
+    encryptor = Cipher(algorithms.AES(cipher_key), modes.CTR(iv)).encryptor()
+    ciphertext = encryptor.update(padded) + encryptor.finalize()
+    signature = hmac.new(hmac_key, ciphertext, hashlib.sha256).digest()
+
+    return binascii.hexlify(
+        b"\n".join(
+            binascii.hexlify(part) for part in (salt, signature, ciphertext)
+        )
+    )
+
+
 def encrypt_string(password: str, plaintext: str, vault_id: str) -> str:
+    """Encrypt a string the way ansible-vault encrypt_string does.
+
+    Returns the vault text that follows the !vault tag. The encryption
+    runs in process instead of spawning ansible-vault.
+    """
     try:
-        tmp = tempfile.NamedTemporaryFile("w+t")
-        os.chmod(tmp.name, 0o600)
-        tmp.write(password)
-        tmp.flush()
-        label = f"{vault_id}@{tmp.name}"
-
-        child = pexpect.spawn(
-            f"ansible-vault encrypt_string --vault-id {label}"
-        )
-        child.expect("Reading plaintext input from stdin*")
-        child.sendline(plaintext)
-        child.sendcontrol("D")
+        # ansible-vault read the plaintext from stdin including the
+        # newline that terminated it, keep the decrypted values the same
+        b_plaintext = (plaintext + "\n").encode()
+        vaulttext = _vault_aes256_encrypt(password.encode(), b_plaintext)
     except Exception as e:
         msg = "Failed to encrypt string"
         raise AnsibleVaultEncryptionFailed(msg) from e
 
-    encrypted_successful_found = False
-    encrypted_start = False
-    encrypted_str = ""
-
-    # Different versions of ansible-core output the "Encryption Successful"
-    # either at the beginning or at the end, right after the data.
-    # This logic accounts for all the variants we have seen so far in the
-    # output of ansible-vault.
-
-    for line in child.readlines():
-        out = line.decode().lstrip()
-        if out.startswith("!vault"):
-            encrypted_start = True
-            continue
-
-        if "Encryption successful" in out:
-            encrypted_successful_found = True
-
-        if encrypted_start:
-            encrypted_str += out.split("Encryption successful")[0]
-
-    if encrypted_successful_found and encrypted_start:
-        return encrypted_str
+    if vault_id and vault_id != "default":
+        header = f"$ANSIBLE_VAULT;1.2;AES256;{vault_id}"
     else:
-        raise AnsibleVaultEncryptionFailed("Failed to encrypt string")
+        header = "$ANSIBLE_VAULT;1.1;AES256"
+    lines = [header] + [
+        vaulttext[i : i + VAULT_LINE_LENGTH].decode()
+        for i in range(0, len(vaulttext), VAULT_LINE_LENGTH)
+    ]
+    return "\n".join(lines) + "\n"
 
 
 def decrypt(password: str, vault_string: str) -> str:
@@ -20,7 +20,10 @@ from .credential_type import CredentialTypeViewSet
 from .decision_environment import DecisionEnvironmentViewSet
 from .eda_credential import EdaCredentialViewSet
 from .event_stream import EventStreamViewSet
-from .external_event_stream import ExternalEventStreamViewSet
+from .external_event_stream import (
+    AsyncExternalEventStreamView,
+    ExternalEventStreamViewSet,
+)
 from .organization import OrganizationViewSet
 from .project import ProjectViewSet
 from .root import ApiRootView, ApiV1RootView
@@ -63,4 +66,5 @@ __all__ = (
     "EventStreamViewSet",
     # External event stream
     "ExternalEventStreamViewSet",
+    "AsyncExternalEventStreamView",
 )
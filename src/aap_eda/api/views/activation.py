@@ -12,6 +12,8 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 import logging
+import uuid
+from collections import defaultdict
 from typing import Optional
 
 from ansible_base.rbac.api.related import check_related_permissions
@@ -19,6 +21,7 @@ from ansible_base.rbac.models import RoleDefinition
 from django.conf import settings
 from django.db import transaction
 from django.forms import model_to_dict
+from django.utils import timezone
 from django_filters import rest_framework as defaultfilters
 from drf_spectacular.utils import (
     OpenApiParameter,
@@ -34,11 +37,19 @@ from aap_eda.api import exceptions as api_exc, filters, serializers
 from aap_eda.api.pagination import LogPagination
 from aap_eda.api.serializers.activation import is_activation_valid
 from aap_eda.core import models
-from aap_eda.core.enums import Action, ActivationStatus, ProcessParentType
+from aap_eda.core.enums import (
+    ACTIVATION_STATUS_MESSAGE_MAP,
+    Action,
+    ActivationRequest,
+    ActivationStatus,
+    ProcessParentType,
+)
 from aap_eda.core.health import check_dispatcherd_workers_health
 from aap_eda.core.utils import logging_utils
 from aap_eda.tasks.orchestrator import (
     delete_rulebook_process,
+    get_start_queue_stats,
+    push_bulk_requests,
     restart_rulebook_process,
     start_rulebook_process,
     stop_rulebook_process,
@@ -631,6 +642,386 @@ class ActivationViewSet(
         )
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @extend_schema(
+        description="Enable many activations at once",
+        request=serializers.ActivationBulkActionSerializer,
+        responses={
+            status.HTTP_202_ACCEPTED: (
+                serializers.ActivationBulkResultSerializer
+            ),
+            status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+                None, description="No activations were selected."
+            ),
+        },
+    )
+    @action(
+        methods=["post"],
+        detail=False,
+        rbac_action=Action.ENABLE,
+        url_path="bulk_enable",
+    )
+    def bulk_enable(self, request):
+        activations, skipped = self._get_bulk_activations(
+            request, Action.ENABLE
+        )
+
+        to_start = []
+        for activation in activations:
+            if activation.is_enabled:
+                skipped.append(
+                    _skip(activation, "Activation is already enabled")
+                )
+                continue
+            if activation.status in [
+                ActivationStatus.STARTING,
+                ActivationStatus.STOPPING,
+                ActivationStatus.DELETING,
+                ActivationStatus.RUNNING,
+                ActivationStatus.UNRESPONSIVE,
+            ]:
+                skipped.append(
+                    _skip(
+                        activation,
+                        "Activation not enabled due to current "
+                        "activation status",
+                    )
+                )
+                continue
+            valid, error = is_activation_valid(activation)
+            if not valid:
+                activation.status = ActivationStatus.ERROR
+                activation.status_message = error
+                activation.save(update_fields=["status", "status_message"])
+                logger.error(f"Failed to enable {activation.name}: {error}")
+                skipped.append(_skip(activation, error))
+                continue
+            if self._sync_project_if_needed(activation):
+                skipped.append(_skip(activation, activation.status_message))
+                continue
+            to_start.append(activation)
+
+        _update_activations(
+            {ActivationStatus.PENDING: to_start},
+            is_enabled=True,
+            failure_count=0,
+        )
+        return self._push_bulk_requests(
+            request, "Enable", to_start, ActivationRequest.START, skipped
+        )
+
+    @extend_schema(
+        description="Disable many activations at once",
+        request=serializers.ActivationBulkActionSerializer,
+        responses={
+            status.HTTP_202_ACCEPTED: (
+                serializers.ActivationBulkResultSerializer
+            ),
+            status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+                None, description="No activations were selected."
+            ),
+        },
+        parameters=[
+            OpenApiParameter(
+                name="force",
+                description="Force disable after worker node offline",
+                required=False,
+                type=bool,
+            )
+        ],
+    )
+    @action(
+        methods=["post"],
+        detail=False,
+        rbac_action=Action.DISABLE,
+        url_path="bulk_disable",
+    )
+    def bulk_disable(self, request):
+        activations, skipped = self._get_bulk_activations(
+            request, Action.DISABLE
+        )
+        force_disable = str_to_bool(
+            request.query_params.get("force", "false"),
+        )
+        activations = self._skip_unavailable(
+            activations, skipped, force_disable, "Disabled"
+        )
+
+        models.Activation.objects.filter(
+            id__in=[
+                activation.id
+                for activation in activations
+                if activation.awaiting_project_sync
+            ]
+        ).update(awaiting_project_sync=False)
+
+        to_stop = defaultdict(list)
+        for activation in activations:
+            if not activation.is_enabled:
+                skipped.append(
+                    _skip(activation, "Activation is already disabled")
+                )
+                continue
+            if activation.status in [
+                ActivationStatus.STARTING,
+                ActivationStatus.RUNNING,
+            ]:
+                to_stop[ActivationStatus.STOPPING].append(activation)
+            else:
+                to_stop[activation.status].append(activation)
+
+        _update_activations(to_stop, is_enabled=False)
+        return self._push_bulk_requests(
+            request,
+            "Disable",
+            [activation for group in to_stop.values() for activation in group],
+            ActivationRequest.STOP,
+            skipped,
+        )
+
+    @extend_schema(
+        description="Restart many activations at once",
+        request=serializers.ActivationBulkActionSerializer,
+        responses={
+            status.HTTP_202_ACCEPTED: (
+                serializers.ActivationBulkResultSerializer
+            ),
+            status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+                None, description="No activations were selected."
+            ),
+        },
+        parameters=[
+            OpenApiParameter(
+                name="force",
+                description="Force restart after worker node offline",
+                required=False,
+                type=bool,
+            )
+        ],
+    )
+    @action(
+        methods=["post"],
+        detail=False,
+        rbac_action=Action.RESTART,
+        url_path="bulk_restart",
+    )
+    def bulk_restart(self, request):
+        activations, skipped = self._get_bulk_activations(
+            request, Action.RESTART
+        )
+        force_restart = str_to_bool(
+            request.query_params.get("force", "false"),
+        )
+        activations = self._skip_unavailable(
+            activations, skipped, force_restart, "Restarted"
+        )
+
+        to_restart = []
+        to_stop = []
+        for activation in activations:
+            if not activation.is_enabled:
+                skipped.append(
+                    _skip(
+                        activation,
+                        "Activation is disabled and cannot be run.",
+                    )
+                )
+                continue
+            valid, error = is_activation_valid(activation)
+            if not valid:
+                to_stop.append(activation)
+                activation.status = ActivationStatus.ERROR
+                activation.status_message = error
+                activation.save(update_fields=["status", "status_message"])
+                logger.error(f"Failed to restart {activation.name}: {error}")
+                skipped.append(_skip(activation, error))
+                continue
+            if self._sync_project_if_needed(activation):
+                skipped.append(_skip(activation, activation.status_message))
+                continue
+            to_restart.append(activation)
+
+        response = self._push_bulk_requests(
+            request, "Restart", to_restart, ActivationRequest.RESTART, skipped
+        )
+        if to_stop:
+            stopped = push_bulk_requests(
+                ProcessParentType.ACTIVATION,
+                [activation.id for activation in to_stop],
+                ActivationRequest.STOP,
+                response.data["job_id"],
+            )
+            response.data["pending"] += len(stopped)
+        return response
+
+    @extend_schema(
+        description="Progress of the requests created by a bulk action",
+        request=None,
+        responses={
+            status.HTTP_200_OK: serializers.ActivationBulkJobSerializer,
+        },
+    )
+    @action(
+        methods=["get"],
+        detail=False,
+        rbac_action=Action.READ,
+        url_path="bulk_jobs/(?P<job_id>[^/.]+)",
+    )
+    def bulk_job(self, request, job_id):
+        pending = models.ActivationRequestQueue.objects.filter(
+            request_id=job_id,
+            process_parent_type=ProcessParentType.ACTIVATION,
+            process_parent_id__in=models.Activation.access_qs(
+                request.user
+            ).values("id"),
+        ).count()
+        serializer = serializers.ActivationBulkJobSerializer(
+            {"job_id": job_id, "pending": pending}
+        )
+        return Response(serializer.data)
+
+    @extend_schema(
+        description="Depth and wait time of the pending activation starts",
+        request=None,
+        responses={
+            status.HTTP_200_OK: serializers.ActivationStartQueueSerializer,
+        },
+    )
+    @action(
+        methods=["get"],
+        detail=False,
+        rbac_action=Action.READ,
+        url_path="start_queue",
+    )
+    def start_queue(self, request):
+        serializer = serializers.ActivationStartQueueSerializer(
+            get_start_queue_stats()
+        )
+        return Response(serializer.data)
+
+    def _get_bulk_activations(
+        self, request, rbac_action: Action
+    ) -> tuple[list[models.Activation], list[dict]]:
+        """Return the activations selected for a bulk action.
+
+        Selected ids that don't exist or that the user can't act on are
+        returned as skipped.
+        """
+        serializer = serializers.ActivationBulkActionSerializer(
+            data=request.data
+        )
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data.get("ids")
+
+        queryset = (
+            models.Activation.access_qs(request.user, str(rbac_action))
+            .select_related("project", "latest_instance__rulebookprocessqueue")
+            .prefetch_related("eda_credentials", "event_streams")
+            .order_by("id")
+        )
+        if ids is not None:
+            activations = list(queryset.filter(id__in=ids))
+            found = {activation.id for activation in activations}
+            skipped = [
+                {"id": id, "reason": "Activation not found"}
+                for id in dict.fromkeys(ids)
+                if id not in found
+            ]
+            return activations, skipped
+
+        # Parameters that are not activation filters, such as a page or a
+        # misspelled filter, must not select every activation
+        filterset = filters.ActivationFilter(
+            request.query_params, queryset=queryset, request=request
+        )
+        if not filterset.is_valid():
+            raise exceptions.ValidationError(filterset.errors)
+        if not any(
+            value not in (None, "")
+            for value in filterset.form.cleaned_data.values()
+        ):
+            raise exceptions.ValidationError(
+                "Select the activations with ids or with filters."
+            )
+        return list(filterset.qs), []
+
+    def _skip_unavailable(
+        self,
+        activations: list[models.Activation],
+        skipped: list[dict],
+        force: bool,
+        operation_name: str,
+    ) -> list[models.Activation]:
+        """Skip the activations a stop or restart can't be run for.
+
+        Without force, the workers of each queue are checked once.
+        """
+        queues_health = {}
+        available = []
+        for activation in activations:
+            if activation.status == ActivationStatus.DELETING:
+                skipped.append(_skip(activation, "Object is being deleted"))
+                continue
+            try:
+                self._check_workers_offline_with_force(
+                    activation, force, operation_name
+                )
+            except api_exc.Conflict as e:
+                skipped.append(_skip(activation, str(e.detail)))
+                continue
+            if not force and activation.is_enabled:
+                queue_name = self._get_activation_queue_name(activation)
+                if queue_name not in queues_health:
+                    healthy = check_dispatcherd_workers_health(
+                        queue_name=queue_name
+                    )
+                    queues_health[queue_name] = healthy
+                if not queues_health[queue_name]:
+                    skipped.append(
+                        _skip(activation, "Workers are unavailable")
+                    )
+                    continue
+            available.append(activation)
+        return available
+
+    def _push_bulk_requests(
+        self,
+        request,
+        operation: str,
+        activations: list[models.Activation],
+        request_type: ActivationRequest,
+        skipped: list[dict],
+    ) -> Response:
+        job_id = str(uuid.uuid4())
+        requested = push_bulk_requests(
+            ProcessParentType.ACTIVATION,
+            [activation.id for activation in activations],
+            request_type,
+            job_id,
+        )
+        logger.info(
+            f"{operation} of {len(requested)} activations requested "
+            f"as job {job_id}, {len(skipped)} skipped"
+        )
+        for activation in activations:
+            logger.info(
+                logging_utils.generate_simple_audit_log(
+                    operation,
+                    resource_name,
+                    activation.name,
+                    activation.id,
+                    activation.organization,
+                )
+            )
+        serializer = serializers.ActivationBulkResultSerializer(
+            {
+                "job_id": job_id,
+                "pending": len(requested),
+                "requested": requested,
+                "skipped": skipped,
+            }
+        )
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
     @extend_schema(
         description="Copy an activation.",
         request=serializers.ActivationCopySerializer,
@@ -775,6 +1166,35 @@ class ActivationViewSet(
             )
 
 
+def _skip(activation: models.Activation, reason: str) -> dict:
+    return {"id": activation.id, "reason": reason}
+
+
+def _update_activations(
+    activations_by_status: dict[str, list[models.Activation]], **fields
+) -> None:
+    """Set the status and the given fields of activations in bulk.
+
+    One update per status, the status message is set the way the model
+    sets it when saving a status.
+    """
+    for new_status, activations in activations_by_status.items():
+        if not activations:
+            continue
+        status_message = ACTIVATION_STATUS_MESSAGE_MAP[new_status]
+        is_enabled = fields.get("is_enabled", True)
+        if new_status == ActivationStatus.PENDING and not is_enabled:
+            status_message = "Activation is marked as disabled"
+        models.Activation.objects.filter(
+            id__in=[activation.id for activation in activations]
+        ).update(
+            status=new_status,
+            status_message=status_message,
+            modified_at=timezone.now(),
+            **fields,
+        )
+
+
 @extend_schema_view(
     retrieve=extend_schema(
         description="Get the Activation Instance by its id",
@@ -13,24 +13,30 @@
 #  limitations under the License.
 """Module providing external event stream post."""
 
-import datetime
+import json
 import logging
 import urllib.parse
-from typing import Any
+from typing import Any, Optional
 
 import yaml
 from ansible_base.jwt_consumer.common.util import (
     validate_x_trusted_proxy_header,
 )
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import transaction
-from django.db.models import F
+from django.http import HttpResponse, JsonResponse
 from django.http.request import HttpHeaders
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from drf_spectacular.utils import extend_schema
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import AuthenticationFailed, ParseError
+from rest_framework.exceptions import (
+    APIException,
+    AuthenticationFailed,
+    ParseError,
+)
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
@@ -46,29 +52,56 @@ from aap_eda.api.event_stream_authentication import (
 from aap_eda.core.enums import Action, EventStreamAuthType, ResourceType
 from aap_eda.core.exceptions import CredentialPluginError, PGNotifyError
 from aap_eda.core.models import EventStream
-from aap_eda.core.utils.credentials import get_resolved_secrets
-from aap_eda.services.pg_notify import PGNotify
+from aap_eda.core.utils.external_sms import get_external_secrets
+from aap_eda.services.event_stream_cache import (
+    EventStreamDescriptor,
+    build_descriptor,
+    event_stream_cache,
+)
+from aap_eda.services.event_stream_stats import event_stream_stats
+from aap_eda.services.pg_notify import AsyncPGNotify, PGNotify
 
 logger = logging.getLogger(__name__)
 UNSAFE_HEADER_KEYS = {"X-Trusted-Proxy", "X-Forwarded-For", "X-Real-IP"}
 REDACTED_STRING = "********"
 
 
-class ExternalEventStreamViewSet(viewsets.GenericViewSet):
-    """External Event Stream View Set."""
+def is_json_content_type(content_type: str) -> bool:
+    """Check for application/json and application/*+json media types."""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type == "application/json" or (
+        media_type.startswith("application/") and media_type.endswith("+json")
+    )
 
-    rbac_action = None
-    rbac_resource_type = ResourceType.EVENT_STREAM
-    permission_classes = [AllowAny]
-    authentication_classes = []
 
-    def get_rbac_permission(self):
-        """RBAC Permissions."""
-        return ResourceType.EVENT_STREAM, Action.READ
+class ExternalEventStreamMixin:
+    """Helpers shared by the sync and async external event stream views."""
 
-    def __init__(self, *args, **kwargs):
-        self.event_stream = None
-        super().__init__()
+    event_stream: Optional[EventStreamDescriptor] = None
+
+    def _load_event_stream(self, pk: str) -> EventStream:
+        try:
+            return EventStream.objects.select_related("eda_credential").get(
+                uuid=pk
+            )
+        except (EventStream.DoesNotExist, ValidationError) as exc:
+            raise ParseError("bad uuid specified") from exc
+
+    def _describe(
+        self, pk: str, event_stream: EventStream
+    ) -> EventStreamDescriptor:
+        descriptor = build_descriptor(event_stream)
+        event_stream_cache.set(pk, descriptor)
+        return descriptor
+
+    def _resolve_inputs(self) -> dict:
+        """Return the credential inputs with their external secrets."""
+        if not self.event_stream.has_input_sources:
+            return self.event_stream.inputs
+        return {
+            **self.event_stream.inputs,
+            **get_external_secrets(self.event_stream.eda_credential_id),
+        }
 
     def _update_test_data(
         self,
@@ -81,17 +114,11 @@ class ExternalEventStreamViewSet(viewsets.GenericViewSet):
             "The event stream: %s is currently in test mode",
             self.event_stream.name,
         )
-        self.event_stream.test_error_message = error_message
-        self.event_stream.test_content_type = content_type
-        self.event_stream.test_content = content
-        self.event_stream.test_headers = headers
-        self.event_stream.save(
-            update_fields=[
-                "test_content_type",
-                "test_content",
-                "test_headers",
-                "test_error_message",
-            ]
+        EventStream.objects.filter(id=self.event_stream.id).update(
+            test_error_message=error_message,
+            test_content_type=content_type,
+            test_content=content,
+            test_headers=headers,
         )
 
     def _validate_trusted_proxy_header(self, request):
@@ -136,6 +163,12 @@ class ExternalEventStreamViewSet(viewsets.GenericViewSet):
         logger.debug("X-Trusted-Proxy header validated successfully")
 
     def _parse_body(self, content_type: str, body: bytes) -> dict:
+        if is_json_content_type(content_type):
+            try:
+                return json.loads(body)
+            except ValueError:
+                # Not valid JSON, some senders mislabel YAML content
+                pass
         if content_type == "application/x-www-form-urlencoded":
             try:
                 data = urllib.parse.parse_qs(
@@ -191,111 +224,129 @@ class ExternalEventStreamViewSet(viewsets.GenericViewSet):
             },
         }
 
-    @transaction.atomic
     def _update_stats(self):
-        self.event_stream.events_received = F("events_received") + 1
-        self.event_stream.last_event_received_at = datetime.datetime.now(
-            tz=datetime.timezone.utc
-        )
-        self.event_stream.save(
-            update_fields=[
-                "events_received",
-                "last_event_received_at",
-            ]
-        )
+        event_stream_stats.record(self.event_stream.id)
+
+    def _authenticate(self, request, inputs):
+        if inputs["auth_type"] == EventStreamAuthType.HMAC:
+            obj = HMACAuthentication(
+                signature_encoding=inputs["signature_encoding"],
+                signature_prefix=inputs.get("signature_prefix", ""),
+                signature=request.headers[inputs["http_header_key"]],
+                hash_algorithm=inputs["hash_algorithm"],
+                secret=inputs["secret"].encode("utf-8"),
+            )
+            obj.authenticate(request.body)
+        elif inputs["auth_type"] == EventStreamAuthType.MTLS:
+            obj = MTLSAuthentication(
+                subject=inputs.get("subject", ""),
+                value=request.headers[inputs["http_header_key"]],
+            )
+            obj.authenticate()
+        elif inputs["auth_type"] == EventStreamAuthType.TOKEN:
+            obj = TokenAuthentication(
+                token=inputs["token"],
+                value=request.headers[inputs["http_header_key"]],
+            )
+            obj.authenticate()
+        elif inputs["auth_type"] == EventStreamAuthType.BASIC:
+            obj = BasicAuthentication(
+                password=inputs["password"],
+                username=inputs["username"],
+                authorization=request.headers[inputs["http_header_key"]],
+            )
+            obj.authenticate()
+        elif inputs["auth_type"] == EventStreamAuthType.OAUTH2JWT:
+            obj = Oauth2JwtAuthentication(
+                jwks_url=inputs["jwks_url"],
+                audience=inputs["audience"],
+                access_token=request.headers[inputs["http_header_key"]],
+            )
+            obj.authenticate()
+        elif inputs["auth_type"] == EventStreamAuthType.OAUTH2:
+            obj = Oauth2Authentication(
+                introspection_url=inputs["introspection_url"],
+                token=request.headers[inputs["http_header_key"]],
+                client_id=inputs["client_id"],
+                client_secret=inputs["client_secret"],
+            )
+            obj.authenticate()
+        elif inputs["auth_type"] == EventStreamAuthType.ECDSA:
+            if inputs.get("prefix_http_header_key", ""):
+                content_prefix = request.headers[
+                    inputs["prefix_http_header_key"]
+                ]
+            else:
+                content_prefix = ""
+
+            obj = EcdsaAuthentication(
+                public_key=inputs["public_key"],
+                signature=request.headers[inputs["http_header_key"]],
+                content_prefix=content_prefix,
+                signature_encoding=inputs["signature_encoding"],
+                hash_algorithm=inputs["hash_algorithm"],
+            )
+            obj.authenticate(request.body)
+        else:
+            message = "Unknown auth type"
+            logger.error(message)
+            raise ParseError(message)
+
+    def _handle_auth_failure(self, request, inputs, err):
+        self._update_stats()
+        if self.event_stream.test_mode:
+            self._update_test_data(
+                error_message=err,
+                headers=yaml.dump(
+                    self._redacted_headers(
+                        request.headers, inputs["http_header_key"]
+                    )
+                ),
+            )
+
+
+class ExternalEventStreamViewSet(
+    ExternalEventStreamMixin, viewsets.GenericViewSet
+):
+    """External Event Stream View Set."""
+
+    rbac_action = None
+    rbac_resource_type = ResourceType.EVENT_STREAM
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get_rbac_permission(self):
+        """RBAC Permissions."""
+        return ResourceType.EVENT_STREAM, Action.READ
+
+    def __init__(self, *args, **kwargs):
+        self.event_stream = None
+        super().__init__()
 
     def _handle_auth(self, request, inputs):
         try:
-            if inputs["auth_type"] == EventStreamAuthType.HMAC:
-                obj = HMACAuthentication(
-                    signature_encoding=inputs["signature_encoding"],
-                    signature_prefix=inputs.get("signature_prefix", ""),
-                    signature=request.headers[inputs["http_header_key"]],
-                    hash_algorithm=inputs["hash_algorithm"],
-                    secret=inputs["secret"].encode("utf-8"),
-                )
-                obj.authenticate(request.body)
-            elif inputs["auth_type"] == EventStreamAuthType.MTLS:
-                obj = MTLSAuthentication(
-                    subject=inputs.get("subject", ""),
-                    value=request.headers[inputs["http_header_key"]],
-                )
-                obj.authenticate()
-            elif inputs["auth_type"] == EventStreamAuthType.TOKEN:
-                obj = TokenAuthentication(
-                    token=inputs["token"],
-                    value=request.headers[inputs["http_header_key"]],
-                )
-                obj.authenticate()
-            elif inputs["auth_type"] == EventStreamAuthType.BASIC:
-                obj = BasicAuthentication(
-                    password=inputs["password"],
-                    username=inputs["username"],
-                    authorization=request.headers[inputs["http_header_key"]],
-                )
-                obj.authenticate()
-            elif inputs["auth_type"] == EventStreamAuthType.OAUTH2JWT:
-                obj = Oauth2JwtAuthentication(
-                    jwks_url=inputs["jwks_url"],
-                    audience=inputs["audience"],
-                    access_token=request.headers[inputs["http_header_key"]],
-                )
-                obj.authenticate()
-            elif inputs["auth_type"] == EventStreamAuthType.OAUTH2:
-                obj = Oauth2Authentication(
-                    introspection_url=inputs["introspection_url"],
-                    token=request.headers[inputs["http_header_key"]],
-                    client_id=inputs["client_id"],
-                    client_secret=inputs["client_secret"],
-                )
-                obj.authenticate()
-            elif inputs["auth_type"] == EventStreamAuthType.ECDSA:
-                if inputs.get("prefix_http_header_key", ""):
-                    content_prefix = request.headers[
-                        inputs["prefix_http_header_key"]
-                    ]
-                else:
-                    content_prefix = ""
-
-                obj = EcdsaAuthentication(
-                    public_key=inputs["public_key"],
-                    signature=request.headers[inputs["http_header_key"]],
-                    content_prefix=content_prefix,
-                    signature_encoding=inputs["signature_encoding"],
-                    hash_algorithm=inputs["hash_algorithm"],
-                )
-                obj.authenticate(request.body)
-            else:
-                message = "Unknown auth type"
-                logger.error(message)
-                raise ParseError(message)
+            self._authenticate(request, inputs)
         except AuthenticationFailed as err:
-            self._update_stats()
-            if self.event_stream.test_mode:
-                self._update_test_data(
-                    error_message=err,
-                    headers=yaml.dump(
-                        self._redacted_headers(
-                            request.headers, inputs["http_header_key"]
-                        )
-                    ),
-                )
+            self._handle_auth_failure(request, inputs, err)
             raise
 
     @extend_schema(exclude=True)
     @action(detail=True, methods=["POST"], rbac_action=None)
     def post(self, request, *_args, **kwargs):
         """Handle posts from external vendors."""
-        try:
-            self.event_stream = EventStream.objects.get(uuid=kwargs["pk"])
-        except (EventStream.DoesNotExist, ValidationError) as exc:
-            raise ParseError("bad uuid specified") from exc
+        pk = kwargs["pk"]
+        event_stream = None
+        self.event_stream = event_stream_cache.get(pk)
+        if self.event_stream is None:
+            event_stream = self._load_event_stream(pk)
 
         # Validate X-Trusted-Proxy header from Gateway/Envoy
         self._validate_trusted_proxy_header(request)
 
+        if self.event_stream is None:
+            self.event_stream = self._describe(pk, event_stream)
         try:
-            inputs = get_resolved_secrets(self.event_stream.eda_credential)
+            inputs = self._resolve_inputs()
         except CredentialPluginError as err:
             logger.warning("Error fetching external secrets %s", str(err))
             return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -350,3 +401,116 @@ class ExternalEventStreamViewSet(viewsets.GenericViewSet):
                 return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         return Response(status=status.HTTP_200_OK)
+
+
+class AsyncExternalEventStreamView(ExternalEventStreamMixin, View):
+    """ASGI native handler for posts from external vendors.
+
+    Takes over the external event stream post route when
+    EVENT_STREAM_ASYNC_INGESTION is enabled and the API is served by an
+    ASGI server. Database work runs on the sync thread, authentication
+    (which may call out to an identity provider) runs on a worker thread
+    and the event is published through an async pg_notify connection pool,
+    so slow senders do not each tie up a worker.
+    """
+
+    http_method_names = ["post"]
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        """Exempt the view from CSRF like DRF views are."""
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def post(self, request, pk):
+        """Handle posts from external vendors."""
+        try:
+            return await self._post(request, pk)
+        except AuthenticationFailed as err:
+            # DRF reports failed authentication as 403 when the view
+            # has no authentication classes, keep the same contract.
+            return self._error_response(err, status.HTTP_403_FORBIDDEN)
+        except APIException as err:
+            return self._error_response(err, err.status_code)
+
+    async def _post(self, request, pk) -> HttpResponse:
+        event_stream = None
+        self.event_stream = event_stream_cache.get(pk)
+        if self.event_stream is None:
+            event_stream = await sync_to_async(self._load_event_stream)(pk)
+
+        await sync_to_async(self._validate_trusted_proxy_header)(request)
+
+        if self.event_stream is None:
+            self.event_stream = await sync_to_async(self._describe)(
+                pk, event_stream
+            )
+        try:
+            inputs = await sync_to_async(self._resolve_inputs)()
+        except CredentialPluginError as err:
+            logger.warning("Error fetching external secrets %s", str(err))
+            return HttpResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        event_headers = self._redacted_headers(
+            request.headers, inputs["http_header_key"]
+        )
+
+        if inputs["http_header_key"] not in request.headers:
+            message = f"{inputs['http_header_key']} header is missing"
+            logger.error(message)
+            if self.event_stream.test_mode:
+                await sync_to_async(self._update_test_data)(
+                    error_message=message,
+                    headers=yaml.dump(event_headers),
+                )
+            raise ParseError(message)
+
+        try:
+            await sync_to_async(self._authenticate, thread_sensitive=False)(
+                request, inputs
+            )
+        except AuthenticationFailed as err:
+            await sync_to_async(self._handle_auth_failure)(
+                request, inputs, err
+            )
+            raise
+
+        body = await sync_to_async(self._parse_body, thread_sensitive=False)(
+            request.headers.get("Content-Type", ""), request.body
+        )
+
+        # Some sites send in an array or a string
+        if isinstance(body, dict):
+            data = body
+        else:
+            data = {"body": body}
+
+        payload = self._create_payload(
+            event_headers,
+            data,
+            request.get_full_path(),
+        )
+        await sync_to_async(self._update_stats)()
+        if self.event_stream.test_mode:
+            await sync_to_async(self._update_test_data)(
+                content=yaml.dump(body),
+                content_type=request.headers.get("Content-Type", "unknown"),
+                headers=yaml.dump(event_headers),
+            )
+        else:
+            try:
+                await AsyncPGNotify(
+                    settings.PG_NOTIFY_DSN_SERVER,
+                    self.event_stream.channel_name,
+                    payload,
+                )()
+            except PGNotifyError as e:
+                logger.error(e)
+                return HttpResponse(
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+
+        return HttpResponse(status=status.HTTP_200_OK)
+
+    @staticmethod
+    def _error_response(err: APIException, status_code: int) -> JsonResponse:
+        return JsonResponse({"detail": str(err.detail)}, status=status_code)
@@ -35,6 +35,7 @@ class ActivationRequestQueue(models.Model):
         "Activation", on_delete=models.CASCADE, null=True
     )
     request_id = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, null=False)
 
 
 __all__ = [
@@ -12,11 +12,19 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from typing import Optional
+
 from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
+from .credential_type import CredentialType
 from .eda_credential import EdaCredential
 from .organization import Organization
 
+# Ids of credential types by name, kept until the type is saved or deleted
+_credential_type_ids: dict[str, int] = {}
+
 
 def get_default_organization():
     return Organization.objects.get(name=settings.DEFAULT_ORGANIZATION_NAME)
@@ -31,3 +39,23 @@ def get_default_rule_engine_credential():
         name=settings.DEFAULT_SYSTEM_RULE_ENGINE_CREDENTIAL_NAME
     ).first()
     return obj
+
+
+def get_credential_type_id(name: str) -> Optional[int]:
+    """Return the id of the credential type with the given name."""
+    if name not in _credential_type_ids:
+        credential_type_id = (
+            CredentialType.objects.filter(name=name)
+            .values_list("id", flat=True)
+            .first()
+        )
+        if credential_type_id is None:
+            return None
+        _credential_type_ids[name] = credential_type_id
+    return _credential_type_ids[name]
+
+
+@receiver(post_save, sender=CredentialType)
+@receiver(post_delete, sender=CredentialType)
+def credential_type_handler(sender, instance, **kwargs):
+    _credential_type_ids.pop(instance.name, None)
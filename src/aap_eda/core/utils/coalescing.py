@@ -0,0 +1,107 @@
+#  Copyright 2025 Red Hat, Inc.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""Coalesced database writes."""
+
+import logging
+import threading
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db import connection
+
+LOGGER = logging.getLogger(__name__)
+
+
+class CoalescingWriter:
+    """Keep updates in memory and write them in bulk.
+
+    Pending updates are written once per flush interval, read from the
+    setting named by interval_setting, or right away when it is 0.
+    Subclasses guard their pending data with self._lock and implement
+    _take_pending, _restore and _write. A batch that fails to be written
+    is merged back into the pending data and written with the next one.
+    """
+
+    interval_setting: str
+    error_message = "Failed to write coalesced updates"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def flush(self) -> None:
+        """Write the pending updates."""
+        with self._lock:
+            batch = self._take_pending()
+        if not batch:
+            return
+        try:
+            self._write(batch)
+        except Exception:
+            with self._lock:
+                self._restore(batch)
+            raise
+
+    def flush_at_exit(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            LOGGER.exception(self.error_message)
+
+    def _schedule_flush(self) -> None:
+        """Schedule the write of the updates recorded so far."""
+        if self._flush_interval() <= 0:
+            self.flush()
+            return
+        with self._lock:
+            self._start_timer()
+
+    def _flush_interval(self) -> float:
+        return getattr(settings, self.interval_setting)
+
+    def _start_timer(self) -> None:
+        interval = self._flush_interval()
+        if interval > 0 and self._timer is None:
+            self._timer = threading.Timer(interval, self._flush_on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception:
+            LOGGER.exception(self.error_message)
+            # The batch is pending again, retry after another interval
+            with self._lock:
+                self._start_timer()
+        finally:
+            # The timer thread has its own database connection
+            connection.close()
+
+    def _take_pending(self) -> Any:
+        """Return the pending updates, or None, and reset them."""
+        raise NotImplementedError
+
+    def _restore(self, batch: Any) -> None:
+        """Merge a batch that failed to be written into the pending data.
+
+        The pending data holds the updates recorded since the batch was
+        taken, which are newer than the ones in the batch.
+        """
+        raise NotImplementedError
+
+    def _write(self, batch: Any) -> None:
+        raise NotImplementedError
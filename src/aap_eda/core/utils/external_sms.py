@@ -13,23 +13,58 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import json
 import logging
+from typing import Any
 
 import yaml
+from cryptography.fernet import Fernet
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from aap_eda.core import models
 from aap_eda.core.exceptions import CredentialPluginError
+from aap_eda.core.utils.cache import TTLCache
 from aap_eda.core.utils.credential_plugins import run_plugin
 
 LOGGER = logging.getLogger(__name__)
 
+# Values fetched from an external SMS keyed by the credential input
+# source id. The values are kept encrypted with a key that only lives
+# in this process.
+external_secrets_cache = TTLCache(
+    max_size=settings.EXTERNAL_SECRETS_CACHE_MAX_SIZE,
+    ttl=settings.EXTERNAL_SECRETS_CACHE_TTL_SECONDS,
+)
+_cache_fernet = Fernet(Fernet.generate_key())
+
+
+def _get_cached_secret(input_source_id: int) -> Any:
+    item = external_secrets_cache.get(input_source_id)
+    if item is None:
+        return None
+    _source_credential_id, token = item
+    return json.loads(_cache_fernet.decrypt(token))
+
+
+def _cache_secret(obj: models.CredentialInputSource, value: Any) -> None:
+    if not external_secrets_cache.enabled:
+        return
+    token = _cache_fernet.encrypt(json.dumps(value).encode())
+    external_secrets_cache.set(obj.id, (obj.source_credential_id, token))
+
 
 def get_external_secrets(credential_id: int) -> dict:
     """Fetch secrets from an external SMS."""
     result = {}
     for obj in models.CredentialInputSource.objects.filter(
         target_credential=credential_id
-    ):
+    ).select_related("source_credential__credential_type"):
+        value = _get_cached_secret(obj.id)
+        if value is not None:
+            result[obj.input_field_name] = value
+            continue
         try:
             inputs = obj.source_credential.inputs.get_secret_value()
             metadata = obj.metadata.get_secret_value()
@@ -49,4 +84,25 @@ def get_external_secrets(credential_id: int) -> dict:
             )
             LOGGER.error(msg)
             raise CredentialPluginError(msg) from err
+        _cache_secret(obj, value)
     return result
+
+
+@receiver(post_save, sender=models.CredentialInputSource)
+@receiver(post_delete, sender=models.CredentialInputSource)
+def credential_input_source_handler(
+    sender: Any, instance: models.CredentialInputSource, **kwargs: Any
+) -> None:
+    """Drop the cached value when a credential input source changes."""
+    external_secrets_cache.pop(instance.id)
+
+
+@receiver(post_save, sender=models.EdaCredential)
+@receiver(post_delete, sender=models.EdaCredential)
+def source_credential_handler(
+    sender: Any, instance: models.EdaCredential, **kwargs: Any
+) -> None:
+    """Drop the cached values fetched with a changed source credential."""
+    external_secrets_cache.discard_if(
+        lambda _key, item: item[0] == instance.id
+    )
@@ -174,11 +174,14 @@ class ActivationManager(StatusManager):
                 self._cleanup()
                 self.set_latest_instance_status(ActivationStatus.STOPPED)
 
-    def _start_activation_instance(self):
+    def _start_activation_instance(
+        self, admission: tp.Optional[tp.ContextManager] = None
+    ):
         """Start a new activation instance.
 
         Update the status of the activation, latest instance, logs,
-        counters and pod id.
+        counters and pod id. The instance is created within admission,
+        when given.
         """
         # Ensure status of previous instances
         # For consistency, we should not have previous instances in
@@ -192,7 +195,8 @@ class ActivationManager(StatusManager):
             "Creating a new activation instance for "
             f"activation: {self.db_instance.id}",
         )
-        self._create_activation_instance()
+        with admission or contextlib.nullcontext():
+            self._create_activation_instance()
 
         self.db_instance.refresh_from_db()
         log_handler = self.container_logger_class(self.latest_instance.id)
@@ -673,13 +677,19 @@ class ActivationManager(StatusManager):
         LOGGER.error(msg)
         self.set_status(ActivationStatus.ERROR, msg)
 
-    def start(self, is_restart: bool = False):
+    def start(
+        self,
+        is_restart: bool = False,
+        admission: tp.Optional[tp.ContextManager] = None,
+    ):
         """Start an activation.
 
         Called by the user or by the monitor when the restart policy is applied
         Ensure that the activation meets all the requirements to start,
         otherwise raise ActivationStartError.
         Starts the activation in an idepotent way.
+        The new instance is created within the admission context manager,
+        when given, which may raise to defer the start.
         """
         msg = f"Requested to start activation {self.db_instance.id}, starting."
         LOGGER.info(msg)
@@ -705,7 +715,7 @@ class ActivationManager(StatusManager):
                 "were found, recreating.",
             )
 
-        self._start_activation_instance()
+        self._start_activation_instance(admission)
         if is_restart:
             self._increase_restart_count()
 
@@ -28,5 +28,9 @@ def new_container_engine(activation_id: str, resource_prefix: str):
     if settings.DEPLOYMENT_TYPE == "podman":
         return PodmanEngine(activation_id, resource_prefix)
     if settings.DEPLOYMENT_TYPE == "k8s":
-        return KubernetesEngine(activation_id, resource_prefix)
+        return KubernetesEngine(
+            activation_id,
+            resource_prefix,
+            use_pod_cache=settings.K8S_POD_CACHE_ENABLED,
+        )
     raise exceptions.InvalidDeploymentTypeError("Wrong deployment type")
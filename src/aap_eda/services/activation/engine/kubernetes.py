@@ -16,11 +16,14 @@ import base64
 import json
 import logging
 import os
+import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import Optional
 
 from dateutil import parser
+from django.conf import settings
 from kubernetes import client as k8sclient, config, watch
 from kubernetes.client.rest import ApiException
 from kubernetes.config.config_exception import ConfigException
@@ -65,6 +68,9 @@ POD_FAILED_REASONS = [
 ]
 POD_DELETE_TIMEOUT = 60
 
+EDA_POD_LABEL_SELECTOR = "app=eda"
+POD_CACHE_RETRY_SECONDS = 5
+
 
 @dataclass
 class Client:
@@ -88,12 +94,155 @@ def get_k8s_client() -> Client:
         raise ContainerEngineInitError(str(e)) from e
 
 
+def _get_pod_job_name(pod: k8sclient.V1Pod) -> Optional[str]:
+    labels = pod.metadata.labels if pod.metadata else None
+    return (labels or {}).get("job-name")
+
+
+class PodCache:
+    """Index of the EDA pods of a namespace by job name.
+
+    The pods are listed once, then a watch started from the list's
+    resourceVersion keeps the index up to date from a background thread.
+    When the resourceVersion is too old (410 Gone) the pods are listed
+    again, so the events missed in between are recovered. Until the
+    first list and after other errors the cache is not synced and
+    readers have to ask the API server.
+    """
+
+    def __init__(self, namespace: str, watch_timeout: int) -> None:
+        self.namespace = namespace
+        self.watch_timeout = watch_timeout
+        self._client: Optional[Client] = None
+        self._pods: dict[str, k8sclient.V1Pod] = {}
+        self._lock = threading.Lock()
+        self._synced = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"eda-pod-cache-{self.namespace}",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def get(self, job_name: str) -> Optional[k8sclient.V1Pod]:
+        """Return the pod of a job, None if unknown or not synced."""
+        if not self._synced.is_set():
+            return None
+        with self._lock:
+            return self._pods.get(job_name)
+
+    def _run(self) -> None:
+        resource_version = None
+        while True:
+            resource_version = self._sync(resource_version)
+
+    def _sync(self, resource_version: Optional[str]) -> Optional[str]:
+        """List the pods if needed and watch them until the watch ends.
+
+        Returns the resourceVersion to resume the watch from, None when
+        the pods have to be listed again.
+        """
+        try:
+            if self._client is None:
+                self._client = get_k8s_client()
+            if resource_version is None:
+                resource_version = self._list()
+            return self._watch(resource_version)
+        except ApiException as exc:
+            if exc.status == 410:
+                LOGGER.info(
+                    "Pod watch in namespace %s expired, listing pods again",
+                    self.namespace,
+                )
+                return None
+            self._handle_error(exc)
+            if exc.status in {401, 403}:
+                # the service account token may have been rotated
+                self._client = None
+        except Exception as exc:
+            self._handle_error(exc)
+        return None
+
+    def _handle_error(self, exc: Exception) -> None:
+        self._synced.clear()
+        LOGGER.warning(
+            "Pod cache of namespace %s is out of sync, retrying in %ss: %s",
+            self.namespace,
+            POD_CACHE_RETRY_SECONDS,
+            exc,
+        )
+        time.sleep(POD_CACHE_RETRY_SECONDS)
+
+    def _list(self) -> str:
+        pod_list = self._client.core_api.list_namespaced_pod(
+            namespace=self.namespace,
+            label_selector=EDA_POD_LABEL_SELECTOR,
+        )
+        pods = {}
+        for pod in pod_list.items:
+            job_name = _get_pod_job_name(pod)
+            if job_name:
+                pods[job_name] = pod
+        with self._lock:
+            self._pods = pods
+        self._synced.set()
+        return pod_list.metadata.resource_version
+
+    def _watch(self, resource_version: str) -> str:
+        watcher = watch.Watch()
+        try:
+            for event in watcher.stream(
+                self._client.core_api.list_namespaced_pod,
+                namespace=self.namespace,
+                label_selector=EDA_POD_LABEL_SELECTOR,
+                resource_version=resource_version,
+                timeout_seconds=self.watch_timeout,
+                allow_watch_bookmarks=True,
+            ):
+                pod = event["object"]
+                resource_version = pod.metadata.resource_version
+                job_name = _get_pod_job_name(pod)
+                if not job_name:
+                    continue
+                with self._lock:
+                    if event["type"] == "DELETED":
+                        self._pods.pop(job_name, None)
+                    else:
+                        self._pods[job_name] = pod
+        finally:
+            watcher.stop()
+        return resource_version
+
+
+_pod_caches: dict[str, PodCache] = {}
+_pod_caches_lock = threading.Lock()
+
+
+def get_pod_cache(namespace: str) -> PodCache:
+    """Return the pod cache of a namespace shared by this process."""
+    with _pod_caches_lock:
+        pod_cache = _pod_caches.get(namespace)
+        if pod_cache is None:
+            pod_cache = PodCache(
+                namespace, settings.K8S_POD_CACHE_WATCH_TIMEOUT_SECONDS
+            )
+            _pod_caches[namespace] = pod_cache
+            pod_cache.start()
+        return pod_cache
+
+
 class Engine(ContainerEngine):
     def __init__(
         self,
         activation_id: str,
         resource_prefix: str,
         client=None,
+        use_pod_cache: bool = False,
     ) -> None:
         if client:
             self.client = client
@@ -101,6 +250,9 @@ class Engine(ContainerEngine):
             self.client = get_k8s_client()
 
         self._set_namespace()
+        self.pod_cache = None
+        if use_pod_cache:
+            self.pod_cache = get_pod_cache(self.namespace)
         self.resource_prefix = resource_prefix.replace("_", "-")
         self.secret_name = f"{self.resource_prefix}-secret-{activation_id}"
         self.job_name = None
@@ -314,6 +466,13 @@ class Engine(ContainerEngine):
         ) from last_exc
 
     def _get_job_pod(self, job_name: str) -> k8sclient.V1Pod:
+        if self.pod_cache:
+            pod = self.pod_cache.get(job_name)
+            # A pod being deleted may already be gone, the cache only
+            # drops it once the watch delivers the DELETED event
+            if pod is not None and pod.metadata.deletion_timestamp is None:
+                return pod
+
         job_label = f"job-name={job_name}"
         result = self._call_k8s_api(
             self.client.core_api.list_namespaced_pod,
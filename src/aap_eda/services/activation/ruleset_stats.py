@@ -0,0 +1,122 @@
+#  Copyright 2025 Red Hat, Inc.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""Coalesced heartbeat writes for rulebook processes.
+
+Heartbeats are kept in memory and written once per flush interval: one
+UPDATE for the updated_at of all reporting rulebook processes and one
+UPDATE merging the reported rulesets into the ruleset_stats of their
+activations, leaving the stats of the other rulesets untouched.
+"""
+
+import atexit
+import datetime
+import json
+from typing import Optional, Union
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Case, DateTimeField, Value, When
+
+from aap_eda.core import models
+from aap_eda.core.utils.coalescing import CoalescingWriter
+
+# rulebook process id -> reported at
+ReportedAt = dict[int, Union[str, datetime.datetime]]
+# activation id -> ruleset name -> stats
+RulesetStats = dict[int, dict[str, dict]]
+
+
+class RulesetStatsAggregator(CoalescingWriter):
+    """Keep the latest heartbeat per rulebook process and ruleset."""
+
+    interval_setting = "RULEBOOK_HEARTBEAT_FLUSH_INTERVAL_SECONDS"
+    error_message = "Failed to update rulebook process heartbeats"
+
+    def __init__(self):
+        super().__init__()
+        self._reported_at: ReportedAt = {}
+        self._stats: RulesetStats = {}
+
+    def record(
+        self,
+        rulebook_process_id: int,
+        activation_id: int,
+        stats: dict,
+        reported_at: Union[str, datetime.datetime],
+    ) -> None:
+        with self._lock:
+            self._reported_at[rulebook_process_id] = reported_at
+            self._stats.setdefault(activation_id, {})[
+                stats["ruleSetName"]
+            ] = stats
+        self._schedule_flush()
+
+    def _take_pending(self) -> Optional[tuple[ReportedAt, RulesetStats]]:
+        reported_at, self._reported_at = self._reported_at, {}
+        stats, self._stats = self._stats, {}
+        if not reported_at and not stats:
+            return None
+        return reported_at, stats
+
+    def _restore(self, batch: tuple[ReportedAt, RulesetStats]) -> None:
+        reported_at, stats = batch
+        for pk, value in reported_at.items():
+            self._reported_at.setdefault(pk, value)
+        for activation_id, rulesets in stats.items():
+            pending = self._stats.setdefault(activation_id, {})
+            for name, ruleset_stats in rulesets.items():
+                pending.setdefault(name, ruleset_stats)
+
+    def _write(self, batch: tuple[ReportedAt, RulesetStats]) -> None:
+        reported_at, stats = batch
+        with transaction.atomic():
+            if reported_at:
+                updated_at = Case(
+                    *[
+                        When(
+                            id=pk,
+                            then=Value(value, output_field=DateTimeField()),
+                        )
+                        for pk, value in reported_at.items()
+                    ],
+                    output_field=DateTimeField(),
+                )
+                models.RulebookProcess.objects.filter(
+                    id__in=reported_at.keys()
+                ).update(updated_at=updated_at)
+            if stats:
+                self._merge_ruleset_stats(stats)
+
+    @staticmethod
+    def _merge_ruleset_stats(stats: RulesetStats) -> None:
+        values = ", ".join(["(%s, %s::jsonb)"] * len(stats))
+        params = []
+        for activation_id, rulesets in stats.items():
+            params.extend(
+                [activation_id, json.dumps(rulesets, cls=DjangoJSONEncoder)]
+            )
+        table = models.Activation._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} AS a "
+                "SET ruleset_stats = "
+                "COALESCE(a.ruleset_stats, jsonb_build_object()) || v.stats "
+                f"FROM (VALUES {values}) AS v(id, stats) "
+                "WHERE a.id = v.id",
+                params,
+            )
+
+
+ruleset_stats_aggregator = RulesetStatsAggregator()
+atexit.register(ruleset_stats_aggregator.flush_at_exit)
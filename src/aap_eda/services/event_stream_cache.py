@@ -0,0 +1,126 @@
+#  Copyright 2025 Red Hat, Inc.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""Per process cache of the event stream data used to ingest events.
+
+Entries are dropped as soon as the event stream, its credential or one of
+the credential input sources changes in this process. Changes made by
+other processes are picked up when the entry expires, so the ttl bounds
+how long another process may keep using stale data. The cache is
+disabled unless a ttl is configured.
+
+Values fetched from external secret management systems are not kept
+here, they go through the external secrets cache on every event.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import yaml
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from aap_eda.core import models
+from aap_eda.core.utils.cache import TTLCache
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class EventStreamDescriptor:
+    """What the external event stream views need to handle an event."""
+
+    id: int
+    name: str
+    channel_name: str
+    test_mode: bool
+    additional_data_headers: str
+    eda_credential_id: int
+    # The inputs stored in the event stream credential, without the
+    # values of its credential input sources.
+    inputs: dict
+    has_input_sources: bool
+    # The event stream credential and the external credentials
+    # its inputs are resolved from.
+    credential_ids: frozenset[int]
+
+
+event_stream_cache = TTLCache(
+    max_size=settings.EVENT_STREAM_CACHE_MAX_SIZE,
+    ttl=settings.EVENT_STREAM_CACHE_TTL_SECONDS,
+)
+
+
+def build_descriptor(
+    event_stream: models.EventStream,
+) -> EventStreamDescriptor:
+    credential = event_stream.eda_credential
+    source_credential_ids = set(
+        models.CredentialInputSource.objects.filter(
+            target_credential_id=credential.id
+        ).values_list("source_credential_id", flat=True)
+    )
+    return EventStreamDescriptor(
+        id=event_stream.id,
+        name=event_stream.name,
+        channel_name=event_stream.channel_name,
+        test_mode=event_stream.test_mode,
+        additional_data_headers=event_stream.additional_data_headers,
+        eda_credential_id=credential.id,
+        inputs=yaml.safe_load(credential.inputs.get_secret_value()),
+        has_input_sources=bool(source_credential_ids),
+        credential_ids=frozenset({credential.id, *source_credential_ids}),
+    )
+
+
+def invalidate_event_stream(event_stream_id: int) -> None:
+    event_stream_cache.discard_if(
+        lambda _key, descriptor: descriptor.id == event_stream_id
+    )
+
+
+def invalidate_credential(credential_id: Optional[int]) -> None:
+    if credential_id is None:
+        return
+    event_stream_cache.discard_if(
+        lambda _key, descriptor: credential_id in descriptor.credential_ids
+    )
+
+
+@receiver(post_save, sender=models.EventStream)
+@receiver(post_delete, sender=models.EventStream)
+def event_stream_handler(
+    sender: Any, instance: models.EventStream, **kwargs: Any
+) -> None:
+    """Drop the cached descriptor when an event stream changes."""
+    invalidate_event_stream(instance.id)
+
+
+@receiver(post_save, sender=models.EdaCredential)
+@receiver(post_delete, sender=models.EdaCredential)
+def eda_credential_handler(
+    sender: Any, instance: models.EdaCredential, **kwargs: Any
+) -> None:
+    """Drop cached descriptors that depend on a changed credential."""
+    invalidate_credential(instance.id)
+
+
+@receiver(post_save, sender=models.CredentialInputSource)
+@receiver(post_delete, sender=models.CredentialInputSource)
+def credential_input_source_handler(
+    sender: Any, instance: models.CredentialInputSource, **kwargs: Any
+) -> None:
+    """Drop cached descriptors whose resolved inputs may have changed."""
+    invalidate_credential(instance.target_credential_id)
@@ -0,0 +1,93 @@
+#  Copyright 2025 Red Hat, Inc.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""Coalesced event stream counters.
+
+Events received by an event stream are counted in memory and written to
+the database in one UPDATE per flush interval instead of one UPDATE per
+event, so busy event streams do not serialize on their row lock.
+"""
+
+import atexit
+import datetime
+
+from django.db import transaction
+from django.db.models import (
+    BigIntegerField,
+    Case,
+    DateTimeField,
+    F,
+    Value,
+    When,
+)
+
+from aap_eda.core import models
+from aap_eda.core.utils.coalescing import CoalescingWriter
+
+
+class EventStreamStats(CoalescingWriter):
+    """Accumulate event counts per event stream and flush them in bulk."""
+
+    interval_setting = "EVENT_STREAM_STATS_FLUSH_INTERVAL_SECONDS"
+    error_message = "Failed to update event stream counters"
+
+    def __init__(self):
+        super().__init__()
+        # event stream id -> (events received, last event received at)
+        self._pending: dict[int, tuple[int, datetime.datetime]] = {}
+
+    def record(self, event_stream_id: int) -> None:
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        with self._lock:
+            count, _ = self._pending.get(event_stream_id, (0, now))
+            self._pending[event_stream_id] = (count + 1, now)
+        self._schedule_flush()
+
+    def _take_pending(self) -> dict[int, tuple[int, datetime.datetime]]:
+        pending, self._pending = self._pending, {}
+        return pending
+
+    def _restore(
+        self, batch: dict[int, tuple[int, datetime.datetime]]
+    ) -> None:
+        for pk, (count, last) in batch.items():
+            newer_count, newer_last = self._pending.get(pk, (0, last))
+            self._pending[pk] = (count + newer_count, newer_last)
+
+    def _write(
+        self, pending: dict[int, tuple[int, datetime.datetime]]
+    ) -> None:
+        """Write the pending counters with a single UPDATE."""
+        received = Case(
+            *[
+                When(id=pk, then=Value(count))
+                for pk, (count, _) in pending.items()
+            ],
+            output_field=BigIntegerField(),
+        )
+        last_received = Case(
+            *[
+                When(id=pk, then=Value(last))
+                for pk, (_, last) in pending.items()
+            ],
+            output_field=DateTimeField(),
+        )
+        with transaction.atomic():
+            models.EventStream.objects.filter(id__in=pending.keys()).update(
+                events_received=F("events_received") + received,
+                last_event_received_at=last_received,
+            )
+
+
+event_stream_stats = EventStreamStats()
+atexit.register(event_stream_stats.flush_at_exit)
@@ -12,9 +12,15 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 """Module to perform PG Notify to send data to activations."""
+import asyncio
 import json
 import logging
+import threading
+import time
 import uuid
+import weakref
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from typing import Any, AsyncIterator, Iterator, Optional
 
 import psycopg
 import xxhash
@@ -31,6 +37,290 @@ MESSAGE_CHUNK_SEQUENCE = "_message_chunk_sequence"
 MESSAGE_CHUNK = "_chunk"
 MESSAGE_LENGTH = "_message_length"
 MESSAGE_XX_HASH = "_message_xx_hash"
+PG_NOTIFY_SQL = "SELECT pg_notify(%s, %s)"
+
+
+class _BaseConnectionPool:
+    """Bookkeeping shared by the sync and async pg_notify pools.
+
+    Connections are opened lazily up to max_size and kept open between
+    requests. Idle connections are health checked before they are reused
+    and broken connections are discarded and replaced on the next checkout.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        max_size: int,
+        timeout: float,
+        max_idle_seconds: float,
+    ):
+        self.dsn = dsn
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle_seconds = max_idle_seconds
+        self._idle: list[tuple[Any, float]] = []
+        self._lock = threading.Lock()
+        self._stats = {
+            "checkouts": 0,
+            "timeouts": 0,
+            "connections_created": 0,
+            "connections_discarded": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    def stats(self) -> dict:
+        """Return a snapshot of the pool counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["idle"] = len(self._idle)
+        stats["max_size"] = self.max_size
+        return stats
+
+    def _after_acquire(self, waited: float, acquired: bool) -> None:
+        with self._lock:
+            if acquired:
+                self._stats["checkouts"] += 1
+            else:
+                self._stats["timeouts"] += 1
+            self._stats["wait_seconds_total"] += waited
+            self._stats["wait_seconds_max"] = max(
+                self._stats["wait_seconds_max"], waited
+            )
+        if not acquired:
+            logger.error(
+                "Timed out after %.3fs waiting for a PG Notify connection",
+                waited,
+            )
+            raise PGNotifyError("PG Notify connection pool exhausted")
+        logger.debug("PG Notify pool wait time %.6fs", waited)
+
+    def _increment(self, counter: str) -> None:
+        with self._lock:
+            self._stats[counter] += 1
+
+    def _pop_idle(self) -> Optional[tuple[Any, float]]:
+        with self._lock:
+            return self._idle.pop() if self._idle else None
+
+    def _push_idle(self, conn) -> None:
+        with self._lock:
+            self._idle.append((conn, time.monotonic()))
+
+    def _take_all_idle(self) -> list[tuple[Any, float]]:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        return idle
+
+    def _needs_ping(self, released_at: float) -> bool:
+        return time.monotonic() - released_at >= self.max_idle_seconds
+
+
+class PGNotifyConnectionPool(_BaseConnectionPool):
+    """A bounded pool of autocommit connections used to send pg_notify."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._slots = threading.BoundedSemaphore(self.max_size)
+
+    @contextmanager
+    def connection(self) -> Iterator[psycopg.Connection]:
+        """Borrow a connection from the pool for the duration of a block.
+
+        Raises PGNotifyError if no connection becomes available within
+        the pool timeout. A connection that raised OperationalError is
+        not returned to the pool.
+        """
+        start = time.monotonic()
+        acquired = self._slots.acquire(timeout=self.timeout)
+        self._after_acquire(time.monotonic() - start, acquired)
+
+        conn = None
+        try:
+            conn = self._checkout()
+            yield conn
+        except psycopg.OperationalError:
+            self._discard(conn)
+            conn = None
+            raise
+        finally:
+            if conn is not None:
+                self._checkin(conn)
+            self._slots.release()
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        for conn, _ in self._take_all_idle():
+            conn.close()
+
+    def _checkout(self) -> psycopg.Connection:
+        while (item := self._pop_idle()) is not None:
+            conn, released_at = item
+            if self._is_healthy(conn, released_at):
+                return conn
+            self._discard(conn)
+
+        conn = psycopg.connect(conninfo=self.dsn, autocommit=True)
+        self._increment("connections_created")
+        return conn
+
+    def _checkin(self, conn: psycopg.Connection) -> None:
+        if conn.closed or conn.broken:
+            self._discard(conn)
+            return
+        self._push_idle(conn)
+
+    def _discard(self, conn) -> None:
+        self._increment("connections_discarded")
+        if conn is not None and not conn.closed:
+            try:
+                conn.close()
+            except psycopg.Error as e:
+                logger.debug("Error closing PG Notify connection %s", str(e))
+
+    def _is_healthy(
+        self, conn: psycopg.Connection, released_at: float
+    ) -> bool:
+        if conn.closed or conn.broken:
+            return False
+        if not self._needs_ping(released_at):
+            return True
+        try:
+            conn.execute("SELECT 1")
+        except psycopg.Error as e:
+            logger.info("Discarding stale PG Notify connection %s", str(e))
+            return False
+        return True
+
+
+class AsyncPGNotifyConnectionPool(_BaseConnectionPool):
+    """An asyncio flavour of PGNotifyConnectionPool.
+
+    A pool is bound to the event loop it was created for, use
+    get_async_connection_pool to get the pool of the running loop.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._slots = asyncio.BoundedSemaphore(self.max_size)
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[psycopg.AsyncConnection]:
+        """Borrow a connection from the pool for the duration of a block."""
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.timeout)
+            acquired = True
+        except asyncio.TimeoutError:
+            acquired = False
+        self._after_acquire(time.monotonic() - start, acquired)
+
+        conn = None
+        try:
+            conn = await self._checkout()
+            yield conn
+        except psycopg.OperationalError:
+            await self._discard(conn)
+            conn = None
+            raise
+        finally:
+            if conn is not None:
+                await self._checkin(conn)
+            self._slots.release()
+
+    async def close(self) -> None:
+        """Close all idle connections."""
+        for conn, _ in self._take_all_idle():
+            await conn.close()
+
+    async def _checkout(self) -> psycopg.AsyncConnection:
+        while (item := self._pop_idle()) is not None:
+            conn, released_at = item
+            if await self._is_healthy(conn, released_at):
+                return conn
+            await self._discard(conn)
+
+        conn = await psycopg.AsyncConnection.connect(
+            conninfo=self.dsn, autocommit=True
+        )
+        self._increment("connections_created")
+        return conn
+
+    async def _checkin(self, conn: psycopg.AsyncConnection) -> None:
+        if conn.closed or conn.broken:
+            await self._discard(conn)
+            return
+        self._push_idle(conn)
+
+    async def _discard(self, conn) -> None:
+        self._increment("connections_discarded")
+        if conn is not None and not conn.closed:
+            try:
+                await conn.close()
+            except psycopg.Error as e:
+                logger.debug("Error closing PG Notify connection %s", str(e))
+
+    async def _is_healthy(
+        self, conn: psycopg.AsyncConnection, released_at: float
+    ) -> bool:
+        if conn.closed or conn.broken:
+            return False
+        if not self._needs_ping(released_at):
+            return True
+        try:
+            await conn.execute("SELECT 1")
+        except psycopg.Error as e:
+            logger.info("Discarding stale PG Notify connection %s", str(e))
+            return False
+        return True
+
+
+def _new_pool(pool_class: type, dsn: str):
+    return pool_class(
+        dsn,
+        max_size=settings.PG_NOTIFY_POOL_MAX_SIZE,
+        timeout=settings.PG_NOTIFY_POOL_TIMEOUT,
+        max_idle_seconds=settings.PG_NOTIFY_POOL_MAX_IDLE_SECONDS,
+    )
+
+
+_pools: dict[str, PGNotifyConnectionPool] = {}
+_pools_lock = threading.Lock()
+_async_pools: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, AsyncPGNotifyConnectionPool]
+] = weakref.WeakKeyDictionary()
+
+
+def get_connection_pool(dsn: str) -> PGNotifyConnectionPool:
+    """Return the process wide connection pool for a dsn."""
+    with _pools_lock:
+        pool = _pools.get(dsn)
+        if pool is None:
+            pool = _new_pool(PGNotifyConnectionPool, dsn)
+            _pools[dsn] = pool
+        return pool
+
+
+def get_async_connection_pool(dsn: str) -> AsyncPGNotifyConnectionPool:
+    """Return the connection pool for a dsn on the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        loop_pools = _async_pools.setdefault(loop, {})
+        pool = loop_pools.get(dsn)
+        if pool is None:
+            pool = _new_pool(AsyncPGNotifyConnectionPool, dsn)
+            loop_pools[dsn] = pool
+        return pool
+
+
+def close_connection_pools() -> None:
+    """Close and forget every sync connection pool in this process."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
 
 
 class PGNotify:
@@ -49,54 +339,116 @@ class PGNotify:
         self.data = data
 
     def __call__(self):
-        try:
-            with psycopg.connect(
-                conninfo=self.dsn,
-                autocommit=True,
-            ) as conn:
-                with conn.cursor() as cursor:
-                    payload = json.dumps(self.data)
-                    message_length = len(payload)
-                    logger.debug("Message length %d", message_length)
-                    if message_length >= MAX_MESSAGE_LENGTH:
-                        xx_hash = xxhash.xxh32(
-                            payload.encode("utf-8")
-                        ).hexdigest()
-                        logger.debug("Message length exceeds, will chunk")
-                        message_uuid = str(uuid.uuid4())
-                        number_of_chunks = (
-                            int(message_length / MAX_MESSAGE_LENGTH) + 1
-                        )
-                        chunked = {
-                            MESSAGE_CHUNKED_UUID: message_uuid,
-                            MESSAGE_CHUNK_COUNT: number_of_chunks,
-                            MESSAGE_LENGTH: message_length,
-                            MESSAGE_XX_HASH: xx_hash,
-                        }
-                        logger.debug("Chunk info %s", message_uuid)
-                        logger.debug("Number of chunks %d", number_of_chunks)
-                        logger.debug("Total data size %d", message_length)
-                        logger.debug("XX Hash %s", xx_hash)
-
-                        sequence = 1
-                        for i in range(0, message_length, MAX_MESSAGE_LENGTH):
-                            chunked[MESSAGE_CHUNK] = payload[
-                                i : i + MAX_MESSAGE_LENGTH
-                            ]
-                            chunked[MESSAGE_CHUNK_SEQUENCE] = sequence
-                            sequence += 1
-
-                            logger.debug(
-                                "Chunked Length %d", len(json.dumps(chunked))
-                            )
-                            cursor.execute(
-                                "SELECT pg_notify(%s, %s)",
-                                [self.channel, json.dumps(chunked)],
-                            )
-                    else:
-                        cursor.execute(
-                            "SELECT pg_notify(%s, %s)", [self.channel, payload]
-                        )
-        except psycopg.OperationalError as e:
-            logger.error("PG Notify operational error %s", str(e))
-            raise PGNotifyError() from e
+        pool = get_connection_pool(self.dsn)
+        messages = self._build_messages()
+        # A pooled connection may have been dropped by the server while
+        # idle, retry once on a fresh connection before giving up.
+        for attempt in range(2):
+            sent = False
+            try:
+                with pool.connection() as conn:
+                    with self._transaction(conn, messages):
+                        with conn.cursor() as cursor:
+                            if len(messages) == 1:
+                                cursor.execute(PG_NOTIFY_SQL, messages[0])
+                            else:
+                                cursor.executemany(PG_NOTIFY_SQL, messages)
+                        sent = True
+                return
+            except psycopg.OperationalError as e:
+                self._handle_operational_error(e, attempt, sent)
+
+    @staticmethod
+    def _transaction(conn, messages: list[list[str]]):
+        """Return the transaction the messages are sent in.
+
+        Notifications are delivered on commit, sending the chunks of a
+        message in one transaction makes listeners get all of them or
+        none, so a send that failed before the commit can be retried.
+        """
+        if len(messages) == 1:
+            return nullcontext()
+        return conn.transaction()
+
+    def _handle_operational_error(
+        self, error: psycopg.OperationalError, attempt: int, sent: bool
+    ) -> None:
+        # Once the messages are sent the commit may have gone through,
+        # resending could deliver them twice.
+        if attempt == 0 and not sent:
+            logger.warning(
+                "PG Notify operational error %s, reconnecting", str(error)
+            )
+            return
+        logger.error("PG Notify operational error %s", str(error))
+        raise PGNotifyError() from error
+
+    def _build_messages(self) -> list[list[str]]:
+        """Serialize the data into the pg_notify parameters to send.
+
+        Payloads that exceed the maximum message length are split into
+        chunks, each chunk is serialized once. Chunks are sent in a single
+        executemany call which psycopg pipelines, so they don't each pay a
+        network round trip.
+        """
+        payload = json.dumps(self.data)
+        message_length = len(payload)
+        logger.debug("Message length %d", message_length)
+        if message_length < MAX_MESSAGE_LENGTH:
+            return [[self.channel, payload]]
+
+        xx_hash = xxhash.xxh32(payload.encode("utf-8")).hexdigest()
+        logger.debug("Message length exceeds, will chunk")
+        message_uuid = str(uuid.uuid4())
+        number_of_chunks = int(message_length / MAX_MESSAGE_LENGTH) + 1
+        chunked = {
+            MESSAGE_CHUNKED_UUID: message_uuid,
+            MESSAGE_CHUNK_COUNT: number_of_chunks,
+            MESSAGE_LENGTH: message_length,
+            MESSAGE_XX_HASH: xx_hash,
+        }
+        logger.debug("Chunk info %s", message_uuid)
+        logger.debug("Number of chunks %d", number_of_chunks)
+        logger.debug("Total data size %d", message_length)
+        logger.debug("XX Hash %s", xx_hash)
+
+        messages = []
+        for sequence, i in enumerate(
+            range(0, message_length, MAX_MESSAGE_LENGTH), start=1
+        ):
+            message = json.dumps(
+                {
+                    **chunked,
+                    MESSAGE_CHUNK: payload[i : i + MAX_MESSAGE_LENGTH],
+                    MESSAGE_CHUNK_SEQUENCE: sequence,
+                }
+            )
+            logger.debug("Chunked Length %d", len(message))
+            messages.append([self.channel, message])
+        return messages
+
+
+class AsyncPGNotify(PGNotify):
+    """The asyncio flavour of PGNotify, for use in async views."""
+
+    async def __call__(self):
+        pool = get_async_connection_pool(self.dsn)
+        messages = self._build_messages()
+        for attempt in range(2):
+            sent = False
+            try:
+                async with pool.connection() as conn:
+                    async with self._transaction(conn, messages):
+                        async with conn.cursor() as cursor:
+                            if len(messages) == 1:
+                                await cursor.execute(
+                                    PG_NOTIFY_SQL, messages[0]
+                                )
+                            else:
+                                await cursor.executemany(
+                                    PG_NOTIFY_SQL, messages
+                                )
+                        sent = True
+                return
+            except psycopg.OperationalError as e:
+                self._handle_operational_error(e, attempt, sent)
@@ -124,6 +124,10 @@ WORKER_KIND: str = "api"
 WEBSOCKET_BASE_URL: str = "ws://localhost:8000"
 WEBSOCKET_SSL_VERIFY: Union[bool, str] = "yes"
 WEBSOCKET_TOKEN_BASE_URL: Optional[str] = None
+# Ansible events received from rulebook workers are written in batches
+# of up to this many events, or after this many milliseconds.
+WEBSOCKET_EVENT_BATCH_SIZE: int = 100
+WEBSOCKET_EVENT_BATCH_INTERVAL_MS: int = 200
 PODMAN_SOCKET_URL: Optional[str] = None
 PODMAN_SOCKET_TIMEOUT: Optional[int] = 0
 PODMAN_MEM_LIMIT: Optional[str] = "200m"
@@ -141,6 +145,13 @@ CONTAINER_NAME_PREFIX: str = "eda"
 K8S_MEM_LIMIT: Optional[str] = None
 K8S_CPU_LIMIT: Optional[str] = None
 
+# Read the status of activation pods from a list and watch of the EDA
+# pods shared by each worker process instead of listing the pods of
+# every activation on every monitor run. The watch is renewed after
+# K8S_POD_CACHE_WATCH_TIMEOUT_SECONDS.
+K8S_POD_CACHE_ENABLED: bool = True
+K8S_POD_CACHE_WATCH_TIMEOUT_SECONDS: int = 300
+
 # Comma-separated list of Kubernetes ServiceAccount names that activation
 # pods are allowed to use.  An empty list (default) means any valid SA
 # name is accepted.  Set via EDA_ALLOWED_SERVICE_ACCOUNTS env var.
@@ -151,6 +162,28 @@ ALLOWED_SERVICE_ACCOUNTS: StrToList = []
 # A list of queues to be used in multinode mode
 # If the list is empty, use the default singlenode queue name
 RULEBOOK_WORKER_QUEUES: StrToList = []
+# Relative capacity of the rulebook worker queues, by queue name. New
+# activations go to the queue with the fewest processes per unit of
+# capacity. Queues that are not listed have a capacity of 1.
+RULEBOOK_WORKER_QUEUE_WEIGHTS: dict = {}
+# Running rulebook processes are monitored in batches of at most this
+# many processes, submitted to the queue each process runs on. A batch
+# times out after DISPATCHERD_ACTIVATION_TASK_TIMEOUT per process.
+RULEBOOK_MONITOR_BATCH_SIZE: int = 100
+# The health of the rulebook worker queues is checked at most this often
+# when dispatching requests. Set to 0 to check it on every dispatch.
+RULEBOOK_QUEUE_HEALTH_CACHE_TTL_SECONDS: float = 5.0
+# Start requests wait in the request queue while this many rulebook
+# processes are starting, in total and on the queue of the worker.
+# User requested starts are admitted before automatic restarts.
+# 0, the default, sets no limit.
+RULEBOOK_START_MAX_CONCURRENT: int = 0
+RULEBOOK_START_MAX_CONCURRENT_PER_QUEUE: int = 0
+# Rulebook processes are started at most at this rate per second, with
+# bursts of up to RULEBOOK_START_BURST starts. 0, the default, sets no
+# limit.
+RULEBOOK_START_RATE: float = 0
+RULEBOOK_START_BURST: int = 10
 
 DEFAULT_QUEUE_TIMEOUT: int = 300
 DEFAULT_RULEBOOK_QUEUE_TIMEOUT: int = 120
@@ -176,6 +209,9 @@ CONTROLLER_SSL_VERIFY: Union[bool, str] = "yes"
 RULEBOOK_READINESS_TIMEOUT_SECONDS: int = 60
 RULEBOOK_LIVENESS_CHECK_SECONDS: int = 300
 RULEBOOK_LIVENESS_TIMEOUT_SECONDS: int = 310
+# Heartbeats of rulebook processes are written at most this often.
+# Set to 0 to write them as they arrive.
+RULEBOOK_HEARTBEAT_FLUSH_INTERVAL_SECONDS: float = 5.0
 ACTIVATION_RESTART_SECONDS_ON_COMPLETE: int = 0
 ACTIVATION_RESTART_SECONDS_ON_FAILURE: int = 60
 ACTIVATION_MAX_RESTARTS_ON_FAILURE: int = 5
@@ -238,7 +274,37 @@ EVENT_STREAM_MTLS_BASE_URL: UrlSlash = None
 # Set to False for local development without proxy:
 #   export EDA_EVENT_STREAM_REQUIRE_TRUSTED_PROXY=False
 EVENT_STREAM_REQUIRE_TRUSTED_PROXY: bool = True
+# Serve external event stream posts with an ASGI native async view.
+# Only enable when the event stream API runs under an ASGI server, e.g.
+#   daphne aap_eda.asgi:application
+EVENT_STREAM_ASYNC_INGESTION: bool = False
+# Per process cache of event stream data and credential inputs used by
+# the event stream API. Entries are invalidated when changed in the same
+# process, changes made by other API processes, e.g. a rotated
+# credential or test mode turned off, are only seen once the entry
+# expires. Disabled by default, set the ttl above 0 to enable it.
+EVENT_STREAM_CACHE_TTL_SECONDS: int = 0
+EVENT_STREAM_CACHE_MAX_SIZE: int = 1000
+# Event stream counters are accumulated in memory and written to the
+# database at most this often. Set to 0 to write them on every event.
+EVENT_STREAM_STATS_FLUSH_INTERVAL_SECONDS: float = 1.0
+# Per process cache of values fetched from external secret management
+# systems, keyed by credential input source. Values are kept encrypted
+# in memory. Disabled by default, set the ttl above 0 to enable it.
+EXTERNAL_SECRETS_CACHE_TTL_SECONDS: int = 0
+EXTERNAL_SECRETS_CACHE_MAX_SIZE: int = 1000
+# Cache of tokens found active by an OAuth2 introspection endpoint.
+# Entries never outlive the token exp, set the ttl to 0 to disable.
+EVENT_STREAM_INTROSPECTION_CACHE_TTL_SECONDS: int = 60
+EVENT_STREAM_INTROSPECTION_CACHE_MAX_SIZE: int = 10000
 MAX_PG_NOTIFY_MESSAGE_SIZE: int = 6144
+# Connection pool used by the API to publish event stream payloads
+# via pg_notify. Connections are kept open and reused across requests.
+PG_NOTIFY_POOL_MAX_SIZE: int = 10
+# Seconds to wait for a free pooled connection before failing the request
+PG_NOTIFY_POOL_TIMEOUT: float = 5.0
+# Idle connections older than this are health checked before reuse
+PG_NOTIFY_POOL_MAX_IDLE_SECONDS: int = 30
 
 # Database credentials for the event streams user
 EVENT_STREAM_DB_USER: Optional[str] = None
@@ -473,6 +473,33 @@ def post_loading(loaded_settings: Dynaconf):
             "The RULEBOOK_WORKER_QUEUES setting must not contain duplicates."
         )
 
+    for queue_name, weight in settings.RULEBOOK_WORKER_QUEUE_WEIGHTS.items():
+        if (
+            isinstance(weight, bool)
+            or not isinstance(weight, (int, float))
+            or weight <= 0
+        ):
+            raise ImproperlyConfigured(
+                "The RULEBOOK_WORKER_QUEUE_WEIGHTS setting must map queue "
+                f"names to positive numbers, got {weight!r} for "
+                f"'{queue_name}'."
+            )
+
+    for name in [
+        "RULEBOOK_START_MAX_CONCURRENT",
+        "RULEBOOK_START_MAX_CONCURRENT_PER_QUEUE",
+        "RULEBOOK_START_RATE",
+    ]:
+        if settings[name] < 0:
+            raise ImproperlyConfigured(
+                f"The {name} setting must not be negative."
+            )
+    if settings.RULEBOOK_START_RATE and settings.RULEBOOK_START_BURST < 1:
+        raise ImproperlyConfigured(
+            "The RULEBOOK_START_BURST setting must be at least 1 when "
+            "RULEBOOK_START_RATE is set."
+        )
+
     # If the list is empty, use the default queue name for single node mode
     if not settings.RULEBOOK_WORKER_QUEUES:
         settings.RULEBOOK_WORKER_QUEUES = [DEFAULT_RULEBOOK_QUEUE_NAME]
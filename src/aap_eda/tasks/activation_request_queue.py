@@ -51,6 +51,47 @@ def push(
         )
 
 
+@transaction.atomic
+def push_many(
+    parent_type: str,
+    parent_ids: list[int],
+    request: ActivationRequest,
+    request_id: str = "",
+) -> list[int]:
+    """Queue the same request for many parents at once.
+
+    Parents that no longer exist are skipped. Returns the ids of the
+    parents a request was queued for.
+    """
+    if parent_type == ProcessParentType.ACTIVATION:
+        model = Activation
+    else:
+        raise UnknownProcessParentType(
+            f"Unknown parent type {parent_type}",
+        )
+
+    existing_ids = set(
+        model.objects.filter(id__in=parent_ids).values_list("id", flat=True)
+    )
+    queued_ids = [
+        parent_id
+        for parent_id in dict.fromkeys(parent_ids)
+        if parent_id in existing_ids
+    ]
+    ActivationRequestQueue.objects.bulk_create(
+        [
+            ActivationRequestQueue(
+                process_parent_type=parent_type,
+                process_parent_id=parent_id,
+                request=request,
+                request_id=request_id,
+            )
+            for parent_id in queued_ids
+        ]
+    )
+    return queued_ids
+
+
 def peek_all(parent_type: str, parent_id: int) -> list[ActivationRequestQueue]:
     requests = ActivationRequestQueue.objects.filter(
         process_parent_type=parent_type, process_parent_id=parent_id
@@ -75,11 +116,13 @@ def list_requests() -> QuerySet[ActivationRequestQueue]:
 def _arbitrate(
     requests: list[ActivationRequestQueue],
 ) -> list[ActivationRequestQueue]:
+    """Return the requests left to run, deleting the discarded ones."""
     if len(requests) < 2:
         return requests
 
     ref_request = None
     qualified_requests = []
+    discarded_requests = []
     starts = [ActivationRequest.START, ActivationRequest.RESTART]
     for request in requests:
         if not ref_request:
@@ -87,16 +130,27 @@ def _arbitrate(
             continue
 
         ref_request = _resolve_request_pair(
-            ref_request, request, qualified_requests, starts
+            ref_request,
+            request,
+            qualified_requests,
+            discarded_requests,
+            starts,
         )
 
     if ref_request:
         qualified_requests.append(ref_request)
 
+    if discarded_requests:
+        ActivationRequestQueue.objects.filter(
+            id__in=[request.id for request in discarded_requests]
+        ).delete()
+
     return qualified_requests
 
 
-def _resolve_request_pair(ref_request, request, qualified_requests, starts):
+def _resolve_request_pair(
+    ref_request, request, qualified_requests, discarded_requests, starts
+):
     """Resolve a pair of activation requests, returning the new reference."""
     # nothing can be done after delete
     # or dedup
@@ -106,24 +160,24 @@ def _resolve_request_pair(ref_request, request, qualified_requests, starts):
         or request.request == ref_request.request
         or request.request == ActivationRequest.AUTO_START
     ):
-        request.delete()
+        discarded_requests.append(request)
         return ref_request
 
     if ref_request.request == ActivationRequest.AUTO_START:
-        ref_request.delete()
+        discarded_requests.append(ref_request)
         return request
 
     if request.request in (
         ActivationRequest.STOP,
         ActivationRequest.DELETE,
     ):
-        while qualified_requests:
-            qualified_requests.pop().delete()
-        ref_request.delete()
+        discarded_requests.extend(qualified_requests)
+        qualified_requests.clear()
+        discarded_requests.append(ref_request)
         return request
 
     if request.request in starts and ref_request.request in starts:
-        request.delete()
+        discarded_requests.append(request)
         return ref_request
 
     qualified_requests.append(ref_request)
@@ -12,16 +12,24 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import heapq
 import logging
 import random
 import uuid
-from collections import Counter
-from typing import Optional
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import partial
+from typing import Iterable, Iterator, Optional
 
 from ansible_base.lib.utils.db import advisory_lock
 from dispatcherd.factories import get_control_from_settings
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
 
 import aap_eda.tasks.activation_request_queue as requests_queue
 from aap_eda import utils
@@ -32,6 +40,7 @@ from aap_eda.core.enums import (
     ProcessParentType,
 )
 from aap_eda.core.models import Activation, ActivationRequestQueue
+from aap_eda.core.utils.cache import TTLCache
 from aap_eda.middleware.request_log_middleware import (
     assign_log_tracking_id,
     assign_request_id,
@@ -48,6 +57,16 @@ from .exceptions import UnknownProcessParentType
 
 LOGGER = logging.getLogger(__name__)
 
+# Health of the rulebook worker queues shared by the dispatches of
+# this process, see get_rulebook_queues_health
+queue_health_cache = TTLCache(
+    max_size=1024,
+    ttl=settings.RULEBOOK_QUEUE_HEALTH_CACHE_TTL_SECONDS,
+)
+QUEUE_HEALTH_MAX_WORKERS = 16
+START_ADMISSION_LOCK = "rulebook_start_admission"
+START_REQUESTS = [ActivationRequest.START, ActivationRequest.AUTO_START]
+
 
 class HealthyQueueNotFoundError(Exception):
     """Raised when a queue is not found."""
@@ -55,22 +74,30 @@ class HealthyQueueNotFoundError(Exception):
     ...
 
 
+class StartNotAdmittedError(Exception):
+    """Raised when a start has to wait for other processes to start."""
+
+    ...
+
+
 def _manage_process_job_id(process_parent_type: str, id: int) -> str:
     """Return the unique job id for the activation manager task."""
     return f"{process_parent_type}-{id}"
 
 
+def _get_process_parent_class(process_parent_type: str) -> type[Activation]:
+    if process_parent_type == ProcessParentType.ACTIVATION:
+        return Activation
+    raise UnknownProcessParentType(
+        f"Unknown process parent type {process_parent_type}",
+    )
+
+
 def get_process_parent(
     process_parent_type: str,
     parent_id: int,
 ) -> Activation:
-    if process_parent_type == ProcessParentType.ACTIVATION:
-        klass = Activation
-    else:
-        raise UnknownProcessParentType(
-            f"Unknown process parent type {process_parent_type}",
-        )
-
+    klass = _get_process_parent_class(process_parent_type)
     return klass.objects.get(id=parent_id)
 
 
@@ -165,13 +192,13 @@ def _run_request(
         f"Processing request {request.request} for {process_parent_type} "
         f"{process_parent.id}",
     )
-    start_commands = [ActivationRequest.START, ActivationRequest.AUTO_START]
     manager = ActivationManager(process_parent)
 
     try:
-        if request.request in start_commands:
+        if request.request in START_REQUESTS:
             manager.start(
                 is_restart=request.request == ActivationRequest.AUTO_START,
+                admission=_start_admission(request),
             )
         elif request.request == ActivationRequest.STOP:
             manager.stop()
@@ -179,6 +206,13 @@ def _run_request(
             manager.restart()
         elif request.request == ActivationRequest.DELETE:
             manager.delete()
+    except StartNotAdmittedError:
+        LOGGER.info(
+            f"Request {request.request} for {process_parent_type} "
+            f"{process_parent.id} is waiting for other rulebook processes "
+            "to start",
+        )
+        return False
     except Exception as e:
         LOGGER.error(
             f"Failed to process request {request.request} for "
@@ -188,6 +222,164 @@ def _run_request(
     return True
 
 
+@contextmanager
+def _start_admission(request: ActivationRequestQueue) -> Iterator[None]:
+    """Admit a start request, raise StartNotAdmittedError otherwise.
+
+    A start is admitted when fewer processes than the configured
+    limits are starting, in total and on the local queue, and the
+    start rate allows it. User requested starts are admitted before
+    automatic restarts, oldest first. The admission is held until the
+    activation manager has created the process, so it counts against
+    the limits before the next start is admitted. A start that is not
+    admitted stays in the request queue and is dispatched again by the
+    monitor.
+    """
+    with advisory_lock(START_ADMISSION_LOCK):
+        if not _is_start_admitted(request):
+            raise StartNotAdmittedError(
+                f"{request.process_parent_type} {request.process_parent_id} "
+                "can not start yet"
+            )
+        yield
+
+
+def _is_start_admitted(request: ActivationRequestQueue) -> bool:
+    queue_slots = _get_queue_start_slots(settings.RULEBOOK_QUEUE_NAME)
+    if queue_slots is not None and queue_slots <= 0:
+        return False
+    global_slots = _get_global_start_slots()
+    if global_slots is None:
+        return True
+    return _count_start_requests_ahead(request) < global_slots
+
+
+def _get_start_slots() -> Optional[int]:
+    """Return how many processes can start now, None if not limited.
+
+    Counts the slots left in total and on the worker queues together.
+    """
+    slots = [
+        slot
+        for slot in (_get_global_start_slots(), _get_queues_start_slots())
+        if slot is not None
+    ]
+    return max(min(slots), 0) if slots else None
+
+
+def _get_global_start_slots() -> Optional[int]:
+    """Return how many processes can start now, None if not limited.
+
+    The start rate is a token bucket of RULEBOOK_START_BURST tokens
+    refilled at RULEBOOK_START_RATE tokens per second, counted as the
+    processes created in the time it takes to refill the bucket.
+    """
+    slots = []
+    if settings.RULEBOOK_START_MAX_CONCURRENT:
+        starting = models.RulebookProcess.objects.filter(
+            status=ActivationStatus.STARTING
+        ).count()
+        slots.append(settings.RULEBOOK_START_MAX_CONCURRENT - starting)
+    if settings.RULEBOOK_START_RATE:
+        window = settings.RULEBOOK_START_BURST / settings.RULEBOOK_START_RATE
+        started = models.RulebookProcess.objects.filter(
+            started_at__gte=timezone.now() - timedelta(seconds=window)
+        ).count()
+        slots.append(settings.RULEBOOK_START_BURST - started)
+    return min(slots) if slots else None
+
+
+def _get_queue_start_slots(queue_name: str) -> Optional[int]:
+    """Return how many processes can start on a queue, None if not limited."""
+    if not settings.RULEBOOK_START_MAX_CONCURRENT_PER_QUEUE:
+        return None
+    starting = models.RulebookProcess.objects.filter(
+        status=ActivationStatus.STARTING,
+        rulebookprocessqueue__queue_name=queue_name,
+    ).count()
+    return settings.RULEBOOK_START_MAX_CONCURRENT_PER_QUEUE - starting
+
+
+def _get_queues_start_slots() -> Optional[int]:
+    """Return how many processes can start on all the worker queues."""
+    limit = settings.RULEBOOK_START_MAX_CONCURRENT_PER_QUEUE
+    if not limit:
+        return None
+    starting = dict(
+        models.RulebookProcessQueue.objects.filter(
+            queue_name__in=settings.RULEBOOK_WORKER_QUEUES,
+            process__status=ActivationStatus.STARTING,
+        )
+        .values("queue_name")
+        .annotate(count=Count("process_id"))
+        .values_list("queue_name", "count")
+    )
+    return sum(
+        max(limit - starting.get(queue_name, 0), 0)
+        for queue_name in settings.RULEBOOK_WORKER_QUEUES
+    )
+
+
+def _start_priority(request: ActivationRequestQueue) -> tuple[bool, int]:
+    """Sort key of start requests, in the order they are admitted."""
+    return request.request != ActivationRequest.START, request.id
+
+
+def _count_start_requests_ahead(request: ActivationRequestQueue) -> int:
+    """Count the pending starts of other parents to admit before this one.
+
+    Only the parents the monitor dispatches as starts are counted, once
+    each. A start followed by another request, such as a stop, is
+    resolved with that request and never waits for admission.
+    """
+    parent = (request.process_parent_type, request.process_parent_id)
+    priority = _start_priority(request)
+    ahead = 0
+    for other, parent_requests in _get_pending_requests().items():
+        start = _get_pending_start(parent_requests)
+        if other != parent and start and _start_priority(start) < priority:
+            ahead += 1
+    return ahead
+
+
+def _get_pending_requests() -> dict[tuple[str, int], list]:
+    """Return the pending requests by process parent, oldest first."""
+    requests = defaultdict(list)
+    for request in ActivationRequestQueue.objects.order_by("id"):
+        requests[
+            (request.process_parent_type, request.process_parent_id)
+        ].append(request)
+    return requests
+
+
+def _get_pending_start(
+    parent_requests: list[ActivationRequestQueue],
+) -> Optional[ActivationRequestQueue]:
+    """Return the start a parent waits for, None if it has other requests."""
+    if all(request.request in START_REQUESTS for request in parent_requests):
+        return min(parent_requests, key=_start_priority)
+    return None
+
+
+def get_start_queue_stats() -> dict:
+    """Return the depth and the wait time of the pending start requests."""
+    pending = ActivationRequestQueue.objects.filter(request__in=START_REQUESTS)
+    counts = dict(
+        pending.order_by().values_list("request").annotate(Count("id"))
+    )
+    oldest = pending.aggregate(oldest=Min("created_at"))["oldest"]
+    return {
+        "user_starts": counts.get(ActivationRequest.START, 0),
+        "auto_starts": counts.get(ActivationRequest.AUTO_START, 0),
+        "max_wait_seconds": (
+            (timezone.now() - oldest).total_seconds() if oldest else 0.0
+        ),
+        "starting": models.RulebookProcess.objects.filter(
+            status=ActivationStatus.STARTING
+        ).count(),
+    }
+
+
 def queue_dispatch(
     process_parent_type: ProcessParentType,
     process_parent_id: int,
@@ -347,7 +539,7 @@ def _resolve_existing_queue(
             )
             return None
 
-    if not check_rulebook_queue_health(queue_name):
+    if not get_rulebook_queues_health([queue_name])[queue_name]:
         return _handle_unhealthy_queue(
             queue_name,
             process_parent_type,
@@ -438,30 +630,87 @@ def _handle_unhealthy_queue(
 
 
 def get_least_busy_queue_name() -> str:
-    """Return the queue name with the least running processes."""
-    queue_counter = Counter()
+    """Return the healthy queue with the least load.
 
-    for queue_name in settings.RULEBOOK_WORKER_QUEUES:
-        if not check_rulebook_queue_health(queue_name):
-            continue
-        running_processes_count = models.RulebookProcess.objects.filter(
-            status__in=[ActivationStatus.RUNNING, ActivationStatus.STARTING],
-            rulebookprocessqueue__queue_name=queue_name,
-        ).count()
-        queue_counter[queue_name] = running_processes_count
+    The load of a queue is its number of running processes divided by
+    its weight in RULEBOOK_WORKER_QUEUE_WEIGHTS.
+    """
+    return place_rulebook_processes(1)[0]
+
+
+def place_rulebook_processes(count: int) -> list[str]:
+    """Return the queues to start the given number of processes on.
 
-    if not queue_counter:
+    Every process goes to the healthy queue with the least load,
+    counting the processes placed before it. Ties are broken at random.
+    """
+    queues_health = get_rulebook_queues_health(settings.RULEBOOK_WORKER_QUEUES)
+    healthy_queues = [
+        queue_name
+        for queue_name in settings.RULEBOOK_WORKER_QUEUES
+        if queues_health[queue_name]
+    ]
+
+    if not healthy_queues:
         raise HealthyQueueNotFoundError(
             "No healthy queue found to dispatch the request",
         )
 
-    min_count = queue_counter.most_common()[-1][1]
-    least_common = [
-        queue for queue, count in queue_counter.items() if count == min_count
+    queues_load = get_rulebook_queues_load(healthy_queues)
+    weights = settings.RULEBOOK_WORKER_QUEUE_WEIGHTS
+    heap = [
+        (
+            queues_load[queue_name] / weights.get(queue_name, 1),
+            random.random(),
+            queue_name,
+        )
+        for queue_name in healthy_queues
     ]
-    if len(least_common) == 1:
-        return least_common[0]
-    return random.choice(least_common)
+    heapq.heapify(heap)
+
+    placements = []
+    for _ in range(count):
+        _, _, queue_name = heapq.heappop(heap)
+        placements.append(queue_name)
+        queues_load[queue_name] += 1
+        heapq.heappush(
+            heap,
+            (
+                queues_load[queue_name] / weights.get(queue_name, 1),
+                random.random(),
+                queue_name,
+            ),
+        )
+    return placements
+
+
+def get_rulebook_queues_load(
+    queue_names: Optional[Iterable[str]] = None,
+) -> Counter:
+    """Return the number of running processes by queue name.
+
+    Starting and running processes are counted for all the queues in
+    one query. Defaults to the configured rulebook worker queues.
+    """
+    if queue_names is None:
+        queue_names = settings.RULEBOOK_WORKER_QUEUES
+    queue_names = list(queue_names)
+
+    counts = (
+        models.RulebookProcessQueue.objects.filter(
+            queue_name__in=queue_names,
+            process__status__in=[
+                ActivationStatus.RUNNING,
+                ActivationStatus.STARTING,
+            ],
+        )
+        .values("queue_name")
+        .annotate(count=Count("process_id"))
+        .values_list("queue_name", "count")
+    )
+    queues_load = Counter(dict.fromkeys(queue_names, 0))
+    queues_load.update(dict(counts))
+    return queues_load
 
 
 def get_queue_name_by_parent_id(
@@ -516,6 +765,225 @@ def check_rulebook_queue_health(queue_name: str) -> bool:
         return False
 
 
+def get_rulebook_queues_health(queue_names: Iterable[str]) -> dict[str, bool]:
+    """Return the health of the given queues by queue name.
+
+    Results are kept for RULEBOOK_QUEUE_HEALTH_CACHE_TTL_SECONDS, so
+    consecutive dispatches share them. The queues without a recent
+    result are checked concurrently, an unresponsive queue costs one
+    healthcheck timeout instead of one per queue.
+    """
+    health = {}
+    stale = []
+    for queue_name in queue_names:
+        alive = queue_health_cache.get(queue_name)
+        if alive is None:
+            stale.append(queue_name)
+        else:
+            health[queue_name] = alive
+
+    if len(stale) == 1:
+        results = [check_rulebook_queue_health(stale[0])]
+    elif stale:
+        with ThreadPoolExecutor(
+            max_workers=min(len(stale), QUEUE_HEALTH_MAX_WORKERS)
+        ) as executor:
+            results = list(executor.map(check_rulebook_queue_health, stale))
+    else:
+        results = []
+
+    for queue_name, alive in zip(stale, results):
+        queue_health_cache.set(queue_name, alive)
+        health[queue_name] = alive
+    return health
+
+
+def dispatch_requests(
+    process_parent_type: str, process_parent_id: int
+) -> None:
+    """Dispatch the pending requests of a process parent.
+
+    Submitted when a request is pushed so it is handled right away
+    instead of on the next run of monitor_rulebook_processes, which
+    still dispatches any request missed here.
+    """
+    pending_requests = requests_queue.peek_all(
+        process_parent_type, process_parent_id
+    )
+    if not pending_requests:
+        return
+    request = pending_requests[0]
+    queue_dispatch(
+        process_parent_type,
+        process_parent_id,
+        request.request,
+        request.request_id,
+    )
+
+
+def _submit_dispatch_requests(
+    process_parent_type: str, process_parent_id: int
+) -> None:
+    try:
+        tasking.unique_enqueue(
+            settings.DISPATCHERD_DEFAULT_CHANNEL,
+            f"dispatch-{process_parent_type}-{process_parent_id}",
+            dispatch_requests,
+            process_parent_type,
+            process_parent_id,
+            timeout=settings.DISPATCHERD_ACTIVATION_TASK_TIMEOUT,
+        )
+    except Exception as e:
+        LOGGER.warning(
+            f"Failed to submit the requests of {process_parent_type} "
+            f"{process_parent_id} for dispatch, they will be dispatched "
+            f"by the next monitor run. Reason {str(e)}",
+        )
+
+
+def _push_request(
+    process_parent_type: ProcessParentType,
+    process_parent_id: int,
+    request: ActivationRequest,
+    request_id: str,
+) -> None:
+    """Queue a request and dispatch it once it is committed."""
+    requests_queue.push(
+        process_parent_type,
+        process_parent_id,
+        request,
+        request_id,
+    )
+    transaction.on_commit(
+        partial(
+            _submit_dispatch_requests,
+            str(process_parent_type),
+            process_parent_id,
+        )
+    )
+
+
+def dispatch_bulk_requests(
+    process_parent_type: str,
+    request_type: ActivationRequest,
+    process_parent_ids: list[int],
+    request_id: str = "",
+) -> None:
+    """Dispatch the same request for many process parents.
+
+    Starts are placed on the queues in a single pass, only as many as
+    can start now, the others are dispatched by the monitor once there
+    is room for them. Other requests are submitted in batches to the
+    queue of each parent, parents whose queue is unknown or unhealthy
+    are dispatched one by one.
+    """
+    if request_type in START_REQUESTS:
+        slots = _get_start_slots()
+        if slots is not None and slots < len(process_parent_ids):
+            LOGGER.info(
+                f"{len(process_parent_ids) - slots} {process_parent_type} "
+                "start requests left for the monitor to dispatch",
+            )
+            process_parent_ids = process_parent_ids[:slots]
+        try:
+            placements = place_rulebook_processes(len(process_parent_ids))
+        except HealthyQueueNotFoundError:
+            # Let the dispatch of each parent report the missing queues
+            placements = [None] * len(process_parent_ids)
+
+        for process_parent_id, queue_name in zip(
+            process_parent_ids, placements
+        ):
+            if queue_name is None:
+                queue_dispatch(
+                    process_parent_type,
+                    process_parent_id,
+                    request_type,
+                    request_id,
+                )
+                continue
+            tasking.unique_enqueue(
+                queue_name,
+                _manage_process_job_id(process_parent_type, process_parent_id),
+                _manage,
+                process_parent_type,
+                process_parent_id,
+                request_id,
+                timeout=settings.DISPATCHERD_ACTIVATION_TASK_TIMEOUT,
+            )
+        LOGGER.info(
+            f"{len(process_parent_ids)} {process_parent_type} start "
+            "requests dispatched",
+        )
+        return
+
+    klass = _get_process_parent_class(process_parent_type)
+    process_parents = defaultdict(list)
+    for process_parent_id, queue_name in klass.objects.filter(
+        id__in=process_parent_ids
+    ).values_list("id", "latest_instance__rulebookprocessqueue__queue_name"):
+        process_parents[queue_name].append(
+            (process_parent_type, process_parent_id)
+        )
+    _dispatch_in_batches(process_parents, request_type, request_id)
+
+
+def _submit_dispatch_bulk_requests(
+    process_parent_type: str,
+    request_type: ActivationRequest,
+    process_parent_ids: list[int],
+    request_id: str,
+) -> None:
+    try:
+        tasking.unique_enqueue(
+            settings.DISPATCHERD_DEFAULT_CHANNEL,
+            f"bulk-dispatch-{request_type}-{request_id}",
+            dispatch_bulk_requests,
+            process_parent_type,
+            str(request_type),
+            process_parent_ids,
+            request_id,
+            timeout=settings.DISPATCHERD_ACTIVATION_TASK_TIMEOUT,
+        )
+    except Exception as e:
+        LOGGER.warning(
+            f"Failed to submit the {request_type} requests of "
+            f"{len(process_parent_ids)} {process_parent_type} for dispatch, "
+            f"they will be dispatched by the next monitor run. "
+            f"Reason {str(e)}",
+        )
+
+
+def push_bulk_requests(
+    process_parent_type: ProcessParentType,
+    process_parent_ids: list[int],
+    request_type: ActivationRequest,
+    request_id: str,
+) -> list[int]:
+    """Queue the same request for many process parents.
+
+    The requests are dispatched together once they are committed.
+    Returns the ids of the parents the request was queued for.
+    """
+    queued_ids = requests_queue.push_many(
+        process_parent_type,
+        process_parent_ids,
+        request_type,
+        request_id,
+    )
+    if queued_ids:
+        transaction.on_commit(
+            partial(
+                _submit_dispatch_bulk_requests,
+                str(process_parent_type),
+                request_type,
+                queued_ids,
+                request_id,
+            )
+        )
+    return queued_ids
+
+
 # Internal start/restart requests are sent by the manager in restart_helper.py
 def start_rulebook_process(
     process_parent_type: ProcessParentType,
@@ -523,7 +991,7 @@ def start_rulebook_process(
     request_id: str = "",
 ) -> None:
     """Create a request to start the activation with the given id."""
-    requests_queue.push(
+    _push_request(
         process_parent_type,
         process_parent_id,
         ActivationRequest.START,
@@ -537,7 +1005,7 @@ def stop_rulebook_process(
     request_id: str = "",
 ) -> None:
     """Create a request to stop the activation with the given id."""
-    requests_queue.push(
+    _push_request(
         process_parent_type,
         process_parent_id,
         ActivationRequest.STOP,
@@ -551,7 +1019,7 @@ def delete_rulebook_process(
     request_id: str = "",
 ) -> None:
     """Create a request to delete the activation with the given id."""
-    requests_queue.push(
+    _push_request(
         process_parent_type,
         process_parent_id,
         ActivationRequest.DELETE,
@@ -565,7 +1033,7 @@ def restart_rulebook_process(
     request_id: str = "",
 ) -> None:
     """Create a request to restart the activation with the given id."""
-    requests_queue.push(
+    _push_request(
         process_parent_type,
         process_parent_id,
         ActivationRequest.RESTART,
@@ -573,17 +1041,145 @@ def restart_rulebook_process(
     )
 
 
-def monitor_rulebook_processes_no_lock() -> None:
-    """Monitor activations scheduled task.
+def _manage_batch_job_id(
+    queue_name: str, index: int, request_id: Optional[str] = None
+) -> str:
+    """Return the job id of a batch of process parents.
 
-    Started by the scheduler, executed by the default worker.
-    It dispatches a task for each activation that needs to be managed.
-    Handles both user requests and monitoring of running activations.
-    It will not enqueue a task if there is already one for the same
-    activation.
+    Monitor batches get the same ids on every sweep, so a sweep does not
+    pile up batches behind one that is still running.
+    """
+    return f"batch-{queue_name}-{request_id or 'monitor'}-{index}"
+
+
+def _manage_batch(
+    job_id: str,
+    process_parents: list[tuple[str, int]],
+    request_id: Optional[str] = None,
+) -> None:
+    """Run the activation manager for a batch of process parents.
+
+    Submitted to the queue the processes run on. Every parent is managed
+    under the given request id, or a new one when none is given. Only one
+    batch with the given job id runs at a time.
+    """
+    with advisory_lock(job_id, wait=False) as acquired:
+        if not acquired:
+            LOGGER.debug(f"Batch {job_id} already being ran, exiting")
+            return
+
+        for process_parent_type, process_parent_id in process_parents:
+            try:
+                _manage(
+                    process_parent_type,
+                    process_parent_id,
+                    request_id or str(uuid.uuid4()),
+                )
+            except Exception as e:
+                LOGGER.error(
+                    f"Failed to monitor {process_parent_type} "
+                    f"{process_parent_id}. Reason {str(e)}",
+                    exc_info=settings.DEBUG,
+                )
+
+
+def _get_monitored_process_parents() -> dict[Optional[str], list]:
+    """Return the parents of the processes to monitor by queue name.
+
+    The queue is the one of the latest process of the parent, None when
+    it is not associated with a queue.
+    """
+    processes = (
+        models.RulebookProcess.objects.filter(
+            status__in=[
+                ActivationStatus.STARTING,
+                ActivationStatus.RUNNING,
+                ActivationStatus.WORKERS_OFFLINE,
+            ]
+        )
+        .values_list(
+            "parent_type",
+            "activation_id",
+            "activation__latest_instance__rulebookprocessqueue__queue_name",
+        )
+        .order_by("activation_id")
+        .distinct()
+    )
+    process_parents = defaultdict(list)
+    for process_parent_type, process_parent_id, queue_name in processes:
+        process_parents[queue_name].append(
+            (str(process_parent_type), process_parent_id)
+        )
+    return process_parents
+
+
+def _dispatch_in_batches(
+    process_parents: dict[Optional[str], list[tuple[str, int]]],
+    request_type: Optional[ActivationRequest] = None,
+    request_id: Optional[str] = None,
+) -> None:
+    """Submit the process parents in batches to the queue they run on.
+
+    Parents whose queue is unknown or unhealthy are dispatched one by
+    one, so their status is updated or they are moved to another queue.
     """
-    # run pending user requests
-    for request in requests_queue.list_requests():
+    known_queues = [
+        queue_name
+        for queue_name in process_parents
+        if queue_name in settings.RULEBOOK_WORKER_QUEUES
+    ]
+    queues_health = get_rulebook_queues_health(known_queues)
+    batch_size = settings.RULEBOOK_MONITOR_BATCH_SIZE
+
+    for queue_name, parents in process_parents.items():
+        if not queues_health.get(queue_name):
+            for process_parent_type, process_parent_id in parents:
+                queue_dispatch(
+                    process_parent_type,
+                    process_parent_id,
+                    request_type,
+                    request_id or str(uuid.uuid4()),
+                )
+            continue
+
+        for index, start in enumerate(range(0, len(parents), batch_size)):
+            batch = parents[start : start + batch_size]
+            job_id = _manage_batch_job_id(queue_name, index, request_id)
+            tasking.unique_enqueue(
+                queue_name,
+                job_id,
+                _manage_batch,
+                job_id,
+                batch,
+                request_id,
+                # The parents of a batch are managed one after another
+                timeout=settings.DISPATCHERD_ACTIVATION_TASK_TIMEOUT
+                * len(batch),
+            )
+        if parents:
+            LOGGER.info(
+                f"{len(parents)} processes submitted in batches to "
+                f"queue {queue_name}",
+            )
+
+
+def _dispatch_pending_requests() -> set[tuple[str, int]]:
+    """Dispatch the parents with pending user requests, return them.
+
+    Parents that are only waiting to start are dispatched in the order
+    their starts are admitted, no more of them than can start now. The
+    others stay queued until a later run, rather than each waiting for
+    the admission in a task of its own.
+    """
+    requests = _get_pending_requests()
+
+    starts = []
+    for parent_requests in requests.values():
+        start = _get_pending_start(parent_requests)
+        if start:
+            starts.append(start)
+            continue
+        request = parent_requests[0]
         queue_dispatch(
             request.process_parent_type,
             request.process_parent_id,
@@ -591,22 +1187,46 @@ def monitor_rulebook_processes_no_lock() -> None:
             request.request_id,
         )
 
-    # monitor running instances
-    for process in models.RulebookProcess.objects.filter(
-        status__in=[
-            ActivationStatus.STARTING,
-            ActivationStatus.RUNNING,
-            ActivationStatus.WORKERS_OFFLINE,
-        ]
-    ):
-        process_parent_type = str(process.parent_type)
-        process_parent_id = process.activation_id
+    if starts:
+        starts.sort(key=_start_priority)
+        slots = _get_start_slots()
+        for request in starts if slots is None else starts[:slots]:
+            queue_dispatch(
+                request.process_parent_type,
+                request.process_parent_id,
+                request.request,
+                request.request_id,
+            )
+    return set(requests)
 
-        queue_dispatch(
-            process_parent_type,
-            process_parent_id,
-            None,
-            str(uuid.uuid4()),
+
+def monitor_rulebook_processes_no_lock() -> None:
+    """Monitor activations scheduled task.
+
+    Started by the scheduler, executed by the default worker.
+    Pending user requests are dispatched one by one, starts only as
+    many as can be admitted. Running activations are monitored in
+    batches, one task per batch is submitted to the queue the
+    activations run on. Activations whose queue is unknown or unhealthy
+    are dispatched one by one, so their status is updated or they are
+    moved to another queue.
+    """
+    requested = _dispatch_pending_requests()
+
+    # monitor running instances, parents with requests are already
+    # managed by the tasks dispatched above
+    process_parents = {
+        queue_name: [parent for parent in parents if parent not in requested]
+        for queue_name, parents in _get_monitored_process_parents().items()
+    }
+    _dispatch_in_batches(process_parents)
+
+    stats = get_start_queue_stats()
+    if stats["user_starts"] or stats["auto_starts"]:
+        LOGGER.info(
+            f"{stats['user_starts']} user and {stats['auto_starts']} "
+            f"automatic starts pending, {stats['starting']} processes "
+            f"starting, oldest waiting for {stats['max_wait_seconds']:.0f}s",
         )
 
 
@@ -1,6 +1,8 @@
+import asyncio
 import base64
 import json
 import logging
+import time
 import typing as tp
 from datetime import datetime
 from enum import Enum
@@ -12,7 +14,7 @@ from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import DatabaseError
+from django.db import DatabaseError, transaction
 from django.utils import timezone
 
 from aap_eda.api.vault import encrypt_string
@@ -23,7 +25,10 @@ from aap_eda.core.exceptions import (
     DuplicateFileTemplateKeyError,
     InvalidEnvKeyError,
 )
-from aap_eda.core.models.utils import get_default_rule_engine_credential
+from aap_eda.core.models.utils import (
+    get_credential_type_id,
+    get_default_rule_engine_credential,
+)
 from aap_eda.core.utils.credentials import (
     add_default_values_to_user_inputs,
     get_resolved_secrets,
@@ -31,6 +36,7 @@ from aap_eda.core.utils.credentials import (
 )
 from aap_eda.core.utils.strings import extract_variables, substitute_variables
 from aap_eda.middleware.request_log_middleware import assign_log_tracking_id
+from aap_eda.services.activation.ruleset_stats import ruleset_stats_aggregator
 from aap_eda.services.auth import parse_jwt_token
 from aap_eda.services.exceptions import InvalidTokenError
 
@@ -102,6 +108,21 @@ host_status_map = {
 DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
 
 
+class _ResolvedSecrets:
+    """Resolve the secrets of each credential once.
+
+    Returns a copy of the inputs, callers are free to modify it.
+    """
+
+    def __init__(self):
+        self._inputs: dict[int, dict] = {}
+
+    def __call__(self, credential: models.EdaCredential) -> dict:
+        if credential.id not in self._inputs:
+            self._inputs[credential.id] = get_resolved_secrets(credential)
+        return dict(self._inputs[credential.id])
+
+
 class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -109,6 +130,25 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
         self._legacy_token_warning_logged = (
             False  # Track if warning was logged
         )
+        # Ansible events are buffered and written in batches
+        self._event_buffer: list[AnsibleEventMessage] = []
+        self._event_flush_lock = asyncio.Lock()
+        self._event_flush_task: Optional[asyncio.Task] = None
+        # Activations by rulebook process id, loaded at the worker
+        # handshake and reloaded when the rulebook process restarts
+        self._activations: dict[str, models.Activation] = {}
+        # AAP host of each rulebook process, resolved on the first action
+        self._aap_hosts: dict[int, dict] = {}
+
+    async def disconnect(self, code):
+        if self._event_flush_task is not None:
+            self._event_flush_task.cancel()
+            self._event_flush_task = None
+        try:
+            await self.flush_events()
+        except Exception:
+            # Nothing awaits this task, log instead of losing the error
+            logger.exception("Failed to store ansible events")
 
     def _get_token_payload(self) -> dict:
         """Get and cache the parsed JWT token payload from websocket.
@@ -222,11 +262,13 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
                     activation_instance_id
                 )
                 logger.warning(
-                    f"SECURITY WARNING: Legacy token without "
-                    f"activation_instance_id used for activation "
-                    f"'{activation_name}' (ID: {activation_instance_id}). "
-                    f"RECOMMENDATION: Restart activation to generate new "
-                    f"scoped token."
+                    "SECURITY WARNING: Legacy token without "
+                    "activation_instance_id used for activation "
+                    "'%s' (ID: %s). "
+                    "RECOMMENDATION: Restart activation to generate new "
+                    "scoped token.",
+                    activation_name,
+                    activation_instance_id,
                 )
 
     async def _validate_message_token_scope(self, data: dict) -> None:
@@ -266,12 +308,16 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
             msg_type: The message type
             data: The message data
         """
+        if msg_type == MessageType.ANSIBLE_EVENT:
+            await self.handle_events(AnsibleEventMessage.parse_obj(data))
+            return
+
+        # Keep buffered events ahead of the messages that follow them
+        await self.flush_events()
         if msg_type == MessageType.WORKER:
             await self.handle_workers(WorkerMessage.parse_obj(data))
         elif msg_type == MessageType.JOB:
             await self.handle_jobs(JobMessage.parse_obj(data))
-        elif msg_type == MessageType.ANSIBLE_EVENT:
-            await self.handle_events(AnsibleEventMessage.parse_obj(data))
         elif msg_type == MessageType.ACTION:
             await self.handle_actions(ActionMessage.parse_obj(data))
         elif msg_type == MessageType.SHUTDOWN:
@@ -279,7 +325,7 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
         elif msg_type == MessageType.SESSION_STATS:
             await self.handle_heartbeat(HeartbeatMessage.parse_obj(data))
         else:
-            logger.warning(f"Unsupported message received: {data}")
+            logger.warning("Unsupported message received: %s", data)
 
     def _log_message_error(
         self, err: Exception, msg_type: MessageType, data: dict
@@ -299,13 +345,18 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
         )
 
     async def receive(self, text_data=None, bytes_data=None):
-        data = json.loads(text_data)
+        # Binary frames carry the same UTF-8 encoded JSON messages
+        data = json.loads(text_data if text_data is not None else bytes_data)
 
-        logger.debug(f"AnsibleRulebookConsumer received: {data}")
+        logger.debug("AnsibleRulebookConsumer received: %s", data)
         msg_type = MessageType(data.get("type"))
 
         try:
             await self._validate_message_token_scope(data)
+            if msg_type == MessageType.WORKER:
+                # A worker message announces a (re)started rulebook
+                # process, reload the activation it runs for
+                self._activations.pop(str(data.get("activation_id")), None)
             await self._set_log_tracking_id(data)
             await self._dispatch_message(msg_type, data)
         except (DatabaseError, ObjectDoesNotExist) as err:
@@ -320,123 +371,200 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
             await self.close(code=WS_CLOSE_TOKEN_AUTH_FAILED)
 
     async def handle_workers(self, message: WorkerMessage):
-        additional_credentials = []
+        started_at = time.monotonic()
         logger.info(
-            "Start to handle workers: activation_instance_id: "
-            f"{message.activation_id}"
+            "Start to handle workers: activation_instance_id: %s",
+            message.activation_id,
         )
-        activation = await self.get_activation(message.activation_id)
-        rulesets = activation.rulebook_rulesets
-        extra_var = activation.extra_var
+        activation = await self.get_cached_activation(message.activation_id)
 
-        rulebook_message = Rulebook(
-            data=base64.b64encode(rulesets.encode()).decode()
+        # Resolve the credentials while the rulebook is being sent
+        credential_messages = asyncio.ensure_future(
+            self.get_credential_messages(activation)
         )
-        if extra_var:
-            extra_var_message = ExtraVars(
-                data=base64.b64encode(extra_var.encode()).decode()
-            )
-            await self.send(text_data=extra_var_message.json())
-
-        await self.send(text_data=rulebook_message.json())
-
-        controller_info = await self.get_controller_info(activation)
-        if controller_info:
-            await self.send(text_data=controller_info.json())
-
-        rule_engine_credential = await self.get_rule_engine_credential(
-            activation
-        )
-        if rule_engine_credential is not None:
-            additional_credentials.append(rule_engine_credential)
+        try:
+            rulesets = activation.rulebook_rulesets
+            extra_var = activation.extra_var
 
-        eda_vault_data = await self.get_eda_system_vault_passwords(activation)
-        if eda_vault_data:
-            vault_collection = VaultCollection(data=eda_vault_data)
-            await self.send(text_data=vault_collection.json())
+            rulebook_message = Rulebook(
+                data=base64.b64encode(rulesets.encode()).decode()
+            )
+            if extra_var:
+                extra_var_message = ExtraVars(
+                    data=base64.b64encode(extra_var.encode()).decode()
+                )
+                await self.send(text_data=extra_var_message.json())
 
-        file_contents = await self.get_file_contents_from_credentials(
-            activation, additional_credentials
-        )
-        for file_content in file_contents:
-            await self.send(text_data=file_content.json())
+            await self.send(text_data=rulebook_message.json())
+        except BaseException:
+            credential_messages.cancel()
+            raise
 
-        env_var = await self.get_env_vars_from_credentials(
-            activation, additional_credentials
-        )
-        if env_var:
-            env_var_message = EnvVars(
-                data=base64.b64encode(env_var.encode()).decode()
-            )
-            await self.send(text_data=env_var_message.json())
+        for credential_message in await credential_messages:
+            await self.send(text_data=credential_message.json())
 
         await self.send(text_data=EndOfResponse().json())
+        logger.info(
+            "Handled workers: activation_instance_id: %s in %.3f seconds",
+            message.activation_id,
+            time.monotonic() - started_at,
+        )
         # TODO: add broadcasting later by channel groups
 
     async def handle_jobs(self, message: JobMessage):
-        logger.info(f"Start to handle jobs: {message}")
+        logger.info("Start to handle jobs: %s", message)
         await self.insert_job_related_data(message)
 
     async def handle_events(self, message: AnsibleEventMessage):
-        logger.info(f"Start to handle events: {message}")
-        await self.insert_event_related_data(message)
+        # Logged per event, keep it out of the default log level
+        logger.debug("Start to handle events: %s", message)
+        self._event_buffer.append(message)
+        if len(self._event_buffer) >= settings.WEBSOCKET_EVENT_BATCH_SIZE:
+            # Writing inline stops reading from the websocket until the
+            # batch is stored, which throttles fast senders.
+            await self.flush_events()
+        elif self._event_flush_task is None:
+            self._event_flush_task = asyncio.create_task(
+                self._flush_events_later()
+            )
+
+    async def flush_events(self) -> None:
+        """Write the buffered ansible events."""
+        async with self._event_flush_lock:
+            messages, self._event_buffer = self._event_buffer, []
+            if messages:
+                await self.insert_event_related_data(messages)
+
+    async def _flush_events_later(self) -> None:
+        await asyncio.sleep(settings.WEBSOCKET_EVENT_BATCH_INTERVAL_MS / 1000)
+        self._event_flush_task = None
+        try:
+            await self.flush_events()
+        except Exception:
+            # Nothing awaits this task, log instead of losing the error
+            logger.exception("Failed to store ansible events")
 
     async def handle_actions(self, message: ActionMessage):
-        logger.info(f"Start to handle actions: {message}")
+        logger.info("Start to handle actions: %s", message)
         await self.insert_audit_rule_data(message)
 
     async def _set_log_tracking_id(self, data: dict):
         activation_instance_id = data.get("activation_id")
         if activation_instance_id:
-            activation = await self.get_activation(activation_instance_id)
-            assign_log_tracking_id(activation.log_tracking_id)
-
-    @database_sync_to_async
-    def handle_heartbeat(self, message: HeartbeatMessage) -> None:
-        logger.info(f"Start to handle heartbeat: {message}")
-
-        instance = models.RulebookProcess.objects.filter(
-            id=message.activation_id
-        ).first()
+            # handle_heartbeat warns about heartbeats of deleted processes
+            activation = await self.get_cached_activation(
+                activation_instance_id,
+                missing_ok=data.get("type") == MessageType.SESSION_STATS.value,
+            )
+            if activation:
+                assign_log_tracking_id(activation.log_tracking_id)
 
-        if instance:
-            instance.updated_at = message.reported_at or timezone.now()
-            instance.save(update_fields=["updated_at"])
+    async def get_cached_activation(
+        self, rulebook_process_id: str | int, missing_ok: bool = False
+    ) -> tp.Optional[models.Activation]:
+        """Return the activation of a rulebook process.
 
-            activation = instance.get_parent()
-            activation.ruleset_stats[
-                message.stats["ruleSetName"]
-            ] = message.stats
-            activation.save(update_fields=["ruleset_stats"])
-        else:
+        The activation is loaded once per connection and again when the
+        rulebook process sends its worker message. With missing_ok,
+        None is returned when the rulebook process does not exist.
+        """
+        key = str(rulebook_process_id)
+        if key not in self._activations:
+            if missing_ok:
+                activation = await self.find_activation(rulebook_process_id)
+                if activation is None:
+                    return None
+            else:
+                activation = await self.get_activation(rulebook_process_id)
+            self._activations[key] = activation
+        return self._activations[key]
+
+    async def handle_heartbeat(self, message: HeartbeatMessage) -> None:
+        logger.info("Start to handle heartbeat: %s", message)
+
+        activation = await self.get_cached_activation(
+            message.activation_id, missing_ok=True
+        )
+        if activation is None:
+            # The heartbeat arrived after the process was deleted
             logger.warning(
-                f"Activation instance {message.activation_id} is not present."
+                "Activation instance %s is not present.",
+                message.activation_id,
             )
+            return
+        await database_sync_to_async(ruleset_stats_aggregator.record)(
+            rulebook_process_id=int(message.activation_id),
+            activation_id=activation.id,
+            stats=message.stats,
+            reported_at=message.reported_at or timezone.now(),
+        )
 
     @database_sync_to_async
-    def insert_event_related_data(self, message: AnsibleEventMessage) -> None:
-        event_data = message.event or {}
-        if event_data.get("stdout"):
-            job_instance = models.JobInstance.objects.get(
-                uuid=event_data.get("job_id")
-            )
-
-            # TODO: broadcasting
-            logger.info(f"Job instance {job_instance.id} is broadcasting.")
+    def insert_event_related_data(
+        self, messages: list[AnsibleEventMessage]
+    ) -> None:
+        events = [message.event or {} for message in messages]
+        job_uuids = {
+            str(event_data.get("job_id"))
+            for event_data in events
+            if event_data.get("stdout")
+        }
+        if job_uuids:
+            existing = {
+                str(job_uuid)
+                for job_uuid in models.JobInstance.objects.filter(
+                    uuid__in=job_uuids
+                ).values_list("uuid", flat=True)
+            }
+            for job_uuid in job_uuids - existing:
+                logger.error("Job instance %s not found", job_uuid)
+            events = [
+                event_data
+                for event_data in events
+                if not event_data.get("stdout")
+                or str(event_data.get("job_id")) in existing
+            ]
 
+        rows = []
+        for event_data in events:
+            # A malformed event must not drop the rest of the batch
+            try:
+                rows.append(self._build_event_rows(event_data))
+            except Exception as err:
+                logger.error(
+                    "Failed to parse ansible event %s: %s",
+                    event_data.get("uuid"),
+                    err,
+                )
+        try:
+            with transaction.atomic():
+                self._insert_event_rows(rows)
+        except DatabaseError as err:
+            # Store what we can, one event at a time
+            logger.warning("Bulk insert of ansible events failed: %s", err)
+            for row in rows:
+                try:
+                    with transaction.atomic():
+                        self._insert_event_rows([row])
+                except DatabaseError as err:
+                    logger.error("Failed to store ansible event: %s", err)
+
+    def _build_event_rows(
+        self, event_data: dict
+    ) -> tuple[models.JobInstanceEvent, Optional[models.JobInstanceHost]]:
         created = event_data.get("created")
         if created:
             created = datetime.strptime(created, "%Y-%m-%dT%H:%M:%S.%f")
 
-        job_instance_event = models.JobInstanceEvent.objects.create(
+        job_instance_event = models.JobInstanceEvent(
             job_uuid=event_data.get("job_id"),
             counter=event_data.get("counter"),
             stdout=event_data.get("stdout"),
             type=event_data.get("event"),
             created_at=created,
         )
-        logger.info(f"Job instance event {job_instance_event.id} is created.")
 
+        job_instance_host = None
         event = event_data.get("event")
         if event and event in [item.value for item in host_status_map]:
             data = event_data.get("event_data", {})
@@ -449,16 +577,32 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
             if event == "runner_on_ok" and data.get("res", {}).get("changed"):
                 status = "changed"
 
-            job_instance_host = models.JobInstanceHost.objects.create(
+            job_instance_host = models.JobInstanceHost(
                 job_uuid=event_data.get("job_id"),
                 playbook=playbook,
                 play=play,
                 task=task,
                 status=status,
             )
-            logger.info(
-                f"Job instance host {job_instance_host.id} is created."
-            )
+        return job_instance_event, job_instance_host
+
+    def _insert_event_rows(
+        self,
+        rows: list[
+            tuple[models.JobInstanceEvent, Optional[models.JobInstanceHost]]
+        ],
+    ) -> None:
+        job_instance_events = models.JobInstanceEvent.objects.bulk_create(
+            [event for event, _ in rows]
+        )
+        job_instance_hosts = models.JobInstanceHost.objects.bulk_create(
+            [host for _, host in rows if host is not None]
+        )
+        logger.info(
+            "%d job instance events and %d job instance hosts are created.",
+            len(job_instance_events),
+            len(job_instance_hosts),
+        )
 
     @database_sync_to_async
     def insert_audit_rule_data(self, message: ActionMessage) -> None:
@@ -469,16 +613,17 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
                 id=message.activation_id
             )
         except ObjectDoesNotExist:
-            logger.error(f"RulebookProcess {message.activation_id} not found")
+            logger.error("RulebookProcess %s not found", message.activation_id)
             raise
 
-        audit_rule = self._get_or_create_audit_rule(
-            message, activation_instance, job_instance_id
-        )
-        audit_action = self._get_or_create_audit_action(
-            message, activation_instance, audit_rule
-        )
-        self._process_matching_events(message, audit_action)
+        with transaction.atomic():
+            audit_rule = self._get_or_create_audit_rule(
+                message, activation_instance, job_instance_id
+            )
+            audit_action = self._get_or_create_audit_action(
+                message, activation_instance, audit_rule
+            )
+            self._process_matching_events(message, audit_action)
 
     def _resolve_job_instance_id(self, message):
         if not message.job_id:
@@ -497,9 +642,6 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
         ).first()
 
         if audit_rule is None:
-            activation_org = models.Organization.objects.filter(
-                id=activation_instance.organization.id
-            ).first()
             audit_rule = models.AuditRule.objects.create(
                 activation_instance_id=message.activation_id,
                 name=message.rule,
@@ -509,9 +651,9 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
                 fired_at=message.rule_run_at,
                 job_instance_id=job_instance_id,
                 status=message.status,
-                organization=activation_org,
+                organization_id=activation_instance.organization_id,
             )
-            logger.info(f"Audit rule [{audit_rule.name}] is created.")
+            logger.info("Audit rule [%s] is created.", audit_rule.name)
         # if rule has multiple actions and one of its action's
         # status is 'failed', keep rule's status as 'failed'
         elif (
@@ -545,42 +687,73 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
             audit_rule_id=audit_rule.id,
             status_message=message.message,
         )
-        logger.info(f"Audit action [{audit_action.name}] is created.")
+        logger.info("Audit action [%s] is created.", audit_action.name)
         return audit_action
 
     def _resolve_aap_inputs(self, activation_instance):
-        aap_credential_type = models.CredentialType.objects.filter(
-            name=DefaultCredentialType.AAP
+        """Return the AAP host of the rulebook process.
+
+        Only the host is needed to build the job URLs, it is resolved
+        once per rulebook process and kept without any of the secrets.
+        """
+        if activation_instance.id not in self._aap_hosts:
+            self._aap_hosts[activation_instance.id] = self._get_aap_host(
+                activation_instance
+            )
+        return self._aap_hosts[activation_instance.id]
+
+    def _get_aap_host(self, activation_instance):
+        aap_credential_type_id = get_credential_type_id(
+            DefaultCredentialType.AAP
         )
-        if not aap_credential_type:
+        if aap_credential_type_id is None:
             return {}
-        credentials = activation_instance.get_parent().eda_credentials.filter(
-            credential_type_id=aap_credential_type[0].id
+        credential = (
+            activation_instance.get_parent()
+            .eda_credentials.filter(credential_type_id=aap_credential_type_id)
+            .first()
         )
-        if credentials:
-            return get_resolved_secrets(credentials[0])
-        return {}
+        if credential is None:
+            return {}
+        return {"host": get_resolved_secrets(credential)["host"]}
 
     def _process_matching_events(self, message, audit_action):
+        audit_events = {}
         for event_meta in message.matching_events.values():
             meta = event_meta.pop("meta")
             if not meta:
                 continue
-            audit_event = models.AuditEvent.objects.filter(
-                id=meta.get("uuid")
-            ).first()
-            if audit_event is None:
-                audit_event = models.AuditEvent.objects.create(
-                    id=meta.get("uuid"),
-                    source_name=meta.get("source", {}).get("name"),
-                    source_type=meta.get("source", {}).get("type"),
-                    payload=event_meta,
-                    received_at=meta.get("received_at"),
-                    rule_fired_at=message.rule_run_at,
+            audit_events[meta.get("uuid")] = models.AuditEvent(
+                id=meta.get("uuid"),
+                source_name=meta.get("source", {}).get("name"),
+                source_type=meta.get("source", {}).get("type"),
+                payload=event_meta,
+                received_at=meta.get("received_at"),
+                rule_fired_at=message.rule_run_at,
+            )
+        if not audit_events:
+            return
+
+        # Events matched by earlier actions already exist, keep them as is
+        models.AuditEvent.objects.bulk_create(
+            audit_events.values(), ignore_conflicts=True
+        )
+        through_model = models.AuditEvent.audit_actions.through
+        through_model.objects.bulk_create(
+            [
+                through_model(
+                    auditevent_id=audit_event_id,
+                    auditaction_id=audit_action.id,
                 )
-                logger.info(f"Audit event [{audit_event.id}] is created.")
-            audit_event.audit_actions.add(audit_action)
-            audit_event.save()
+                for audit_event_id in audit_events
+            ],
+            ignore_conflicts=True,
+        )
+        logger.info(
+            "%d audit events are linked to audit action [%s].",
+            len(audit_events),
+            audit_action.name,
+        )
 
     @database_sync_to_async
     def insert_job_related_data(
@@ -594,14 +767,16 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
             hosts=message.hosts,
             rule=message.rule,
         )
-        logger.info(f"Job instance {job_instance.id} is created.")
+        logger.info("Job instance %s is created.", job_instance.id)
 
         activation_instance_id = message.ansible_rulebook_id
         instance = models.ActivationInstanceJobInstance.objects.create(
             job_instance_id=job_instance.id,
             activation_instance_id=activation_instance_id,
         )
-        logger.info(f"ActivationInstanceJobInstance {instance.id} is created.")
+        logger.info(
+            "ActivationInstanceJobInstance %s is created.", instance.id
+        )
 
         return job_instance
 
@@ -613,10 +788,66 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
             )
             return rulebook_process_instance.get_parent()
         except ObjectDoesNotExist:
-            logger.error(f"RulebookProcess {rulebook_process_id} not found")
+            logger.error("RulebookProcess %s not found", rulebook_process_id)
             raise
 
     @database_sync_to_async
+    def find_activation(
+        self, rulebook_process_id: str | int
+    ) -> tp.Optional[models.Activation]:
+        rulebook_process_instance = models.RulebookProcess.objects.filter(
+            id=rulebook_process_id
+        ).first()
+        if rulebook_process_instance is None:
+            return None
+        return rulebook_process_instance.get_parent()
+
+    @database_sync_to_async
+    def get_credential_messages(
+        self, activation: models.Activation
+    ) -> list[
+        tp.Union[ControllerInfo, VaultCollection, FileContentMessage, EnvVars]
+    ]:
+        """Build the credential messages of the worker handshake.
+
+        The activation credentials are loaded once and the secrets of
+        each credential are resolved once for all of the messages.
+        """
+        messages = []
+        credentials = list(
+            activation.eda_credentials.select_related("credential_type")
+        )
+        resolve = _ResolvedSecrets()
+
+        controller_info = self.get_controller_info(
+            activation, credentials, resolve
+        )
+        if controller_info:
+            messages.append(controller_info)
+
+        eda_vault_data = self.get_eda_system_vault_passwords(
+            activation, credentials, resolve
+        )
+        if eda_vault_data:
+            messages.append(VaultCollection(data=eda_vault_data))
+
+        rule_engine_credential = self.get_rule_engine_credential(activation)
+        if rule_engine_credential is not None:
+            credentials.append(rule_engine_credential)
+
+        messages.extend(
+            self.get_file_contents_from_credentials(credentials, resolve)
+        )
+
+        env_var = self.get_env_vars_from_credentials(
+            activation, credentials, resolve
+        )
+        if env_var:
+            messages.append(
+                EnvVars(data=base64.b64encode(env_var.encode()).decode())
+            )
+        return messages
+
     def get_awx_token(self, activation: models.Activation) -> tp.Optional[str]:
         """Get AWX token from the worker message."""
         if not hasattr(activation, "awx_token"):
@@ -625,17 +856,20 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
         awx_token = activation.awx_token
         return awx_token.token.get_secret_value() if awx_token else None
 
-    async def get_controller_info(
-        self, activation: models.Activation
+    def get_controller_info(
+        self,
+        activation: models.Activation,
+        credentials: list[models.EdaCredential],
+        resolve: "_ResolvedSecrets",
     ) -> tp.Optional[ControllerInfo]:
         """Get Controller Info."""
-        controller_info = await self.get_controller_info_from_aap_cred(
-            activation
+        controller_info = self._get_controller_info_from_aap_cred(
+            credentials, resolve
         )
         if controller_info:
             return controller_info
 
-        awx_token = await self.get_awx_token(activation)
+        awx_token = self.get_awx_token(activation)
         if awx_token:
             return ControllerInfo(
                 url=settings.EDA_CONTROLLER_URL,
@@ -649,46 +883,63 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
         self, activation: models.Activation
     ) -> tp.Optional[ControllerInfo]:
         """Get AAP Credential from Activation."""
-        try:
-            aap_credential_type = models.CredentialType.objects.get(
-                name=DefaultCredentialType.AAP
-            )
-            for eda_credential in activation.eda_credentials.all():
-                if eda_credential.credential_type.id == aap_credential_type.id:
-                    inputs = get_resolved_secrets(eda_credential)
-
-                    return ControllerInfo(
-                        url=inputs["host"],
-                        token=inputs.get("oauth_token", ""),
-                        ssl_verify="yes" if inputs.get("verify_ssl") else "no",
-                        username=inputs.get("username", ""),
-                        password=inputs.get("password", ""),
-                    )
-        except ObjectDoesNotExist:
+        return self._get_controller_info_from_aap_cred(
+            list(activation.eda_credentials.all()), _ResolvedSecrets()
+        )
+
+    def _get_controller_info_from_aap_cred(
+        self,
+        credentials: list[models.EdaCredential],
+        resolve: "_ResolvedSecrets",
+    ) -> tp.Optional[ControllerInfo]:
+        aap_credential_type_id = get_credential_type_id(
+            DefaultCredentialType.AAP
+        )
+        if aap_credential_type_id is None:
             logger.warning('"AAP" credential type not found')
             return None
+        for eda_credential in credentials:
+            if eda_credential.credential_type_id == aap_credential_type_id:
+                inputs = resolve(eda_credential)
+
+                return ControllerInfo(
+                    url=inputs["host"],
+                    token=inputs.get("oauth_token", ""),
+                    ssl_verify="yes" if inputs.get("verify_ssl") else "no",
+                    username=inputs.get("username", ""),
+                    password=inputs.get("password", ""),
+                )
+        return None
 
-    @database_sync_to_async
     def get_eda_system_vault_passwords(
-        self, activation: models.Activation
+        self,
+        activation: models.Activation,
+        credentials: list[models.EdaCredential],
+        resolve: "_ResolvedSecrets",
     ) -> tp.List[VaultPassword]:
         """Get vault info from activation."""
         vault_passwords = []
 
-        if activation.eda_system_vault_credential:
-            vault = models.EdaCredential.objects.filter(
-                id=activation.eda_system_vault_credential.id
-            )
-        else:
-            vault = models.EdaCredential.objects.none()
-
-        vault_credential_type = models.CredentialType.objects.get(
-            name=DefaultCredentialType.VAULT
+        vault_credential_type_id = get_credential_type_id(
+            DefaultCredentialType.VAULT
         )
-        for credential in activation.eda_credentials.filter(
-            credential_type_id=vault_credential_type.id
-        ).union(vault):
-            inputs = get_resolved_secrets(credential)
+        if vault_credential_type_id is None:
+            raise models.CredentialType.DoesNotExist(
+                f'"{DefaultCredentialType.VAULT}" credential type not found'
+            )
+        vault_credentials = [
+            credential
+            for credential in credentials
+            if credential.credential_type_id == vault_credential_type_id
+        ]
+        system_vault_credential = activation.eda_system_vault_credential
+        if system_vault_credential and system_vault_credential.id not in {
+            credential.id for credential in vault_credentials
+        }:
+            vault_credentials.append(system_vault_credential)
+
+        for credential in vault_credentials:
+            inputs = resolve(credential)
 
             vault_passwords.append(
                 VaultPassword(
@@ -699,7 +950,6 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
 
         return vault_passwords
 
-    @database_sync_to_async
     def get_rule_engine_credential(
         self, activation: models.Activation
     ) -> Optional[models.EdaCredential]:
@@ -749,18 +999,15 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
         logger.info("Updated Job URL %s", result)
         return result
 
-    @database_sync_to_async
     def get_file_contents_from_credentials(
         self,
-        activation: models.Activation,
-        additional_credentials: list[models.EdaCredential],
-    ) -> tp.Optional[list[FileContentMessage]]:
+        credentials: list[models.EdaCredential],
+        resolve: "_ResolvedSecrets",
+    ) -> list[FileContentMessage]:
         file_template_names = []
         file_messages = []
-        for eda_credential in (
-            list(activation.eda_credentials.all()) + additional_credentials
-        ):
-            inputs = get_resolved_secrets(eda_credential)
+        for eda_credential in credentials:
+            inputs = resolve(eda_credential)
             injectors = eda_credential.credential_type.injectors
             binary_fields = []
             for field in eda_credential.credential_type.inputs.get(
@@ -779,35 +1026,33 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
                 )
                 if not message:
                     logger.warning(
-                        f"{template} is skipped because its content is empty"
+                        "%s is skipped because its content is empty", template
                     )
                     continue
                 file_template_names.append(template)
                 file_messages.append(message)
         return file_messages
 
-    @database_sync_to_async
     def get_env_vars_from_credentials(
         self,
         activation: models.Activation,
-        additional_credentials: list[models.EdaCredential],
+        credentials: list[models.EdaCredential],
+        resolve: "_ResolvedSecrets",
     ) -> tp.Optional[str]:
         try:
             vault_password, vault_id = self.get_vault_password_and_id(
-                activation
+                activation, resolve
             )
             env_vars = {}
 
-            for eda_credential in (
-                list(activation.eda_credentials.all()) + additional_credentials
-            ):
+            for eda_credential in credentials:
                 injectors = eda_credential.credential_type.injectors
                 if "env" not in injectors:
                     continue
 
                 schema_inputs = eda_credential.credential_type.inputs
                 secret_fields = get_secret_fields(schema_inputs)
-                user_inputs = get_resolved_secrets(eda_credential)
+                user_inputs = resolve(eda_credential)
 
                 add_default_values_to_user_inputs(schema_inputs, user_inputs)
 
@@ -860,11 +1105,10 @@ class AnsibleRulebookConsumer(AsyncWebsocketConsumer):
     @staticmethod
     def get_vault_password_and_id(
         activation: models.Activation,
+        resolve: "_ResolvedSecrets",
     ) -> [tp.Optional[str], tp.Optional[str]]:
         if activation.eda_system_vault_credential:
-            vault_inputs = get_resolved_secrets(
-                activation.eda_system_vault_credential
-            )
+            vault_inputs = resolve(activation.eda_system_vault_credential)
             return vault_inputs["vault_password"], vault_inputs["vault_id"]
         return None, None
 
@@ -25,6 +25,7 @@ from aap_eda.core.management.commands.create_initial_data import (
     CREDENTIAL_TYPES,
     populate_credential_types,
 )
+from aap_eda.tasks.orchestrator import queue_health_cache
 
 
 #################################################################
@@ -42,6 +43,14 @@ def pytest_runtest_setup(item):
         )
 
 
+@pytest.fixture(autouse=True)
+def clear_queue_health_cache():
+    """Queue health checks are mocked per test, never share results."""
+    queue_health_cache.clear()
+    yield
+    queue_health_cache.clear()
+
+
 #################################################################
 # Log capture factory
 #################################################################
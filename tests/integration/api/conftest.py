@@ -3,6 +3,12 @@
 import pytest
 from django.test.utils import override_settings
 
+from aap_eda.api.event_stream_authentication import (
+    introspection_results,
+    jwks_clients,
+)
+from aap_eda.services.event_stream_cache import event_stream_cache
+
 
 @pytest.fixture(autouse=True)
 def disable_trusted_proxy_validation_for_tests(request):
@@ -15,3 +21,22 @@ def disable_trusted_proxy_validation_for_tests(request):
     # Disable validation for all other tests
     with override_settings(EVENT_STREAM_REQUIRE_TRUSTED_PROXY=False):
         yield
+
+
+@pytest.fixture(autouse=True)
+def clear_event_stream_cache():
+    """Start every test with empty event stream caches."""
+    event_stream_cache.clear()
+    jwks_clients.clear()
+    introspection_results.clear()
+    yield
+    event_stream_cache.clear()
+    jwks_clients.clear()
+    introspection_results.clear()
+
+
+@pytest.fixture(autouse=True)
+def write_event_stream_stats_immediately():
+    """Write event stream counters on every event."""
+    with override_settings(EVENT_STREAM_STATS_FLUSH_INTERVAL_SECONDS=0):
+        yield
@@ -817,6 +817,177 @@ def test_disable_activation(
     assert response.status_code == status.HTTP_204_NO_CONTENT
 
 
+@pytest.mark.django_db
+@mock.patch.object(settings, "RULEBOOK_WORKER_QUEUES", [])
+@patch(
+    "aap_eda.api.views.activation.check_dispatcherd_workers_health",
+    return_value=True,
+)
+def test_bulk_enable_activations(
+    mock_health_check,
+    default_activation: models.Activation,
+    admin_client: APIClient,
+    preseed_credential_types,
+):
+    default_activation.is_enabled = False
+    default_activation.status = enums.ActivationStatus.STOPPED
+    default_activation.save(update_fields=["is_enabled", "status"])
+
+    response = admin_client.post(
+        f"{api_url_v1}/activations/bulk_enable/",
+        data={"ids": [default_activation.id, 42000]},
+    )
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    data = response.json()
+    assert data["requested"] == [default_activation.id]
+    assert data["pending"] == 1
+    assert data["skipped"] == [{"id": 42000, "reason": "Activation not found"}]
+    default_activation.refresh_from_db()
+    assert default_activation.is_enabled
+    assert default_activation.status == enums.ActivationStatus.PENDING
+    assert default_activation.status_message == (
+        "Wait for a worker to be available to start activation"
+    )
+    assert models.ActivationRequestQueue.objects.filter(
+        process_parent_id=default_activation.id,
+        request=enums.ActivationRequest.START,
+        request_id=data["job_id"],
+    ).exists()
+
+    response = admin_client.get(
+        f"{api_url_v1}/activations/bulk_jobs/{data['job_id']}/"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"job_id": data["job_id"], "pending": 1}
+
+    response = admin_client.post(
+        f"{api_url_v1}/activations/bulk_enable/",
+        data={"ids": [default_activation.id]},
+    )
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.json()["requested"] == []
+    assert response.json()["skipped"] == [
+        {
+            "id": default_activation.id,
+            "reason": "Activation is already enabled",
+        }
+    ]
+
+
+@pytest.mark.django_db
+@patch(
+    "aap_eda.api.views.activation.check_dispatcherd_workers_health",
+    return_value=True,
+)
+def test_bulk_disable_activations_by_filter(
+    mock_health_check,
+    default_activation: models.Activation,
+    admin_client: APIClient,
+    preseed_credential_types,
+):
+    default_activation.status = enums.ActivationStatus.RUNNING
+    default_activation.save(update_fields=["status"])
+
+    response = admin_client.post(
+        f"{api_url_v1}/activations/bulk_disable/"
+        f"?name={default_activation.name}",
+    )
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.json()["requested"] == [default_activation.id]
+    mock_health_check.assert_called_once_with(queue_name=None)
+    default_activation.refresh_from_db()
+    assert not default_activation.is_enabled
+    assert default_activation.status == enums.ActivationStatus.STOPPING
+    assert models.ActivationRequestQueue.objects.filter(
+        process_parent_id=default_activation.id,
+        request=enums.ActivationRequest.STOP,
+    ).exists()
+
+
+@pytest.mark.django_db
+@patch(
+    "aap_eda.api.views.activation.check_dispatcherd_workers_health",
+    return_value=False,
+)
+def test_bulk_restart_activations_workers_unavailable(
+    mock_health_check,
+    default_activation: models.Activation,
+    admin_client: APIClient,
+    preseed_credential_types,
+):
+    response = admin_client.post(
+        f"{api_url_v1}/activations/bulk_restart/",
+        data={"ids": [default_activation.id]},
+    )
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.json()["requested"] == []
+    assert response.json()["skipped"] == [
+        {"id": default_activation.id, "reason": "Workers are unavailable"}
+    ]
+    assert not models.ActivationRequestQueue.objects.exists()
+
+
+@pytest.mark.django_db
+def test_activation_start_queue(
+    default_activation: models.Activation,
+    admin_client: APIClient,
+    preseed_credential_types,
+):
+    models.ActivationRequestQueue.objects.create(
+        process_parent_id=default_activation.id,
+        request=enums.ActivationRequest.AUTO_START,
+    )
+
+    response = admin_client.get(f"{api_url_v1}/activations/start_queue/")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["user_starts"] == 0
+    assert data["auto_starts"] == 1
+    assert data["max_wait_seconds"] >= 0
+
+
+@pytest.mark.django_db
+def test_bulk_action_requires_selection(
+    admin_client: APIClient,
+    preseed_credential_types,
+):
+    response = admin_client.post(f"{api_url_v1}/activations/bulk_disable/")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = admin_client.post(
+        f"{api_url_v1}/activations/bulk_disable/", data={"ids": []}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query",
+    ["nmae=foo", "page=2", "name=", "force=true", "project_id=abc"],
+)
+def test_bulk_action_requires_activation_filter(
+    query,
+    default_activation: models.Activation,
+    admin_client: APIClient,
+    preseed_credential_types,
+):
+    default_activation.status = enums.ActivationStatus.RUNNING
+    default_activation.save(update_fields=["status"])
+
+    response = admin_client.post(
+        f"{api_url_v1}/activations/bulk_disable/?{query}"
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    default_activation.refresh_from_db()
+    assert default_activation.is_enabled
+    assert not models.ActivationRequestQueue.objects.exists()
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize(
     ("force_disable", "expected_response"),
@@ -0,0 +1,186 @@
+#  Copyright 2024 Red Hat, Inc.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import json
+import secrets
+import uuid
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from aap_eda.api.views import AsyncExternalEventStreamView
+from aap_eda.core import enums, models
+from aap_eda.core.exceptions import PGNotifyError
+from tests.integration.api.test_event_stream import (
+    create_event_stream,
+    create_event_stream_credential,
+    event_stream_post_url,
+    get_default_test_org,
+)
+
+SIGNATURE_HEADER_NAME = "My-Secret-Header"
+
+
+def _create_token_event_stream(
+    admin_client: APIClient, token: str, test_mode: bool = False
+) -> models.EventStream:
+    inputs = {
+        "auth_type": "token",
+        "token": token,
+        "http_header_key": SIGNATURE_HEADER_NAME,
+    }
+    obj = create_event_stream_credential(
+        admin_client, enums.EventStreamCredentialType.TOKEN.value, inputs
+    )
+    data_in = {
+        "name": "test-es-async",
+        "eda_credential_id": obj["id"],
+        "event_stream_type": obj["credential_type"]["kind"],
+        "organization_id": get_default_test_org().id,
+        "test_mode": test_mode,
+    }
+    return create_event_stream(admin_client, data_in)
+
+
+def _post(event_stream_uuid, headers: dict, body: bytes):
+    request = RequestFactory().post(
+        event_stream_post_url(event_stream_uuid),
+        data=body,
+        content_type="application/json",
+        headers=headers,
+    )
+    view = AsyncExternalEventStreamView.as_view()
+    return async_to_sync(view)(request, pk=str(event_stream_uuid))
+
+
+@pytest.mark.django_db
+def test_async_post_event_stream(
+    admin_client: APIClient, preseed_credential_types
+):
+    token = secrets.token_hex(32)
+    event_stream = _create_token_event_stream(admin_client, token)
+
+    with mock.patch(
+        "aap_eda.api.views.external_event_stream.AsyncPGNotify"
+    ) as mock_notify:
+        mock_notify.return_value = mock.AsyncMock()
+        response = _post(
+            event_stream.uuid,
+            {SIGNATURE_HEADER_NAME: token},
+            json.dumps({"a": 1}).encode(),
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    args = mock_notify.call_args[0]
+    assert args[1] == event_stream.channel_name
+    assert args[2]["payload"] == {"a": 1}
+    mock_notify.return_value.assert_awaited_once()
+
+    event_stream.refresh_from_db()
+    assert event_stream.events_received == 1
+    assert event_stream.last_event_received_at is not None
+
+
+@pytest.mark.django_db
+def test_async_post_event_stream_test_mode(
+    admin_client: APIClient, preseed_credential_types
+):
+    token = secrets.token_hex(32)
+    event_stream = _create_token_event_stream(
+        admin_client, token, test_mode=True
+    )
+
+    with mock.patch(
+        "aap_eda.api.views.external_event_stream.AsyncPGNotify"
+    ) as mock_notify:
+        response = _post(
+            event_stream.uuid,
+            {SIGNATURE_HEADER_NAME: token},
+            json.dumps({"a": 1}).encode(),
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    mock_notify.assert_not_called()
+    event_stream.refresh_from_db()
+    assert event_stream.test_content == "a: 1\n"
+    assert event_stream.test_content_type == "application/json"
+
+
+@pytest.mark.django_db
+def test_async_post_event_stream_bad_token(
+    admin_client: APIClient, preseed_credential_types
+):
+    event_stream = _create_token_event_stream(
+        admin_client, secrets.token_hex(32)
+    )
+
+    response = _post(
+        event_stream.uuid,
+        {SIGNATURE_HEADER_NAME: "bogus"},
+        json.dumps({"a": 1}).encode(),
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert json.loads(response.content) == {
+        "detail": "Token mismatch, check your token"
+    }
+    event_stream.refresh_from_db()
+    assert event_stream.events_received == 1
+
+
+@pytest.mark.django_db
+def test_async_post_event_stream_missing_header(
+    admin_client: APIClient, preseed_credential_types
+):
+    event_stream = _create_token_event_stream(
+        admin_client, secrets.token_hex(32)
+    )
+
+    response = _post(event_stream.uuid, {}, json.dumps({"a": 1}).encode())
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert json.loads(response.content) == {
+        "detail": f"{SIGNATURE_HEADER_NAME} header is missing"
+    }
+
+
+@pytest.mark.django_db
+def test_async_post_event_stream_bad_uuid():
+    response = _post(uuid.uuid4(), {}, json.dumps({}).encode())
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert json.loads(response.content) == {"detail": "bad uuid specified"}
+
+
+@pytest.mark.django_db
+def test_async_post_event_stream_notify_error(
+    admin_client: APIClient, preseed_credential_types
+):
+    token = secrets.token_hex(32)
+    event_stream = _create_token_event_stream(admin_client, token)
+
+    with mock.patch(
+        "aap_eda.api.views.external_event_stream.AsyncPGNotify"
+    ) as mock_notify:
+        mock_notify.return_value = mock.AsyncMock(side_effect=PGNotifyError)
+        response = _post(
+            event_stream.uuid,
+            {SIGNATURE_HEADER_NAME: token},
+            json.dumps({"a": 1}).encode(),
+        )
+
+    assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
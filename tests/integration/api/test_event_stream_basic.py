@@ -161,7 +161,8 @@ def test_post_event_stream_with_basic_auth_bad_encoding(
 
     if exception:
         with mock.patch(
-            "aap_eda.api.views.external_event_stream.get_resolved_secrets"
+            "aap_eda.api.views.external_event_stream."
+            "ExternalEventStreamMixin._resolve_inputs"
         ) as mocked:
             mocked.side_effect = exception
             response = admin_client.post(
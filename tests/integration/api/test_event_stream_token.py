@@ -12,10 +12,13 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 import secrets
+from unittest import mock
 from urllib.parse import urlencode
 
 import pytest
 import yaml
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient
 
@@ -23,13 +26,16 @@ from aap_eda.api.views.external_event_stream import (
     REDACTED_STRING,
     UNSAFE_HEADER_KEYS,
 )
-from aap_eda.core import enums
+from aap_eda.core import enums, models
+from aap_eda.core.utils.credentials import inputs_to_store
+from aap_eda.services.event_stream_cache import event_stream_cache
 from tests.integration.api.test_event_stream import (
     create_event_stream,
     create_event_stream_credential,
     event_stream_post_url,
     get_default_test_org,
 )
+from tests.integration.constants import api_url_v1
 
 
 @pytest.mark.parametrize(
@@ -264,3 +270,136 @@ def test_post_event_stream_with_test_mode_extra_headers(
     assert event_stream.test_content_type == "application/json"
     assert event_stream.events_received == 1
     assert event_stream.last_event_received_at is not None
+
+
+@pytest.mark.django_db
+@mock.patch.object(event_stream_cache, "ttl", 30)
+def test_post_event_stream_uses_cached_event_stream(
+    admin_client: APIClient,
+    preseed_credential_types,
+):
+    secret = secrets.token_hex(32)
+    signature_header_name = "My-Secret-Header"
+    inputs = {
+        "auth_type": "token",
+        "token": secret,
+        "http_header_key": signature_header_name,
+    }
+    obj = create_event_stream_credential(
+        admin_client, enums.EventStreamCredentialType.TOKEN.value, inputs
+    )
+    data_in = {
+        "name": "test-es-1",
+        "eda_credential_id": obj["id"],
+        "event_stream_type": obj["credential_type"]["kind"],
+        "organization_id": get_default_test_org().id,
+        "test_mode": True,
+    }
+    event_stream = create_event_stream(admin_client, data_in)
+    content_type = "application/x-www-form-urlencoded"
+    data_bytes = urlencode({"a": 1}).encode()
+
+    def post(token: str):
+        return admin_client.post(
+            event_stream_post_url(event_stream.uuid),
+            headers={signature_header_name: token},
+            data=data_bytes,
+            content_type=content_type,
+        )
+
+    assert post(secret).status_code == status.HTTP_200_OK
+
+    # Only the stats and test data updates hit the database
+    with CaptureQueriesContext(connection) as queries:
+        assert post(secret).status_code == status.HTTP_200_OK
+    assert not [q for q in queries if q["sql"].startswith("SELECT")]
+
+    # Changing the credential drops the cached inputs
+    new_secret = secrets.token_hex(32)
+    response = admin_client.patch(
+        f"{api_url_v1}/eda-credentials/{obj['id']}/",
+        data={"inputs": {**inputs, "token": new_secret}},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert post(secret).status_code == status.HTTP_403_FORBIDDEN
+    assert post(new_secret).status_code == status.HTTP_200_OK
+
+    # Turning test mode off is picked up on the next event
+    response = admin_client.patch(
+        f"{api_url_v1}/event-streams/{event_stream.id}/",
+        data={"test_mode": False},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    with mock.patch(
+        "aap_eda.api.views.external_event_stream.PGNotify"
+    ) as mock_notify:
+        assert post(new_secret).status_code == status.HTTP_200_OK
+    mock_notify.assert_called_once()
+
+
+@pytest.mark.django_db
+@mock.patch.object(event_stream_cache, "ttl", 30)
+def test_post_event_stream_does_not_cache_external_secrets(
+    admin_client: APIClient,
+    preseed_credential_types,
+):
+    secret = secrets.token_hex(32)
+    signature_header_name = "My-Secret-Header"
+    inputs = {
+        "auth_type": "token",
+        "token": "replaced-by-the-secret-manager",
+        "http_header_key": signature_header_name,
+    }
+    obj = create_event_stream_credential(
+        admin_client, enums.EventStreamCredentialType.TOKEN.value, inputs
+    )
+    source_credential = models.EdaCredential.objects.create(
+        name="hashi-credential",
+        inputs=inputs_to_store(
+            {
+                "url": "https://www.example.com",
+                "api_version": "v2",
+                "token": secrets.token_hex(32),
+            }
+        ),
+        credential_type=models.CredentialType.objects.get(
+            name=enums.DefaultCredentialType.HASHICORP_LOOKUP
+        ),
+        organization=get_default_test_org(),
+    )
+    models.CredentialInputSource.objects.create(
+        source_credential=source_credential,
+        target_credential_id=obj["id"],
+        input_field_name="token",
+        organization=get_default_test_org(),
+        metadata=inputs_to_store(
+            {"secret_path": "secret/foo", "secret_key": "bar"}
+        ),
+    )
+    data_in = {
+        "name": "test-es-1",
+        "eda_credential_id": obj["id"],
+        "event_stream_type": obj["credential_type"]["kind"],
+        "organization_id": get_default_test_org().id,
+        "test_mode": True,
+    }
+    event_stream = create_event_stream(admin_client, data_in)
+
+    with mock.patch(
+        "aap_eda.core.utils.external_sms.run_plugin", return_value=secret
+    ) as run_plugin:
+        for _ in range(2):
+            response = admin_client.post(
+                event_stream_post_url(event_stream.uuid),
+                headers={signature_header_name: secret},
+                data=urlencode({"a": 1}).encode(),
+                content_type="application/x-www-form-urlencoded",
+            )
+            assert response.status_code == status.HTTP_200_OK
+
+    # The secret is fetched for every event, only the stored inputs
+    # are cached
+    assert run_plugin.call_count == 2
+    descriptor = event_stream_cache.get(str(event_stream.uuid))
+    assert descriptor.has_input_sources
+    assert descriptor.inputs["token"] == "replaced-by-the-secret-manager"
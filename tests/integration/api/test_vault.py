@@ -49,3 +49,40 @@ def test_failed_decrypt():
 
     with pytest.raises(AnsibleVaultDecryptionFailed, match=RE_ERROR_MSG):
         decrypt("bad", vault_string)
+
+
+@pytest.mark.parametrize(
+    ("vault_id", "header"),
+    [
+        (label, f"$ANSIBLE_VAULT;1.2;AES256;{label}"),
+        ("default", "$ANSIBLE_VAULT;1.1;AES256"),
+    ],
+)
+def test_vault_string_envelope(vault_id, header):
+    vault_string = encrypt_string(PASSWORD, "abc", vault_id)
+    lines = vault_string.split("\n")
+
+    assert lines[0] == header
+    assert lines[-1] == ""
+    assert all(len(line) == 80 for line in lines[1:-2])
+    assert 0 < len(lines[-2]) <= 80
+    # salt, hmac and ciphertext hex encoded twice
+    salt, hmac, ciphertext = bytes.fromhex("".join(lines[1:])).split(b"\n")
+    assert len(bytes.fromhex(salt.decode())) == 32
+    assert len(bytes.fromhex(hmac.decode())) == 32
+    assert len(bytes.fromhex(ciphertext.decode())) % 16 == 0
+    assert encrypt_string(PASSWORD, "abc", vault_id) != vault_string
+    assert decrypt(PASSWORD, vault_string) == "abc"
+
+
+@pytest.mark.parametrize("vault_id", [label, "default"])
+def test_vault_string_decrypted_by_vault_lib(vault_id):
+    vault = pytest.importorskip("ansible.parsing.vault")
+    plaintext = "preserve   spaces"
+    vault_string = encrypt_string(PASSWORD, plaintext, vault_id)
+
+    vault_lib = vault.VaultLib(
+        [(vault_id, vault.VaultSecret(PASSWORD.encode()))]
+    )
+
+    assert vault_lib.decrypt(vault_string) == f"{plaintext}\n".encode()
@@ -12,6 +12,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from datetime import datetime, timezone
 from unittest import mock
 
 import pytest
@@ -37,6 +38,7 @@ from aap_eda.services.activation.engine.kubernetes import (
     INVALID_IMAGE_NAME,
     K8S_API_RETRIES,
     Engine,
+    PodCache,
     get_k8s_client,
 )
 
@@ -1337,3 +1339,99 @@ def test_process_pod_start_event_unrecognized(kubernetes_engine):
     )
     event = {"object": pod}
     assert engine._process_pod_start_event(event) is False
+
+
+def get_job_pod(job_name: str, resource_version: str = "1"):
+    pod = get_pod("Running")
+    pod.metadata.name = f"{job_name}-pod"
+    pod.metadata.labels = {"app": "eda", "job-name": job_name}
+    pod.metadata.resource_version = resource_version
+    return pod
+
+
+@pytest.mark.django_db
+def test_get_job_pod_reads_pod_cache(kubernetes_engine):
+    engine = kubernetes_engine
+    cached_pod = get_job_pod("test-job")
+    engine.pod_cache = mock.Mock()
+    engine.pod_cache.get.return_value = cached_pod
+
+    assert engine._get_job_pod("test-job") == cached_pod
+    engine.client.core_api.list_namespaced_pod.assert_not_called()
+
+    # pods missing from the cache are looked up on the API server
+    listed_pod = get_job_pod("other-job")
+    engine.pod_cache.get.return_value = None
+    engine.client.core_api.list_namespaced_pod.return_value = mock.Mock(
+        items=[listed_pod]
+    )
+    assert engine._get_job_pod("other-job") == listed_pod
+
+
+@pytest.mark.django_db
+def test_get_job_pod_skips_cached_pod_being_deleted(kubernetes_engine):
+    engine = kubernetes_engine
+    cached_pod = get_job_pod("test-job")
+    cached_pod.metadata.deletion_timestamp = datetime.now(tz=timezone.utc)
+    engine.pod_cache = mock.Mock()
+    engine.pod_cache.get.return_value = cached_pod
+    engine.client.core_api.list_namespaced_pod.return_value = mock.Mock(
+        items=[]
+    )
+
+    with pytest.raises(ContainerNotFoundError):
+        engine._get_job_pod("test-job")
+    engine.client.core_api.list_namespaced_pod.assert_called_once()
+
+
+@mock.patch("aap_eda.services.activation.engine.kubernetes.watch.Watch")
+def test_pod_cache_list_and_watch(mock_watch):
+    pod_cache = PodCache("aap-eda", watch_timeout=60)
+    pod_cache._client = mock.Mock()
+    pod_cache._client.core_api.list_namespaced_pod.return_value = mock.Mock(
+        items=[get_job_pod("job-1"), get_job_pod("job-2")],
+        metadata=mock.Mock(resource_version="10"),
+    )
+    modified_pod = get_job_pod("job-1", "11")
+    mock_watch.return_value.stream.return_value = [
+        {"type": "MODIFIED", "object": modified_pod},
+        {"type": "DELETED", "object": get_job_pod("job-2", "12")},
+    ]
+
+    assert pod_cache.get("job-1") is None
+    assert pod_cache._sync(None) == "12"
+
+    assert pod_cache.get("job-1") == modified_pod
+    assert pod_cache.get("job-2") is None
+    assert (
+        mock_watch.return_value.stream.call_args.kwargs["resource_version"]
+        == "10"
+    )
+
+
+@mock.patch("aap_eda.services.activation.engine.kubernetes.time.sleep")
+@mock.patch("aap_eda.services.activation.engine.kubernetes.watch.Watch")
+def test_pod_cache_resyncs_after_errors(mock_watch, sleep_mock):
+    pod_cache = PodCache("aap-eda", watch_timeout=60)
+    pod_cache._client = mock.Mock()
+    pod_cache._client.core_api.list_namespaced_pod.return_value = mock.Mock(
+        items=[get_job_pod("job-1")],
+        metadata=mock.Mock(resource_version="10"),
+    )
+
+    # an expired resourceVersion lists the pods again on the next sync
+    mock_watch.return_value.stream.side_effect = ApiException(status=410)
+    assert pod_cache._sync("5") is None
+    pod_cache._client.core_api.list_namespaced_pod.assert_not_called()
+    sleep_mock.assert_not_called()
+
+    mock_watch.return_value.stream.side_effect = None
+    mock_watch.return_value.stream.return_value = []
+    assert pod_cache._sync(None) == "10"
+    assert pod_cache.get("job-1") is not None
+
+    # other errors leave the cache out of sync until the next list
+    mock_watch.return_value.stream.side_effect = ApiException(status=500)
+    assert pod_cache._sync("10") is None
+    assert pod_cache.get("job-1") is None
+    sleep_mock.assert_called_once()
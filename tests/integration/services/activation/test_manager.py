@@ -15,6 +15,7 @@
 
 # TODO(alex) dedup code and fixtures across all the tests
 
+import contextlib
 from unittest.mock import MagicMock, create_autospec, patch
 
 import pytest
@@ -367,6 +368,60 @@ def test_start_first_run(
     assert not any("The activation was edited at" in log.log for log in logs)
 
 
+@pytest.mark.django_db
+def test_start_creates_instance_within_admission(
+    basic_activation: models.Activation,
+    container_engine_mock: MagicMock,
+    preseed_credential_types,
+):
+    """Test the instance is created while the start admission is held."""
+    activation_manager = ActivationManager(
+        db_instance=basic_activation,
+        container_engine=container_engine_mock,
+    )
+    instances = []
+
+    @contextlib.contextmanager
+    def admission():
+        yield
+        instances.extend(
+            models.RulebookProcess.objects.filter(activation=basic_activation)
+        )
+        assert not container_engine_mock.start.called
+
+    activation_manager.start(admission=admission())
+
+    assert len(instances) == 1
+    assert instances[0].status == enums.ActivationStatus.STARTING
+    assert container_engine_mock.start.called
+
+
+@pytest.mark.django_db
+def test_start_deferred_by_admission(
+    basic_activation: models.Activation,
+    container_engine_mock: MagicMock,
+    preseed_credential_types,
+):
+    """Test a start refused by its admission leaves no instance behind."""
+    activation_manager = ActivationManager(
+        db_instance=basic_activation,
+        container_engine=container_engine_mock,
+    )
+
+    @contextlib.contextmanager
+    def admission():
+        raise RuntimeError("Not now")
+        yield
+
+    with pytest.raises(RuntimeError):
+        activation_manager.start(admission=admission())
+
+    assert not models.RulebookProcess.objects.filter(
+        activation=basic_activation
+    ).exists()
+    assert not container_engine_mock.start.called
+
+
 @pytest.mark.django_db
 def test_monitor_to_running_status(
     starting_activation: models.Activation,
@@ -0,0 +1,108 @@
+#  Copyright 2025 Red Hat, Inc.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from unittest import mock
+
+import pytest
+from django.db import DatabaseError
+from django.test.utils import override_settings
+
+from aap_eda.core import models
+from aap_eda.services.activation.ruleset_stats import RulesetStatsAggregator
+
+
+def _stats(ruleset: str, events_processed: int) -> dict:
+    return {"ruleSetName": ruleset, "eventsProcessed": events_processed}
+
+
+@pytest.mark.django_db
+def test_heartbeats_are_coalesced(
+    default_activation_instance: models.RulebookProcess,
+):
+    activation = default_activation_instance.activation
+    activation.ruleset_stats = {"ruleset0": _stats("ruleset0", 7)}
+    activation.save(update_fields=["ruleset_stats"])
+
+    aggregator = RulesetStatsAggregator()
+    with override_settings(
+        RULEBOOK_HEARTBEAT_FLUSH_INTERVAL_SECONDS=5
+    ), mock.patch("aap_eda.core.utils.coalescing.threading.Timer") as timer:
+        for events_processed, reported_at in [
+            (10, "2024-08-21T18:39:10.000000+0000"),
+            (20, "2024-08-21T18:39:20.000000+0000"),
+        ]:
+            aggregator.record(
+                default_activation_instance.id,
+                activation.id,
+                _stats("ruleset1", events_processed),
+                reported_at,
+            )
+        aggregator.record(
+            default_activation_instance.id,
+            activation.id,
+            _stats("ruleset2", 5),
+            "2024-08-21T18:39:30.000000+0000",
+        )
+        timer.assert_called_once()
+
+        activation.refresh_from_db()
+        assert list(activation.ruleset_stats) == ["ruleset0"]
+
+        aggregator.flush()
+
+    activation.refresh_from_db()
+    assert activation.ruleset_stats == {
+        "ruleset0": _stats("ruleset0", 7),
+        "ruleset1": _stats("ruleset1", 20),
+        "ruleset2": _stats("ruleset2", 5),
+    }
+    default_activation_instance.refresh_from_db()
+    assert default_activation_instance.updated_at.isoformat() == (
+        "2024-08-21T18:39:30+00:00"
+    )
+
+
+@pytest.mark.django_db
+@override_settings(RULEBOOK_HEARTBEAT_FLUSH_INTERVAL_SECONDS=0)
+def test_heartbeats_kept_when_flush_fails(
+    default_activation_instance: models.RulebookProcess,
+):
+    activation = default_activation_instance.activation
+    aggregator = RulesetStatsAggregator()
+    with mock.patch.object(
+        aggregator, "_write", side_effect=DatabaseError("Boom")
+    ), pytest.raises(DatabaseError):
+        aggregator.record(
+            default_activation_instance.id,
+            activation.id,
+            _stats("ruleset1", 10),
+            "2024-08-21T18:39:10.000000+0000",
+        )
+
+    aggregator.record(
+        default_activation_instance.id,
+        activation.id,
+        _stats("ruleset2", 5),
+        "2024-08-21T18:39:20.000000+0000",
+    )
+
+    activation.refresh_from_db()
+    assert activation.ruleset_stats == {
+        "ruleset1": _stats("ruleset1", 10),
+        "ruleset2": _stats("ruleset2", 5),
+    }
+    default_activation_instance.refresh_from_db()
+    assert default_activation_instance.updated_at.isoformat() == (
+        "2024-08-21T18:39:20+00:00"
+    )
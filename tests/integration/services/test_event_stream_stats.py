@@ -0,0 +1,90 @@
+#  Copyright 2025 Red Hat, Inc.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from typing import List
+from unittest import mock
+
+import pytest
+from django.db import DatabaseError
+from django.test.utils import override_settings
+
+from aap_eda.core import models
+from aap_eda.services.event_stream_stats import EventStreamStats
+
+
+@pytest.mark.django_db
+def test_event_stream_stats_flushed_in_bulk(
+    default_event_streams: List[models.EventStream],
+):
+    first, second = default_event_streams
+    stats = EventStreamStats()
+    with override_settings(
+        EVENT_STREAM_STATS_FLUSH_INTERVAL_SECONDS=5
+    ), mock.patch("aap_eda.core.utils.coalescing.threading.Timer") as timer:
+        for _ in range(3):
+            stats.record(first.id)
+        stats.record(second.id)
+
+        timer.assert_called_once()
+        first.refresh_from_db()
+        assert first.events_received == 0
+
+        stats.flush()
+
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert first.events_received == 3
+    assert first.last_event_received_at is not None
+    assert second.events_received == 1
+
+    stats.flush()
+    first.refresh_from_db()
+    assert first.events_received == 3
+
+
+@pytest.mark.django_db
+def test_event_stream_stats_written_immediately(
+    default_event_stream: models.EventStream,
+):
+    stats = EventStreamStats()
+    with override_settings(EVENT_STREAM_STATS_FLUSH_INTERVAL_SECONDS=0):
+        stats.record(default_event_stream.id)
+        stats.record(default_event_stream.id)
+
+    default_event_stream.refresh_from_db()
+    assert default_event_stream.events_received == 2
+
+
+@pytest.mark.django_db
+def test_event_stream_stats_kept_when_flush_fails(
+    default_event_stream: models.EventStream,
+):
+    stats = EventStreamStats()
+    with override_settings(
+        EVENT_STREAM_STATS_FLUSH_INTERVAL_SECONDS=5
+    ), mock.patch("aap_eda.core.utils.coalescing.threading.Timer") as timer:
+        stats.record(default_event_stream.id)
+        stats.record(default_event_stream.id)
+        with mock.patch.object(
+            stats, "_write", side_effect=DatabaseError("Boom")
+        ), mock.patch("aap_eda.core.utils.coalescing.connection"):
+            stats._flush_on_timer()
+        # the failed batch is retried after another interval
+        assert timer.call_count == 2
+
+        stats.record(default_event_stream.id)
+        stats.flush()
+
+    default_event_stream.refresh_from_db()
+    assert default_event_stream.events_received == 3
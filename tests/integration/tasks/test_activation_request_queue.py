@@ -13,7 +13,9 @@
 #  limitations under the License.
 
 import pytest
+from django.db import connection
 from django.db.utils import IntegrityError
+from django.test.utils import CaptureQueriesContext
 
 import aap_eda.tasks.activation_request_queue as queue
 from aap_eda.core import models
@@ -162,3 +164,75 @@ def test_arbitrate(activations, requests):
     assert models.ActivationRequestQueue.objects.count() == len(
         requests["dequeued"]
     )
+
+
+@pytest.mark.django_db
+def test_push_queues_request_identical_to_running_one(activations):
+    queue.push(
+        ProcessParentType.ACTIVATION,
+        activations[0].id,
+        ActivationRequest.RESTART,
+    )
+    # A worker picks the restart, it stays queued until it is done
+    running = queue.peek_all(ProcessParentType.ACTIVATION, activations[0].id)
+
+    queue.push(
+        ProcessParentType.ACTIVATION,
+        activations[0].id,
+        ActivationRequest.RESTART,
+    )
+    queue.pop_until(
+        ProcessParentType.ACTIVATION, activations[0].id, running[-1].id
+    )
+
+    pending = queue.peek_all(ProcessParentType.ACTIVATION, activations[0].id)
+    assert [entry.request for entry in pending] == [ActivationRequest.RESTART]
+
+
+@pytest.mark.django_db
+def test_arbitrate_deletes_in_one_query(activations):
+    for request in [
+        ActivationRequest.START,
+        ActivationRequest.RESTART,
+        ActivationRequest.AUTO_START,
+        ActivationRequest.START,
+        ActivationRequest.STOP,
+    ]:
+        queue.push(ProcessParentType.ACTIVATION, activations[0].id, request)
+
+    with CaptureQueriesContext(connection) as queries:
+        dequeued = queue.peek_all(
+            ProcessParentType.ACTIVATION, activations[0].id
+        )
+
+    assert [entry.request for entry in dequeued] == [ActivationRequest.STOP]
+    assert models.ActivationRequestQueue.objects.count() == 1
+    deletes = [
+        query
+        for query in queries.captured_queries
+        if query["sql"].startswith("DELETE")
+    ]
+    assert len(deletes) == 1
+
+
+@pytest.mark.django_db
+def test_push_many(activations):
+    queue.push(
+        ProcessParentType.ACTIVATION,
+        activations[0].id,
+        ActivationRequest.START,
+    )
+
+    queued_ids = queue.push_many(
+        ProcessParentType.ACTIVATION,
+        [activations[1].id, activations[0].id, 42000, activations[1].id],
+        ActivationRequest.START,
+        "job-1",
+    )
+
+    assert queued_ids == [activations[1].id, activations[0].id]
+    queued = models.ActivationRequestQueue.objects.filter(request_id="job-1")
+    assert list(queued.values_list("process_parent_id", flat=True)) == [
+        activations[1].id,
+        activations[0].id,
+    ]
@@ -18,6 +18,8 @@ from unittest import mock
 
 import pytest
 from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
 
 import aap_eda.tasks.activation_request_queue as queue
 from aap_eda.core import models
@@ -33,6 +35,11 @@ def fake_task(number: int):
     pass
 
 
+def start_within_admission(is_restart, admission):
+    with admission:
+        pass
+
+
 @pytest.fixture
 def eda_caplog(caplog_factory):
     return caplog_factory(orchestrator.LOGGER, level=logging.DEBUG)
@@ -151,7 +158,9 @@ def test_manage_request(manager_mock, activation, verb):
 
     manager_mock.assert_called_once_with(activation)
     if verb == ActivationRequest.START:
-        manager_instance_mock.start.assert_called_once_with(is_restart=False)
+        manager_instance_mock.start.assert_called_once_with(
+            is_restart=False, admission=mock.ANY
+        )
     elif verb == ActivationRequest.RESTART:
         manager_instance_mock.restart.assert_called_once()
     elif verb == ActivationRequest.STOP:
@@ -159,12 +168,198 @@ def test_manage_request(manager_mock, activation, verb):
     elif verb == ActivationRequest.DELETE:
         manager_instance_mock.delete.assert_called_once()
     elif verb == ActivationRequest.AUTO_START:
-        manager_instance_mock.start.assert_called_once_with(is_restart=True)
+        manager_instance_mock.start.assert_called_once_with(
+            is_restart=True, admission=mock.ANY
+        )
     assert (
         len(queue.peek_all(ProcessParentType.ACTIVATION, activation.id)) == 0
     )
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "start_settings",
+    [
+        {"RULEBOOK_START_MAX_CONCURRENT": 1},
+        {"RULEBOOK_START_MAX_CONCURRENT_PER_QUEUE": 1},
+        {"RULEBOOK_START_RATE": 1.0, "RULEBOOK_START_BURST": 8},
+    ],
+)
+@mock.patch("aap_eda.tasks.orchestrator.ActivationManager")
+def test_manage_start_waits_for_admission(
+    manager_mock, activation, bulk_running_processes, start_settings
+):
+    queue.push(
+        ProcessParentType.ACTIVATION, activation.id, ActivationRequest.START
+    )
+    manager_mock.return_value.start.side_effect = start_within_admission
+
+    with override_settings(
+        RULEBOOK_QUEUE_NAME="activation",
+        RULEBOOK_START_MAX_CONCURRENT=0,
+        RULEBOOK_START_MAX_CONCURRENT_PER_QUEUE=0,
+        RULEBOOK_START_RATE=0,
+        **start_settings,
+    ):
+        orchestrator._manage(ProcessParentType.ACTIVATION, activation.id)
+
+    manager_mock.return_value.start.assert_called_once()
+    assert len(queue.peek_all(ProcessParentType.ACTIVATION, activation.id))
+
+
+@pytest.mark.django_db
+@override_settings(
+    RULEBOOK_START_MAX_CONCURRENT=1,
+    RULEBOOK_START_MAX_CONCURRENT_PER_QUEUE=0,
+    RULEBOOK_START_RATE=0,
+)
+@mock.patch("aap_eda.tasks.orchestrator.ActivationManager")
+def test_user_start_admitted_before_auto_start(manager_mock, activation):
+    other = models.Activation.objects.create(
+        name="test2",
+        user=activation.user,
+        organization=activation.organization,
+    )
+    queue.push(
+        ProcessParentType.ACTIVATION,
+        activation.id,
+        ActivationRequest.AUTO_START,
+    )
+    queue.push(ProcessParentType.ACTIVATION, other.id, ActivationRequest.START)
+    manager_mock.return_value.start.side_effect = start_within_admission
+
+    orchestrator._manage(ProcessParentType.ACTIVATION, activation.id)
+    assert len(queue.peek_all(ProcessParentType.ACTIVATION, activation.id))
+
+    orchestrator._manage(ProcessParentType.ACTIVATION, other.id)
+    assert not queue.peek_all(ProcessParentType.ACTIVATION, other.id)
+    manager_mock.assert_called_with(other)
+
+
+@pytest.mark.django_db
+@override_settings(
+    RULEBOOK_START_MAX_CONCURRENT=1,
+    RULEBOOK_START_MAX_CONCURRENT_PER_QUEUE=0,
+    RULEBOOK_START_RATE=0,
+)
+@mock.patch("aap_eda.tasks.orchestrator.ActivationManager")
+def test_start_not_held_by_starts_followed_by_other_requests(
+    manager_mock, activation
+):
+    other = models.Activation.objects.create(
+        name="test2",
+        user=activation.user,
+        organization=activation.organization,
+    )
+    # The start of the other activation is resolved with its stop
+    queue.push(ProcessParentType.ACTIVATION, other.id, ActivationRequest.START)
+    queue.push(ProcessParentType.ACTIVATION, other.id, ActivationRequest.STOP)
+    queue.push(
+        ProcessParentType.ACTIVATION,
+        activation.id,
+        ActivationRequest.AUTO_START,
+    )
+    manager_mock.return_value.start.side_effect = start_within_admission
+
+    orchestrator._manage(ProcessParentType.ACTIVATION, activation.id)
+
+    assert not queue.peek_all(ProcessParentType.ACTIVATION, activation.id)
+    manager_mock.assert_called_with(activation)
+
+
+@pytest.mark.django_db
+@override_settings(
+    RULEBOOK_START_MAX_CONCURRENT=0,
+    RULEBOOK_START_MAX_CONCURRENT_PER_QUEUE=3,
+    RULEBOOK_START_RATE=0,
+    RULEBOOK_WORKER_QUEUES=["activation", "other"],
+)
+def test_get_start_slots(bulk_running_processes):
+    assert orchestrator._get_start_slots() == 5
+
+    with override_settings(RULEBOOK_START_MAX_CONCURRENT=4):
+        assert orchestrator._get_start_slots() == 3
+
+    with override_settings(RULEBOOK_START_MAX_CONCURRENT_PER_QUEUE=0):
+        assert orchestrator._get_start_slots() is None
+
+
+@pytest.mark.django_db
+@override_settings(
+    RULEBOOK_START_MAX_CONCURRENT=2,
+    RULEBOOK_START_MAX_CONCURRENT_PER_QUEUE=0,
+    RULEBOOK_START_RATE=0,
+)
+@mock.patch("aap_eda.tasks.orchestrator.queue_dispatch")
+def test_monitor_dispatches_starts_that_can_be_admitted(
+    dispatch_mock, activation
+):
+    activations = [activation] + [
+        models.Activation.objects.create(
+            name=f"test-start{i}",
+            user=activation.user,
+            organization=activation.organization,
+        )
+        for i in range(3)
+    ]
+    for parent, request in zip(
+        activations,
+        [
+            ActivationRequest.AUTO_START,
+            ActivationRequest.START,
+            ActivationRequest.STOP,
+            ActivationRequest.START,
+        ],
+    ):
+        queue.push(ProcessParentType.ACTIVATION, parent.id, request)
+
+    orchestrator.monitor_rulebook_processes()
+
+    # Other requests are always dispatched, user starts before automatic
+    # ones and no more starts than can be admitted
+    assert dispatch_mock.call_args_list == [
+        mock.call(
+            ProcessParentType.ACTIVATION,
+            activations[2].id,
+            ActivationRequest.STOP,
+            "",
+        ),
+        mock.call(
+            ProcessParentType.ACTIVATION,
+            activations[1].id,
+            ActivationRequest.START,
+            "",
+        ),
+        mock.call(
+            ProcessParentType.ACTIVATION,
+            activations[3].id,
+            ActivationRequest.START,
+            "",
+        ),
+    ]
+
+
+@pytest.mark.django_db
+def test_get_start_queue_stats(activation, bulk_running_processes):
+    queue.push(
+        ProcessParentType.ACTIVATION,
+        activation.id,
+        ActivationRequest.AUTO_START,
+    )
+    queue.push(
+        ProcessParentType.ACTIVATION,
+        bulk_running_processes[1].activation_id,
+        ActivationRequest.START,
+    )
+
+    stats = orchestrator.get_start_queue_stats()
+
+    assert stats["user_starts"] == 1
+    assert stats["auto_starts"] == 1
+    assert stats["starting"] == 1
+    assert stats["max_wait_seconds"] >= 0
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize(
     "command, queued_request",
@@ -196,6 +391,126 @@ def test_activation_requests(
 
 @pytest.mark.django_db
 @mock.patch("aap_eda.tasks.orchestrator.tasking.unique_enqueue")
+def test_requests_dispatched_on_commit(
+    enqueue_mock, activation, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        orchestrator.restart_rulebook_process(
+            ProcessParentType.ACTIVATION, activation.id
+        )
+        enqueue_mock.assert_not_called()
+
+    enqueue_mock.assert_called_once_with(
+        settings.DISPATCHERD_DEFAULT_CHANNEL,
+        f"dispatch-{ProcessParentType.ACTIVATION}-{activation.id}",
+        orchestrator.dispatch_requests,
+        str(ProcessParentType.ACTIVATION),
+        activation.id,
+        timeout=settings.DISPATCHERD_ACTIVATION_TASK_TIMEOUT,
+    )
+
+
+@pytest.mark.django_db
+@mock.patch("aap_eda.tasks.orchestrator.queue_dispatch")
+def test_dispatch_requests(dispatch_mock, activation):
+    orchestrator.dispatch_requests(ProcessParentType.ACTIVATION, activation.id)
+    dispatch_mock.assert_not_called()
+
+    queue.push(
+        ProcessParentType.ACTIVATION,
+        activation.id,
+        ActivationRequest.STOP,
+        "request-id",
+    )
+    orchestrator.dispatch_requests(ProcessParentType.ACTIVATION, activation.id)
+
+    dispatch_mock.assert_called_once_with(
+        ProcessParentType.ACTIVATION,
+        activation.id,
+        ActivationRequest.STOP,
+        "request-id",
+    )
+
+
+@mock.patch("aap_eda.tasks.orchestrator.tasking.unique_enqueue")
+def test_submit_dispatch_bulk_requests_per_request_type(enqueue_mock):
+    for request_type in [ActivationRequest.RESTART, ActivationRequest.STOP]:
+        orchestrator._submit_dispatch_bulk_requests(
+            ProcessParentType.ACTIVATION, request_type, [1], "job-1"
+        )
+
+    job_ids = [call.args[1] for call in enqueue_mock.call_args_list]
+    assert job_ids == [
+        f"bulk-dispatch-{ActivationRequest.RESTART}-job-1",
+        f"bulk-dispatch-{ActivationRequest.STOP}-job-1",
+    ]
+
+
+@pytest.mark.django_db
+@mock.patch("aap_eda.tasks.orchestrator.tasking.unique_enqueue")
+@mock.patch("aap_eda.tasks.orchestrator.place_rulebook_processes")
+def test_dispatch_bulk_start_requests(place_mock, enqueue_mock, activation):
+    place_mock.return_value = ["queue-a", "queue-b"]
+
+    orchestrator.dispatch_bulk_requests(
+        ProcessParentType.ACTIVATION,
+        ActivationRequest.START,
+        [activation.id, 42000],
+        "job-1",
+    )
+
+    place_mock.assert_called_once_with(2)
+    assert enqueue_mock.call_args_list == [
+        mock.call(
+            queue_name,
+            orchestrator._manage_process_job_id(
+                ProcessParentType.ACTIVATION, parent_id
+            ),
+            orchestrator._manage,
+            ProcessParentType.ACTIVATION,
+            parent_id,
+            "job-1",
+            timeout=settings.DISPATCHERD_ACTIVATION_TASK_TIMEOUT,
+        )
+        for parent_id, queue_name in [
+            (activation.id, "queue-a"),
+            (42000, "queue-b"),
+        ]
+    ]
+
+
+@pytest.mark.django_db
+@override_settings(
+    RULEBOOK_START_MAX_CONCURRENT=1,
+    RULEBOOK_START_MAX_CONCURRENT_PER_QUEUE=0,
+    RULEBOOK_START_RATE=0,
+)
+@mock.patch("aap_eda.tasks.orchestrator.tasking.unique_enqueue")
+@mock.patch("aap_eda.tasks.orchestrator.place_rulebook_processes")
+def test_dispatch_bulk_start_requests_up_to_start_slots(
+    place_mock, enqueue_mock, activation
+):
+    place_mock.return_value = ["queue-a"]
+
+    orchestrator.dispatch_bulk_requests(
+        ProcessParentType.ACTIVATION,
+        ActivationRequest.START,
+        [activation.id, 42000],
+        "job-1",
+    )
+
+    place_mock.assert_called_once_with(1)
+    enqueue_mock.assert_called_once()
+    assert enqueue_mock.call_args.args[4] == activation.id
+
+
+@pytest.mark.django_db
+@override_settings(
+    RULEBOOK_START_MAX_CONCURRENT=0,
+    RULEBOOK_START_MAX_CONCURRENT_PER_QUEUE=0,
+    RULEBOOK_START_RATE=0,
+)
+@mock.patch("aap_eda.tasks.orchestrator.tasking.unique_enqueue")
 @mock.patch("aap_eda.tasks.orchestrator.get_least_busy_queue_name")
 def test_monitor_rulebook_processes(
     get_queue_name_mock, enqueue_mock, activation, bulk_running_processes
@@ -243,6 +558,140 @@ def test_monitor_rulebook_processes(
     enqueue_mock.assert_has_calls(call_args, any_order=True)
 
 
+@pytest.mark.django_db
+def test_get_rulebook_queues_load(bulk_running_processes):
+    stopped = bulk_running_processes[1]
+    stopped.status = ActivationStatus.STOPPED
+    stopped.save(update_fields=["status"])
+    other = bulk_running_processes[2]
+    other.rulebookprocessqueue.queue_name = "other"
+    other.rulebookprocessqueue.save(update_fields=["queue_name"])
+
+    with CaptureQueriesContext(connection) as queries:
+        queues_load = orchestrator.get_rulebook_queues_load(
+            ["activation", "other", "idle"]
+        )
+
+    assert len(queries) == 1
+    assert queues_load == {"activation": 6, "other": 1, "idle": 0}
+
+
+@pytest.mark.django_db
+@override_settings(
+    RULEBOOK_MONITOR_BATCH_SIZE=5, RULEBOOK_WORKER_QUEUES=["activation"]
+)
+@mock.patch("aap_eda.tasks.orchestrator.queue_dispatch")
+@mock.patch("aap_eda.tasks.orchestrator.tasking.unique_enqueue")
+@mock.patch(
+    "aap_eda.tasks.orchestrator.check_rulebook_queue_health",
+    return_value=True,
+)
+def test_monitor_rulebook_processes_in_batches(
+    health_mock, enqueue_mock, dispatch_mock, bulk_running_processes
+):
+    unknown = bulk_running_processes[0]
+    unknown.rulebookprocessqueue.queue_name = "unknown"
+    unknown.rulebookprocessqueue.save(update_fields=["queue_name"])
+
+    orchestrator.monitor_rulebook_processes()
+
+    health_mock.assert_called_once_with("activation")
+    batches = []
+    for call in enqueue_mock.call_args_list:
+        assert call.args[0] == "activation"
+        assert call.args[2] is orchestrator._manage_batch
+        assert call.args[3] == call.args[1]
+        assert call.args[5] is None
+        assert call.kwargs["timeout"] == (
+            settings.DISPATCHERD_ACTIVATION_TASK_TIMEOUT * len(call.args[4])
+        )
+        batches.append(call.args[4])
+    assert [len(batch) for batch in batches] == [5, 2]
+    monitored = [parent_id for batch in batches for _, parent_id in batch]
+    assert sorted(monitored) == sorted(
+        process.activation_id for process in bulk_running_processes[1:]
+    )
+    # Processes on unknown queues are dispatched one by one
+    dispatch_mock.assert_called_once_with(
+        ProcessParentType.ACTIVATION, unknown.activation_id, None, mock.ANY
+    )
+
+
+@pytest.mark.django_db
+@override_settings(
+    RULEBOOK_MONITOR_BATCH_SIZE=5, RULEBOOK_WORKER_QUEUES=["activation"]
+)
+@mock.patch("aap_eda.tasks.orchestrator.tasking.unique_enqueue")
+@mock.patch(
+    "aap_eda.tasks.orchestrator.check_rulebook_queue_health",
+    return_value=True,
+)
+def test_monitor_sweeps_reuse_batch_job_ids(
+    health_mock, enqueue_mock, bulk_running_processes
+):
+    orchestrator.monitor_rulebook_processes()
+    first_sweep = [call.args[1] for call in enqueue_mock.call_args_list]
+    enqueue_mock.reset_mock()
+
+    orchestrator.monitor_rulebook_processes()
+    second_sweep = [call.args[1] for call in enqueue_mock.call_args_list]
+
+    assert len(set(first_sweep)) == len(first_sweep) == 2
+    assert second_sweep == first_sweep
+
+
+@pytest.mark.django_db
+@mock.patch("aap_eda.tasks.orchestrator._manage")
+def test_manage_batch_already_running(manage_mock, eda_caplog):
+    @contextmanager
+    def advisory_lock_mock(*args, **kwargs):
+        yield False
+
+    with mock.patch(
+        "aap_eda.tasks.orchestrator.advisory_lock", advisory_lock_mock
+    ):
+        orchestrator._manage_batch(
+            "batch-activation-monitor-0",
+            [(ProcessParentType.ACTIVATION, 1)],
+        )
+
+    manage_mock.assert_not_called()
+    assert (
+        "Batch batch-activation-monitor-0 already being ran" in eda_caplog.text
+    )
+
+
+@pytest.mark.django_db
+@mock.patch("aap_eda.tasks.orchestrator._manage")
+def test_manage_batch(manage_mock):
+    manage_mock.side_effect = [Exception("Boom"), None]
+
+    orchestrator._manage_batch(
+        "batch-activation-monitor-0",
+        [(ProcessParentType.ACTIVATION, 1), (ProcessParentType.ACTIVATION, 2)],
+    )
+
+    assert [call.args[:2] for call in manage_mock.call_args_list] == [
+        (ProcessParentType.ACTIVATION, 1),
+        (ProcessParentType.ACTIVATION, 2),
+    ]
+
+
+@pytest.mark.django_db
+@mock.patch("aap_eda.tasks.orchestrator._manage")
+def test_manage_batch_with_request_id(manage_mock):
+    orchestrator._manage_batch(
+        "batch-activation-job-1-0",
+        [(ProcessParentType.ACTIVATION, 1), (ProcessParentType.ACTIVATION, 2)],
+        "job-1",
+    )
+
+    assert [call.args for call in manage_mock.call_args_list] == [
+        (ProcessParentType.ACTIVATION, 1, "job-1"),
+        (ProcessParentType.ACTIVATION, 2, "job-1"),
+    ]
+
+
 original_start_method = orchestrator.ActivationManager.start
 
 
@@ -0,0 +1,11 @@
+"""Shared test configuration for websocket API integration tests."""
+
+import pytest
+from django.test.utils import override_settings
+
+
+@pytest.fixture(autouse=True)
+def write_heartbeats_immediately():
+    """Write rulebook process heartbeats as they arrive."""
+    with override_settings(RULEBOOK_HEARTBEAT_FLUSH_INTERVAL_SECONDS=0):
+        yield
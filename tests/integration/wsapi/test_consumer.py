@@ -1,5 +1,6 @@
 import asyncio
 import base64
+import json
 import logging
 import uuid
 from datetime import datetime
@@ -12,11 +13,14 @@ import pytest_asyncio
 from channels.db import database_sync_to_async
 from channels.testing import WebsocketCommunicator
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.utils import timezone
 from pydantic.error_wrappers import ValidationError
 
 from aap_eda.core import enums, models
 from aap_eda.core.models.activation import ActivationStatus
+from aap_eda.core.utils.credentials import get_resolved_secrets
 from aap_eda.services.activation.activation_manager import ActivationManager
 from aap_eda.services.auth import create_jwt_token
 from aap_eda.wsapi.consumers import AnsibleRulebookConsumer, logger
@@ -264,6 +268,31 @@ async def test_handle_jobs(
     assert (await get_activation_instance_job_instance_count()) == 1
 
 
+@pytest.mark.django_db(transaction=True)
+async def test_handle_jobs_binary_frame(
+    ws_communicator: WebsocketCommunicator,
+    default_organization: models.Organization,
+):
+    rulebook_process_id = await _prepare_db_data(default_organization)
+
+    payload = {
+        "type": "Job",
+        "job_id": "940730a1-8b6f-45f3-84c9-bde8f04390e0",
+        "ansible_rulebook_id": rulebook_process_id,
+        "name": "ansible.eda.hello",
+        "ruleset": "ruleset",
+        "rule": "rule",
+        "hosts": "hosts",
+        "action": "run_playbook",
+    }
+
+    await ws_communicator.send_to(bytes_data=json.dumps(payload).encode())
+    await ws_communicator.wait()
+
+    assert (await get_job_instance_count()) == 1
+    assert (await get_activation_instance_job_instance_count()) == 1
+
+
 @pytest.mark.django_db(transaction=True)
 async def test_handle_events(
     ws_communicator: WebsocketCommunicator,
@@ -292,6 +321,151 @@ async def test_handle_events(
     assert (await get_job_instance_event_count()) == 1
 
 
+def _host_event_payload(job_uuid, counter: int) -> dict:
+    return {
+        "type": "AnsibleEvent",
+        "event": {
+            "event": "runner_on_ok",
+            "job_id": str(job_uuid),
+            "counter": counter,
+            "stdout": f"ok: [host{counter}]",
+            "event_data": {
+                "playbook": "site.yml",
+                "play": "all",
+                "task": "ping",
+                "res": {"changed": counter % 2 == 0},
+            },
+        },
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_handle_events_in_batches(
+    default_organization: models.Organization,
+):
+    job_instance = await _prepare_job_instance()
+    communicator = await create_ws_communicator_with_token()
+    connected, _ = await communicator.connect()
+    assert connected
+
+    with override_settings(
+        WEBSOCKET_EVENT_BATCH_SIZE=3,
+        WEBSOCKET_EVENT_BATCH_INTERVAL_MS=60000,
+    ):
+        for counter in range(1, 5):
+            await communicator.send_json_to(
+                _host_event_payload(job_instance.uuid, counter)
+            )
+        await communicator.receive_nothing()
+
+        # the first batch is full, the last event is still buffered
+        assert (await get_job_instance_event_count()) == 3
+        assert (await get_job_instance_host_count()) == 3
+
+        await communicator.disconnect()
+
+    assert (await get_job_instance_event_count()) == 4
+    assert (await get_job_instance_host_count()) == 4
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_handle_events_flushed_before_other_messages(
+    default_organization: models.Organization,
+):
+    rulebook_process_id = await _prepare_db_data(default_organization)
+    job_instance = await _prepare_job_instance()
+    communicator = await create_ws_communicator_with_token()
+    connected, _ = await communicator.connect()
+    assert connected
+
+    with override_settings(
+        WEBSOCKET_EVENT_BATCH_SIZE=100,
+        WEBSOCKET_EVENT_BATCH_INTERVAL_MS=60000,
+    ):
+        await communicator.send_json_to(
+            _host_event_payload(job_instance.uuid, 1)
+        )
+        await communicator.send_json_to(
+            {
+                "type": "Job",
+                "job_id": "940730a1-8b6f-45f3-84c9-bde8f04390e0",
+                "ansible_rulebook_id": rulebook_process_id,
+                "name": "ansible.eda.hello",
+                "ruleset": "ruleset",
+                "rule": "rule",
+                "hosts": "hosts",
+                "action": "run_playbook",
+            }
+        )
+        await communicator.receive_nothing()
+
+        assert (await get_job_instance_event_count()) == 1
+        await communicator.disconnect()
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_handle_events_skips_malformed_event(
+    default_organization: models.Organization,
+    eda_caplog,
+):
+    job_instance = await _prepare_job_instance()
+    communicator = await create_ws_communicator_with_token()
+    connected, _ = await communicator.connect()
+    assert connected
+
+    with override_settings(
+        WEBSOCKET_EVENT_BATCH_SIZE=3,
+        WEBSOCKET_EVENT_BATCH_INTERVAL_MS=60000,
+    ):
+        for counter in range(1, 4):
+            payload = _host_event_payload(job_instance.uuid, counter)
+            if counter == 2:
+                payload["event"]["created"] = "not a timestamp"
+            await communicator.send_json_to(payload)
+        await communicator.receive_nothing()
+
+        assert (await get_job_instance_event_count()) == 2
+        assert (await get_job_instance_host_count()) == 2
+        assert "Failed to parse ansible event" in eda_caplog.text
+
+        await communicator.disconnect()
+
+
+async def test_flush_events_later_logs_errors(eda_caplog):
+    consumer = AnsibleRulebookConsumer()
+
+    with override_settings(WEBSOCKET_EVENT_BATCH_INTERVAL_MS=0), patch.object(
+        consumer, "flush_events", side_effect=ValueError("bad event")
+    ):
+        await consumer._flush_events_later()
+
+    assert consumer._event_flush_task is None
+    assert "Failed to store ansible events" in eda_caplog.text
+    assert "bad event" in eda_caplog.text
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_activation_loaded_once_per_connection(
+    default_organization: models.Organization,
+):
+    rulebook_process_id = await _prepare_db_data(default_organization)
+    job_instance = await _prepare_job_instance()
+    communicator = await create_ws_communicator_with_token()
+    connected, _ = await communicator.connect()
+    assert connected
+
+    manager = models.RulebookProcess.objects
+    with patch.object(manager, "get", wraps=manager.get) as get_process:
+        for counter in range(1, 4):
+            payload = _host_event_payload(job_instance.uuid, counter)
+            payload["activation_id"] = rulebook_process_id
+            await communicator.send_json_to(payload)
+        await communicator.receive_nothing()
+        await communicator.disconnect()
+
+    get_process.assert_called_once_with(id=rulebook_process_id)
+
+
 @pytest.mark.django_db(transaction=True)
 async def test_handle_actions_multiple_firing(
     default_organization: models.Organization,
@@ -615,6 +789,43 @@ async def test_handle_heartbeat_running_status(
         pass
 
 
+@pytest.mark.django_db(transaction=True)
+async def test_handle_heartbeat_deleted_rulebook_process(
+    default_organization: models.Organization,
+    eda_caplog,
+):
+    await _prepare_db_data(default_organization)
+
+    # The heartbeat arrives after its rulebook process was deleted
+    deleted_rulebook_process_id = 100000000
+    ws_communicator = await create_ws_communicator_with_token(
+        deleted_rulebook_process_id
+    )
+    connected, _ = await ws_communicator.connect()
+    assert connected
+
+    payload = {
+        "type": "SessionStats",
+        "activation_id": deleted_rulebook_process_id,
+        "stats": {"ruleSetName": "ruleset1"},
+        "reported_at": timezone.now().strftime(DATETIME_FORMAT),
+    }
+    await ws_communicator.send_json_to(payload)
+    await ws_communicator.wait()
+
+    assert "Activation instance 100000000 is not present." in eda_caplog.text
+    assert not [
+        record
+        for record in eda_caplog.records
+        if record.levelno >= logging.ERROR
+    ]
+
+    try:
+        await ws_communicator.disconnect()
+    except asyncio.CancelledError:
+        pass
+
+
 @database_sync_to_async
 def monitor_activation(activation: models.Activation):
     activation.latest_instance.activation_pod_id = "test"
@@ -798,6 +1009,60 @@ async def test_controller_job_url(
         pass
 
 
+@pytest.mark.django_db(transaction=True)
+async def test_controller_job_url_resolves_aap_credential_once(
+    preseed_credential_types,
+    default_organization: models.Organization,
+):
+    my_aap_inputs = {
+        "host": "http://gw/api/controller",
+        "username": "adam",
+        "password": "secret",
+        "ssl_verify": "no",
+        "oauth_token": "",
+    }
+    rulebook_process_id = await _prepare_activation_with_controller_info(
+        default_organization, my_aap_inputs
+    )
+    job_instance = await _prepare_job_instance()
+
+    ws_communicator = await create_ws_communicator_with_token(
+        rulebook_process_id
+    )
+    connected, _ = await ws_communicator.connect()
+    assert connected
+
+    with patch(
+        "aap_eda.wsapi.consumers.get_resolved_secrets",
+        wraps=get_resolved_secrets,
+    ) as resolve:
+        for _ in range(2):
+            payload = create_action_payload(
+                str(uuid.uuid4()),
+                rulebook_process_id,
+                job_instance.uuid,
+                DUMMY_UUID,
+                "2023-03-29T15:00:17.260803Z",
+                _matching_events(),
+                "successful",
+                "run_job_template",
+                "http://controller.com/jobs/1/",
+                "55",
+            )
+            await ws_communicator.send_json_to(payload)
+            await ws_communicator.wait()
+
+    assert resolve.call_count == 1
+    assert (await get_audit_action_count()) == 2
+    action = await get_audit_action_first()
+    assert action.url == "http://gw/execution/jobs/playbook/55/details/"
+
+    try:
+        await ws_communicator.disconnect()
+    except asyncio.CancelledError:
+        pass
+
+
 @database_sync_to_async
 def get_rulebook_process(instance_id):
     return models.RulebookProcess.objects.get(pk=instance_id)
@@ -866,6 +1131,11 @@ def get_job_instance_event_count():
     return models.JobInstanceEvent.objects.count()
 
 
+@database_sync_to_async
+def get_job_instance_host_count():
+    return models.JobInstanceHost.objects.count()
+
+
 @database_sync_to_async
 def remove_credential_type(cred_type: models.CredentialType):
     cred_type.delete()
@@ -1498,6 +1768,83 @@ async def test_handle_workers_with_env_vars(
     await ws_communicator.disconnect()
 
 
+@pytest.mark.django_db(transaction=True)
+async def test_handle_workers_resolves_each_credential_once(
+    preseed_credential_types,
+    default_organization: models.Organization,
+):
+    eda_credential = await _prepare_aap_credential_async(default_organization)
+    system_credential = await _prepare_system_vault_credential_async(
+        default_organization
+    )
+    rulebook_process_id = await _prepare_activation_instance_with_credentials(
+        default_organization,
+        [eda_credential],
+        system_credential,
+    )
+
+    ws_communicator = await create_ws_communicator_with_token(
+        rulebook_process_id
+    )
+    connected, _ = await ws_communicator.connect()
+    assert connected
+
+    payload = {
+        "type": "Worker",
+        "activation_id": rulebook_process_id,
+        "activation_instance_id": rulebook_process_id,
+    }
+    with patch(
+        "aap_eda.wsapi.consumers.get_resolved_secrets",
+        wraps=get_resolved_secrets,
+    ) as resolve:
+        await ws_communicator.send_json_to(payload)
+        response = {}
+        while response.get("type") != "EndOfResponse":
+            response = await ws_communicator.receive_json_from(timeout=TIMEOUT)
+
+    resolved_ids = [call.args[0].id for call in resolve.call_args_list]
+    assert sorted(resolved_ids) == sorted(
+        [eda_credential.id, system_credential.id]
+    )
+
+    await ws_communicator.disconnect()
+
+
+@pytest.mark.parametrize("event_count", [1, 20])
+@pytest.mark.django_db
+def test_process_matching_events_query_count(event_count):
+    audit_action = models.AuditAction.objects.create(
+        id=uuid.uuid4(),
+        name="debug",
+        fired_at=timezone.now(),
+    )
+    existing_id = str(uuid.uuid4())
+    models.AuditEvent.objects.create(
+        id=existing_id,
+        source_name="my test source",
+        source_type="ansible.eda.range",
+        received_at=timezone.now(),
+    )
+    matching_events = {
+        f"m_{i}": _create_event(i, str(uuid.uuid4()))
+        for i in range(event_count - 1)
+    }
+    matching_events["m_existing"] = _create_event(0, existing_id)
+    message = mock.Mock(
+        matching_events=matching_events, rule_run_at=timezone.now()
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        AnsibleRulebookConsumer()._process_matching_events(
+            message, audit_action
+        )
+
+    assert len(queries) == 2
+    assert models.AuditEvent.objects.count() == event_count
+    assert audit_action.audit_events.count() == event_count
+
+
 @pytest.mark.django_db(transaction=True)
 async def test_receive_object_not_exist(
     ws_communicator: WebsocketCommunicator,
@@ -1579,6 +1926,32 @@ async def test_get_activation_with_exception(
     assert "RulebookProcess 100000000 not found" in eda_caplog.text
 
 
+@pytest.mark.django_db(transaction=True)
+async def test_worker_message_reloads_cached_activation(
+    default_organization: models.Organization,
+):
+    rulebook_process_id = await _prepare_db_data(default_organization)
+    consumer = AnsibleRulebookConsumer()
+    stale_activation = mock.Mock()
+    consumer._activations[str(rulebook_process_id)] = stale_activation
+
+    with patch.object(consumer, "_validate_message_token_scope"), patch.object(
+        consumer, "_dispatch_message"
+    ):
+        await consumer.receive(
+            text_data=json.dumps(
+                {"type": "Worker", "activation_id": rulebook_process_id}
+            )
+        )
+
+    activation = await get_activation_by_rulebook_process(rulebook_process_id)
+    cached_activation = await consumer.get_cached_activation(
+        rulebook_process_id
+    )
+    assert cached_activation is not stale_activation
+    assert cached_activation.id == activation.id
+
+
 @pytest.mark.django_db(transaction=True)
 async def test_get_controller_info_from_aap_cred(
     ws_communicator: WebsocketCommunicator,
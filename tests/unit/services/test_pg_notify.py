@@ -1,8 +1,36 @@
-from unittest.mock import MagicMock, patch
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import psycopg
 import pytest
 
-from aap_eda.services.pg_notify import PGNotify
+from aap_eda.core.exceptions import PGNotifyError
+from aap_eda.services.pg_notify import (
+    AsyncPGNotify,
+    PGNotify,
+    close_connection_pools,
+    get_async_connection_pool,
+    get_connection_pool,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_connection_pools():
+    close_connection_pools()
+    yield
+    close_connection_pools()
+
+
+def _mock_connection():
+    mock_cursor = MagicMock()
+    mock_conn = MagicMock()
+    mock_conn.closed = False
+    mock_conn.broken = False
+    mock_conn.cursor.return_value.__enter__ = MagicMock(
+        return_value=mock_cursor
+    )
+    mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+    return mock_conn, mock_cursor
 
 
 @patch("aap_eda.services.pg_notify.psycopg")
@@ -50,11 +78,33 @@ def test_chunked_payload_with_dollar_quotes_is_parameterized(mock_psycopg):
     )
     notifier()
 
-    for call in mock_cursor.execute.call_args_list:
-        sql, params = call[0]
-        assert sql == "SELECT pg_notify(%s, %s)"
+    mock_cursor.execute.assert_not_called()
+    sql, param_seq = mock_cursor.executemany.call_args[0]
+    assert sql == "SELECT pg_notify(%s, %s)"
+    assert "$$" not in sql
+    for params in param_seq:
         assert params[0] == "test_chan"
-        assert "$$" not in sql
+
+
+@patch("aap_eda.services.pg_notify.MAX_MESSAGE_LENGTH", 50)
+@patch("aap_eda.services.pg_notify.psycopg")
+def test_chunked_payload_is_sent_in_one_batch(mock_psycopg):
+    mock_conn, mock_cursor = _mock_connection()
+    mock_psycopg.connect.return_value = mock_conn
+
+    data = {"event": "B" * 200}
+    PGNotify(
+        dsn="postgresql://localhost/eda", channel="test_chan", data=data
+    )()
+
+    mock_cursor.executemany.assert_called_once()
+    _, param_seq = mock_cursor.executemany.call_args[0]
+    chunks = [json.loads(params[1]) for params in param_seq]
+    assert [chunk["_message_chunk_sequence"] for chunk in chunks] == list(
+        range(1, len(chunks) + 1)
+    )
+    assert len({chunk["_message_chunked_uuid"] for chunk in chunks}) == 1
+    assert json.loads("".join(chunk["_chunk"] for chunk in chunks)) == data
 
 
 @pytest.mark.parametrize(
@@ -87,3 +137,139 @@ def test_sql_metacharacters_are_parameterized(mock_psycopg, malicious_value):
     sql, params = mock_cursor.execute.call_args[0]
     assert sql == "SELECT pg_notify(%s, %s)"
     assert malicious_value in params[1]
+
+
+@patch("aap_eda.services.pg_notify.psycopg")
+def test_connection_is_reused_across_notifies(mock_psycopg):
+    mock_conn, mock_cursor = _mock_connection()
+    mock_psycopg.connect.return_value = mock_conn
+
+    for _ in range(3):
+        PGNotify(
+            dsn="postgresql://localhost/eda",
+            channel="test_chan",
+            data={"a": 1},
+        )()
+
+    mock_psycopg.connect.assert_called_once_with(
+        conninfo="postgresql://localhost/eda", autocommit=True
+    )
+    assert mock_cursor.execute.call_count == 3
+    stats = get_connection_pool("postgresql://localhost/eda").stats()
+    assert stats["checkouts"] == 3
+    assert stats["connections_created"] == 1
+    assert stats["idle"] == 1
+
+
+@patch("aap_eda.services.pg_notify.psycopg")
+def test_reconnects_once_on_operational_error(mock_psycopg):
+    mock_psycopg.OperationalError = psycopg.OperationalError
+    mock_psycopg.Error = psycopg.Error
+    stale_conn, stale_cursor = _mock_connection()
+    stale_cursor.execute.side_effect = psycopg.OperationalError("gone")
+    fresh_conn, fresh_cursor = _mock_connection()
+    mock_psycopg.connect.side_effect = [stale_conn, fresh_conn]
+
+    PGNotify(
+        dsn="postgresql://localhost/eda", channel="test_chan", data={"a": 1}
+    )()
+
+    stale_conn.close.assert_called_once()
+    fresh_cursor.execute.assert_called_once_with(
+        "SELECT pg_notify(%s, %s)", ["test_chan", '{"a": 1}']
+    )
+
+
+@patch("aap_eda.services.pg_notify.MAX_MESSAGE_LENGTH", 50)
+@patch("aap_eda.services.pg_notify.psycopg")
+def test_chunked_payload_is_resent_whole_when_not_committed(mock_psycopg):
+    mock_psycopg.OperationalError = psycopg.OperationalError
+    mock_psycopg.Error = psycopg.Error
+    stale_conn, stale_cursor = _mock_connection()
+    stale_cursor.executemany.side_effect = psycopg.OperationalError("gone")
+    fresh_conn, fresh_cursor = _mock_connection()
+    mock_psycopg.connect.side_effect = [stale_conn, fresh_conn]
+
+    PGNotify(
+        dsn="postgresql://localhost/eda",
+        channel="test_chan",
+        data={"event": "B" * 200},
+    )()
+
+    stale_conn.transaction.assert_called_once()
+    fresh_conn.transaction.assert_called_once()
+    # The retry sends the very same chunks, under the same message uuid
+    assert (
+        fresh_cursor.executemany.call_args
+        == stale_cursor.executemany.call_args
+    )
+
+
+@patch("aap_eda.services.pg_notify.MAX_MESSAGE_LENGTH", 50)
+@patch("aap_eda.services.pg_notify.psycopg")
+def test_chunked_payload_is_not_resent_when_commit_fails(mock_psycopg):
+    mock_psycopg.OperationalError = psycopg.OperationalError
+    mock_psycopg.Error = psycopg.Error
+    mock_conn, mock_cursor = _mock_connection()
+    mock_conn.transaction.return_value.__exit__.side_effect = (
+        psycopg.OperationalError("gone")
+    )
+    mock_psycopg.connect.return_value = mock_conn
+
+    with pytest.raises(PGNotifyError):
+        PGNotify(
+            dsn="postgresql://localhost/eda",
+            channel="test_chan",
+            data={"event": "B" * 200},
+        )()
+    mock_psycopg.connect.assert_called_once()
+    mock_cursor.executemany.assert_called_once()
+
+
+@patch("aap_eda.services.pg_notify.psycopg")
+def test_raises_pg_notify_error_when_reconnect_fails(mock_psycopg):
+    mock_psycopg.OperationalError = psycopg.OperationalError
+    mock_psycopg.Error = psycopg.Error
+    mock_psycopg.connect.side_effect = psycopg.OperationalError("down")
+
+    with pytest.raises(PGNotifyError):
+        PGNotify(
+            dsn="postgresql://localhost/eda",
+            channel="test_chan",
+            data={"a": 1},
+        )()
+    assert mock_psycopg.connect.call_count == 2
+
+
+@patch("aap_eda.services.pg_notify.MAX_MESSAGE_LENGTH", 50)
+@patch("aap_eda.services.pg_notify.psycopg")
+async def test_async_notify_reuses_connection(mock_psycopg):
+    mock_cursor = AsyncMock()
+    mock_conn = MagicMock()
+    mock_conn.closed = False
+    mock_conn.broken = False
+    mock_conn.cursor.return_value.__aenter__ = AsyncMock(
+        return_value=mock_cursor
+    )
+    mock_conn.cursor.return_value.__aexit__ = AsyncMock(return_value=False)
+    mock_psycopg.AsyncConnection.connect = AsyncMock(return_value=mock_conn)
+
+    await AsyncPGNotify(
+        dsn="postgresql://localhost/eda", channel="test_chan", data={"a": 1}
+    )()
+    await AsyncPGNotify(
+        dsn="postgresql://localhost/eda",
+        channel="test_chan",
+        data={"event": "C" * 100},
+    )()
+
+    mock_psycopg.AsyncConnection.connect.assert_awaited_once_with(
+        conninfo="postgresql://localhost/eda", autocommit=True
+    )
+    mock_cursor.execute.assert_awaited_once_with(
+        "SELECT pg_notify(%s, %s)", ["test_chan", '{"a": 1}']
+    )
+    mock_cursor.executemany.assert_awaited_once()
+    stats = get_async_connection_pool("postgresql://localhost/eda").stats()
+    assert stats["checkouts"] == 2
+    assert stats["idle"] == 1
@@ -0,0 +1,85 @@
+#  Copyright 2025 Red Hat, Inc.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+from unittest import mock
+
+from aap_eda.core.utils.cache import TTLCache
+
+
+def test_get_and_set():
+    cache = TTLCache(max_size=10, ttl=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("b", "default") == "default"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_entries_expire():
+    cache = TTLCache(max_size=10, ttl=60)
+    with mock.patch("aap_eda.core.utils.cache.time.monotonic") as monotonic:
+        monotonic.return_value = 100.0
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=10)
+
+        monotonic.return_value = 111.0
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+
+        monotonic.return_value = 161.0
+        assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_entry_ttl_cannot_exceed_cache_ttl():
+    cache = TTLCache(max_size=10, ttl=60)
+    with mock.patch("aap_eda.core.utils.cache.time.monotonic") as monotonic:
+        monotonic.return_value = 100.0
+        cache.set("a", 1, ttl=3600)
+
+        monotonic.return_value = 161.0
+        assert cache.get("a") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_discard_if():
+    cache = TTLCache(max_size=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+
+    assert cache.discard_if(lambda _key, value: value % 2) == 2
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+
+def test_disabled_cache_stores_nothing():
+    cache = TTLCache(max_size=10, ttl=0)
+    cache.set("a", 1)
+
+    assert not cache.enabled
+    assert cache.get("a") is None
@@ -0,0 +1,77 @@
+#  Copyright 2025 Red Hat, Inc.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""Unit tests for parsing external event stream bodies."""
+
+import json
+from unittest import mock
+
+import pytest
+import yaml
+from rest_framework.exceptions import ParseError
+
+from aap_eda.api.views.external_event_stream import (
+    ExternalEventStreamMixin,
+    is_json_content_type,
+)
+
+
+@pytest.mark.parametrize(
+    ("content_type", "expected"),
+    [
+        ("application/json", True),
+        ("application/json; charset=utf-8", True),
+        ("Application/JSON", True),
+        ("application/vnd.github+json", True),
+        ("application/x-yaml", False),
+        ("text/json", False),
+        ("", False),
+    ],
+)
+def test_is_json_content_type(content_type, expected):
+    assert is_json_content_type(content_type) is expected
+
+
+@pytest.mark.parametrize(
+    ("content_type", "body", "expected"),
+    [
+        ("application/json", b'{"a": 1, "b": [true, null]}', None),
+        ("application/cloudevents+json", b'["a", 1]', None),
+        ("application/json", b"a: 1\nb: 2\n", {"a": 1, "b": 2}),
+        ("application/x-yaml", b"a: 1\nb: 2\n", {"a": 1, "b": 2}),
+        (
+            "application/x-www-form-urlencoded",
+            b"a=1&b=2",
+            {"a": ["1"], "b": ["2"]},
+        ),
+    ],
+)
+def test_parse_body(content_type, body, expected):
+    with mock.patch(
+        "aap_eda.api.views.external_event_stream.yaml.safe_load",
+        wraps=yaml.safe_load,
+    ) as safe_load:
+        data = ExternalEventStreamMixin()._parse_body(content_type, body)
+
+    if expected is None:
+        safe_load.assert_not_called()
+        assert data == json.loads(body)
+    else:
+        assert data == expected
+
+
+def test_parse_body_invalid_content():
+    with pytest.raises(ParseError):
+        ExternalEventStreamMixin()._parse_body(
+            "application/json", b'{"a": [1, 2'
+        )
@@ -22,6 +22,8 @@ from rest_framework.test import APIClient
 
 from aap_eda.core import enums, models
 from aap_eda.core.exceptions import CredentialPluginError
+from aap_eda.core.utils.cache import TTLCache
+from aap_eda.core.utils.credentials import inputs_to_store
 from aap_eda.core.utils.external_sms import get_external_secrets
 from tests.integration.constants import api_url_v1
 
@@ -127,3 +129,72 @@ def test_get_external_secrets(
         ):
             result = get_external_secrets(target_credential["id"])
             assert result[input_field_name] == "abc"
+
+
+@pytest.mark.django_db
+def test_get_external_secrets_cached(
+    admin_client: APIClient,
+    default_organization: models.Organization,
+    preseed_credential_types,
+):
+    """Test external secrets are cached until the input source changes."""
+    reg_type = models.CredentialType.objects.get(
+        name=enums.DefaultCredentialType.REGISTRY
+    )
+    target_credential = models.EdaCredential.objects.create(
+        name="eda-credential-1",
+        inputs=inputs_to_store(
+            {"host": "quay.io", "username": "fred", "password": "x"}
+        ),
+        credential_type=reg_type,
+        organization=default_organization,
+    )
+    hashi_type = models.CredentialType.objects.get(
+        name=enums.DefaultCredentialType.HASHICORP_LOOKUP
+    )
+    source_credential = models.EdaCredential.objects.create(
+        name="eda-credential-2",
+        inputs=inputs_to_store(
+            {
+                "url": "https://www.example.com",
+                "api_version": "v2",
+                "token": secrets.token_hex(32),
+            }
+        ),
+        credential_type=hashi_type,
+        organization=default_organization,
+    )
+    input_source = models.CredentialInputSource.objects.create(
+        source_credential=source_credential,
+        target_credential=target_credential,
+        input_field_name="password",
+        organization=default_organization,
+        metadata=inputs_to_store(
+            {"secret_path": "secret/foo", "secret_key": "bar"}
+        ),
+    )
+
+    cache = TTLCache(max_size=10, ttl=60)
+    with mock.patch(
+        "aap_eda.core.utils.external_sms.external_secrets_cache", cache
+    ), mock.patch(
+        "aap_eda.core.utils.external_sms.run_plugin", return_value="abc"
+    ) as run_plugin:
+        assert get_external_secrets(target_credential.id) == {
+            "password": "abc"
+        }
+        assert get_external_secrets(target_credential.id) == {
+            "password": "abc"
+        }
+        assert run_plugin.call_count == 1
+        assert cache.stats()["hits"] == 1
+        # the cached value is not kept in plain text
+        assert b"abc" not in cache.get(input_source.id)[1]
+
+        source_credential.save()
+        get_external_secrets(target_credential.id)
+        assert run_plugin.call_count == 2
+
+        input_source.save()
+        get_external_secrets(target_credential.id)
+        assert run_plugin.call_count == 3
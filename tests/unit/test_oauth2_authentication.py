@@ -0,0 +1,130 @@
+#  Copyright 2025 Red Hat, Inc.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""Unit tests for OAuth2 event stream authentication."""
+
+import time
+from unittest import mock
+
+import pytest
+import requests_mock
+from rest_framework.exceptions import AuthenticationFailed
+
+from aap_eda.api import event_stream_authentication as auth
+
+
+@pytest.fixture(autouse=True)
+def clear_clients():
+    auth.jwks_clients.clear()
+    auth.introspection_results.clear()
+    yield
+    auth.jwks_clients.clear()
+    auth.introspection_results.clear()
+
+
+@mock.patch("aap_eda.api.event_stream_authentication.jwt_decode")
+@mock.patch("aap_eda.api.event_stream_authentication.PyJWKClient")
+def test_jwks_client_is_shared(pyjwk_client, _jwt_decode):
+    for _ in range(3):
+        auth.Oauth2JwtAuthentication(
+            jwks_url="https://example.com/jwks.json",
+            audience="",
+            access_token="Bearer dummy",
+        ).authenticate()
+    auth.Oauth2JwtAuthentication(
+        jwks_url="https://example.com/other.json",
+        audience="",
+        access_token="Bearer dummy",
+    ).authenticate()
+
+    assert pyjwk_client.call_count == 2
+    client = pyjwk_client.return_value
+    assert client.get_signing_key_from_jwt.call_count == 4
+
+
+@mock.patch("aap_eda.api.event_stream_authentication.PyJWKClient")
+def test_jwks_refreshed_before_expiry(pyjwk_client):
+    client = auth.get_jwks_client("https://example.com/jwks.json")
+    with mock.patch(
+        "aap_eda.api.event_stream_authentication.time.monotonic"
+    ) as monotonic, mock.patch(
+        "aap_eda.api.event_stream_authentication.threading.Thread"
+    ) as thread:
+        thread.return_value.start.side_effect = client._refresh
+        monotonic.return_value = 1000.0
+        client.get_signing_key_from_jwt("token")
+
+        monotonic.return_value = 1000.0 + auth.JWKS_REFRESH_AHEAD
+        client.get_signing_key_from_jwt("token")
+        pyjwk_client.return_value.get_jwk_set.assert_not_called()
+
+        monotonic.return_value = 1000.0 + auth.JWKS_LIFESPAN - 1
+        client.get_signing_key_from_jwt("token")
+        pyjwk_client.return_value.get_jwk_set.assert_called_once_with(
+            refresh=True
+        )
+
+        # the next refresh is due a full lifespan after the last one
+        monotonic.return_value = 1000.0 + auth.JWKS_LIFESPAN + 30
+        client.get_signing_key_from_jwt("token")
+        assert pyjwk_client.return_value.get_jwk_set.call_count == 1
+
+
+INTROSPECTION_URL = "https://example.com/introspect"
+
+
+def _introspect(token: str, client_secret: str = "secret"):
+    auth.Oauth2Authentication(
+        introspection_url=INTROSPECTION_URL,
+        token=token,
+        client_id="client",
+        client_secret=client_secret,
+    ).authenticate()
+
+
+def test_introspection_result_is_cached():
+    with requests_mock.Mocker() as m:
+        m.post(INTROSPECTION_URL, json={"active": True})
+        _introspect("Bearer token-1")
+        _introspect("Bearer token-1")
+        assert m.call_count == 1
+
+        _introspect("Bearer token-2")
+        _introspect("Bearer token-1", client_secret="other")
+        assert m.call_count == 3
+
+
+def test_inactive_token_is_not_cached():
+    with requests_mock.Mocker() as m:
+        m.post(INTROSPECTION_URL, json={"active": False})
+        for _ in range(2):
+            with pytest.raises(AuthenticationFailed):
+                _introspect("Bearer token-1")
+        assert m.call_count == 2
+
+
+def test_expired_token_is_not_cached():
+    with requests_mock.Mocker() as m:
+        m.post(
+            INTROSPECTION_URL,
+            json={"active": True, "exp": int(time.time()) - 10},
+        )
+        _introspect("Bearer token-1")
+        _introspect("Bearer token-1")
+        assert m.call_count == 2
+
+
+def test_introspection_session_is_shared():
+    assert auth.get_introspection_session(
+        INTROSPECTION_URL
+    ) is auth.get_introspection_session(INTROSPECTION_URL)
@@ -25,7 +25,7 @@ from aap_eda.core.enums import (
     ActivationStatus,
     ProcessParentType,
 )
-from aap_eda.core.models import Activation, RulebookProcess
+from aap_eda.core.models import Activation
 from aap_eda.tasks import orchestrator
 from aap_eda.tasks.exceptions import UnknownProcessParentType
 from aap_eda.tasks.orchestrator import (
@@ -35,6 +35,7 @@ from aap_eda.tasks.orchestrator import (
     _resolve_existing_queue,
     get_least_busy_queue_name,
     get_process_parent,
+    get_rulebook_queues_health,
 )
 
 
@@ -45,12 +46,13 @@ def _mock_up_queues(monkeypatch, queues):
         settings, "RULEBOOK_WORKER_QUEUES", list(queues.keys())
     )
 
-    def _process_object_filter(**kwargs) -> mock.Mock:
-        return mock_queues[kwargs.get("rulebookprocessqueue__queue_name")]
+    def _queues_load(queue_names) -> dict:
+        return {
+            queue_name: mock_queues[queue_name].count()
+            for queue_name in queue_names
+        }
 
-    monkeypatch.setattr(
-        RulebookProcess.objects, "filter", _process_object_filter
-    )
+    monkeypatch.setattr(orchestrator, "get_rulebook_queues_load", _queues_load)
 
     # Mock the queue health check to return True for queues with responsive
     # workers
@@ -365,6 +367,16 @@ def test_get_process_parent_unknown_type():
     )
 
 
+@pytest.mark.django_db
+def test_get_least_busy_queue_name_weighted(
+    three_queues_two_candidates, monkeypatch
+):
+    monkeypatch.setattr(
+        settings, "RULEBOOK_WORKER_QUEUE_WEIGHTS", {"queue3": 4}
+    )
+    assert get_least_busy_queue_name() == "queue3"
+
+
 @pytest.fixture
 def setup_queue_health():
     queue_name = "rulebook_queue"
@@ -988,3 +1000,25 @@ def test_handle_unhealthy_queue_restart_no_healthy():
     status_manager.set_status.assert_called_once_with(
         ActivationStatus.PENDING, mock.ANY
     )
+
+
+def test_get_rulebook_queues_health_shared_between_dispatches(monkeypatch):
+    """Each queue is checked once while its result is fresh."""
+    checked = []
+
+    def _check(queue_name: str) -> bool:
+        checked.append(queue_name)
+        return queue_name != "queue2"
+
+    monkeypatch.setattr(orchestrator, "check_rulebook_queue_health", _check)
+    queues = ["queue1", "queue2", "queue3"]
+
+    expected = {"queue1": True, "queue2": False, "queue3": True}
+    assert get_rulebook_queues_health(queues) == expected
+    assert get_rulebook_queues_health(queues) == expected
+    assert get_rulebook_queues_health(["queue1"]) == {"queue1": True}
+    assert sorted(checked) == queues
+
+    orchestrator.queue_health_cache.clear()
+    get_rulebook_queues_health(["queue1"])
+    assert sorted(checked) == ["queue1", "queue1", "queue2", "queue3"]
@@ -105,6 +105,29 @@ def test_duplicated_worker_queue(mock_settings):
         post_loading(mock_settings)
 
 
+@pytest.mark.parametrize("weight", [0, -1, "2", True])
+def test_invalid_worker_queue_weight(mock_settings, weight):
+    mock_settings.RULEBOOK_WORKER_QUEUES = ["activation"]
+    mock_settings.RULEBOOK_WORKER_QUEUE_WEIGHTS = {"activation": weight}
+    with pytest.raises(ImproperlyConfigured):
+        post_loading(mock_settings)
+
+
+@pytest.mark.parametrize(
+    ("name", "value"),
+    [
+        ("RULEBOOK_START_MAX_CONCURRENT", -1),
+        ("RULEBOOK_START_MAX_CONCURRENT_PER_QUEUE", -1),
+        ("RULEBOOK_START_RATE", -1.0),
+        ("RULEBOOK_START_BURST", 0),
+    ],
+)
+def test_invalid_start_admission_settings(mock_settings, name, value):
+    mock_settings[name] = value
+    with pytest.raises(ImproperlyConfigured):
+        post_loading(mock_settings)
+
+
 def test_rulebook_queue_name_exists_in_worker_queues(mock_settings):
     """Explicitly set queue name not in worker queues should fail."""
     mock_settings.RULEBOOK_WORKER_QUEUES = [